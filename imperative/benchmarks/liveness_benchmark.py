@@ -0,0 +1,76 @@
+"""
+    Measures the time and peak memory of the liveness engines on a long block
+    made of the instruction shapes found in tests/input1.txt.
+
+    Run from the imperative directory:
+        python -m benchmarks.liveness_benchmark [number of lines]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from benchmarks.parse_benchmark import generate_block
+from input.fast_parser import FastParser
+from input.table_scanner import TableScanner
+from intermediate.compact_liveness import CompactLiveness
+from intermediate.liveness import Liveness
+from intermediate.streaming_liveness import StreamingLiveness
+
+def measure(liveness_class, buffer) -> tuple[float, int]:
+    """
+        Runs the analysis and reads every line back, returning the seconds
+        it took and the peak bytes allocated while doing it.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    liveness = liveness_class(buffer)
+    for _ in liveness.iter_liveness_ids():
+        pass
+
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+def measure_streaming(path: str) -> tuple[float, int]:
+    """
+        Walks the file backwards, returning the seconds it took and the peak bytes
+        allocated. Unlike the others, this includes reading the instructions.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    StreamingLiveness(path).close()
+
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+def main(lines: int) -> None:
+    text = generate_block(lines)
+    buffer = FastParser(TableScanner(io.StringIO(text))).parse()
+    buffer.get_columns()
+
+    for name, liveness_class in [("Liveness", Liveness), ("CompactLiveness", CompactLiveness)]:
+        elapsed, peak = measure(liveness_class, buffer)
+        print(f"{name:<18}{elapsed:>8.2f} s{peak / (1 << 20):>10.1f} MiB peak")
+
+    handle, path = tempfile.mkstemp()
+    try:
+        with os.fdopen(handle, "w") as file:
+            file.write(text)
+
+        elapsed, peak = measure_streaming(path)
+        print(f"{'StreamingLiveness':<18}{elapsed:>8.2f} s{peak / (1 << 20):>10.1f} MiB peak")
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
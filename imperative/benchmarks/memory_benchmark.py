@@ -0,0 +1,81 @@
+"""
+    Measures how many bytes each parsed instruction takes in memory.
+
+    "before" parses the block with the input package as it was at a baseline
+    revision (the repository's first commit unless one is given), "after" with
+    the current one. Both use Parser on top of Scanner, each in its own process
+    so neither sees the other's classes or allocations.
+
+    Run from the imperative directory:
+        python -m benchmarks.memory_benchmark [number of lines] [baseline revision]
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+def generate_block(lines: int) -> str:
+    """
+        Generates a block cycling through all three instruction shapes.
+    """
+    shapes = ["t{0} = a + {0}\n", "b = t{0} * c\n", "c = -t{0}\n", "a = b\n"]
+
+    return "".join(shapes[i % len(shapes)].format(i) for i in range(lines)) + "live: a, b, c\n"
+
+def measure(lines: int) -> None:
+    """
+        Parses a block with whichever input package is importable and prints the
+        number of instructions and the bytes the parsed block left allocated.
+    """
+    from input.parser import Parser
+    from input.scanner import Scanner
+
+    text = generate_block(lines)
+
+    tracemalloc.start()
+    buffer = Parser(Scanner(io.StringIO(text))).parse()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(len(buffer.instructions), size)
+
+def run(path: str, lines: int) -> tuple[int, int]:
+    """
+        Runs measure() in a new process, importing the input package from path.
+    """
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", str(lines)],
+        env={**os.environ, "PYTHONPATH": path}, capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    return int(output[0]), int(output[1])
+
+def main(lines: int, revision: str | None) -> None:
+    imperative = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    if revision is None:
+        revision = subprocess.run(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=imperative, capture_output=True, text=True, check=True).stdout.split()[0]
+
+    with tempfile.TemporaryDirectory() as baseline:
+        archive = subprocess.run(["git", "archive", revision, "input"], cwd=imperative, capture_output=True, check=True).stdout
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(baseline, filter="data")
+
+        count, before = run(baseline, lines)
+
+    _, after = run(imperative, lines)
+
+    print(f"baseline revision:       {revision[:7]}")
+    print(f"instructions:            {count}")
+    print(f"before (bytes/instr):    {before / count:.1f}")
+    print(f"after  (bytes/instr):    {after / count:.1f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        measure(int(sys.argv[2]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000, sys.argv[2] if len(sys.argv) > 2 else None)
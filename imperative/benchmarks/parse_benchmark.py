@@ -0,0 +1,66 @@
+"""
+    Measures parse throughput (instructions per second) of the parser variants
+    on a block made of the instruction shapes found in tests/input1.txt.
+
+    Run from the imperative directory:
+        python -m benchmarks.parse_benchmark [number of lines]
+"""
+
+import io
+import sys
+import tempfile
+import time
+from input.buffer_cache import BufferCache
+from input.fast_parser import FastParser
+from input.parser import Parser
+from input.scanner import Scanner
+from input.table_scanner import TableScanner
+
+def generate_block(lines: int) -> str:
+    """
+        Generates a block cycling through the shapes used in tests/input1.txt.
+    """
+    shapes = ["a = a + 1\n", "t{0} = a * 4\n", "t2 = t{0} + 1\n", "t3 = a * 3\n", "b = t2 - t3\n", "t4 = b / 2\n", "d = c + t4\n"]
+
+    return "".join(shapes[i % len(shapes)].format(i) for i in range(lines)) + "live: d\n"
+
+def measure(parser_class, scanner_class, text: str) -> float:
+    """
+        Parses the text and returns the number of instructions parsed per second.
+    """
+    start = time.perf_counter()
+    buffer = parser_class(scanner_class(io.StringIO(text))).parse()
+    elapsed = time.perf_counter() - start
+
+    return len(buffer.get_instructions()) / elapsed
+
+def measure_cached(text: str) -> float:
+    """
+        Loads the text's buffer from a warm BufferCache and returns the number of instructions per second.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        cache = BufferCache(directory, max_bytes=1 << 30)
+        cache.parse(text)
+
+        start = time.perf_counter()
+        buffer = cache.parse(text)
+        elapsed = time.perf_counter() - start
+
+    return len(buffer.get_instructions()) / elapsed
+
+def main(lines: int) -> None:
+    text = generate_block(lines)
+
+    baseline = measure(Parser, Scanner, text)
+    variants = [
+        ("Parser + Scanner", baseline),
+        ("Parser + TableScanner", measure(Parser, TableScanner, text)),
+        ("FastParser", measure(FastParser, TableScanner, text)),
+        ("BufferCache hit", measure_cached(text)),
+    ]
+
+    for name, rate in variants:
+        print(f"{name:<24}{rate:>12.0f} instr/s  ({rate / baseline:.1f}x)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
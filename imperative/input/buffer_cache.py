@@ -0,0 +1,268 @@
+import hashlib
+import io
+import os
+import struct
+import sys
+import zlib
+from input.fast_parser import FastParser
+from input.instruction_buffer import InstructionBuffer
+from input.instruction_columns import InstructionColumns
+from input.parser import Parser
+from input.scanner import Scanner
+from input.symbol_table import SymbolTable
+from input.table_scanner import TableScanner
+
+class BufferCache:
+    """
+    On-disk cache of parsed InstructionBuffers, keyed by a hash of the input text.
+
+    Entries are the buffer's instruction columns written out as raw arrays, followed
+    by its variable names, literals, live objects and occurred variables. Loading one is mostly a copy
+    of those arrays back into memory, no text gets scanned again.
+
+    The cache is kept under max_bytes by removing the least recently used entries.
+    Any entry that can't be read back (corrupt, truncated, written by another
+    version or on a machine with a different byte order) is removed and the text
+    is parsed again instead.
+    """
+
+    magic = b"IBUF"
+    version = 2
+
+    # magic, version, little endian, size of an 'i' item, rows, then the byte lengths of the
+    # names, literals, live objects and occurred variables sections, then a checksum of the body
+    header = struct.Struct("<4sBBBxIIIIII")
+
+    extension = ".ibuf"
+
+    def __init__(self, directory: str, max_bytes: int = 64 << 20, parser_class: type[Parser] = FastParser, scanner_class: type[Scanner] = TableScanner) -> None:
+        """
+        :param directory: Directory holding the cache entries, created if needed.
+        :type directory: str
+        :param max_bytes: Total size the entries are kept under.
+        :type max_bytes: int
+        :param parser_class: Parser used on a cache miss.
+        :type parser_class: type[Parser]
+        :param scanner_class: Scanner used on a cache miss.
+        :type scanner_class: type[Scanner]
+        """
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.parser_class: type[Parser] = parser_class
+        self.scanner_class: type[Scanner] = scanner_class
+
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(text: str) -> str:
+        """
+        Gets the cache key of an input text.
+
+        :param text: The input text.
+        :type text: str
+        :return: The key, a hex digest of the text.
+        :rtype: str
+        """
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    @classmethod
+    def dump(cls, instruction_buffer: InstructionBuffer) -> bytes:
+        """
+        Serializes an instruction buffer.
+
+        :param instruction_buffer: The buffer to serialize.
+        :type instruction_buffer: InstructionBuffer
+        :return: The serialized buffer.
+        :rtype: bytes
+        """
+        columns: InstructionColumns = instruction_buffer.get_columns()
+
+        # Names can't hold newlines (they end a line of input), so they make a safe separator
+        names: bytes = "\n".join(instruction_buffer.get_symbol_table()).encode("utf-8")
+        literals: bytes = "\n".join(columns.literals).encode("utf-8")
+        live: bytes = "\n".join(instruction_buffer.list_live_objects()).encode("utf-8")
+        occurred: bytes = "\n".join(instruction_buffer.get_occured_variables()).encode("utf-8")
+
+        body: bytes = b"".join([column.tobytes() for column in columns.columns()] + [names, literals, live, occurred])
+
+        return cls.header.pack(
+            cls.magic, cls.version, sys.byteorder == "little", columns.dest.itemsize,
+            len(columns), len(names), len(literals), len(live), len(occurred), zlib.crc32(body)
+        ) + body
+
+    @classmethod
+    def load(cls, data: bytes) -> InstructionBuffer:
+        """
+        Rebuilds an instruction buffer serialized by dump().
+
+        :param data: The serialized buffer.
+        :type data: bytes
+        :return: The instruction buffer.
+        :rtype: InstructionBuffer
+        :raises ValueError: If the data is not a buffer this version can read.
+        """
+        try:
+            magic, version, little, itemsize, rows, names_size, literals_size, live_size, occurred_size, checksum = cls.header.unpack_from(data)
+        except struct.error:
+            raise ValueError("Cache entry is truncated.")
+
+        columns: InstructionColumns = InstructionColumns(SymbolTable())
+
+        if magic != cls.magic or version != cls.version or little != (sys.byteorder == "little") or itemsize != columns.dest.itemsize:
+            raise ValueError("Cache entry was written in another format.")
+
+        body = memoryview(data)[cls.header.size:]
+
+        if zlib.crc32(body) != checksum:
+            raise ValueError("Cache entry is corrupt.")
+
+        # Copy each column straight back out of the body
+        offset: int = 0
+        for column in columns.columns():
+            size: int = rows * column.itemsize
+            column.frombytes(body[offset:offset + size])
+            offset += size
+
+        def section(size: int) -> list[str]:
+            nonlocal offset
+            text: str = str(body[offset:offset + size], "utf-8")
+            offset += size
+            return text.split("\n") if text else []
+
+        names: list[str] = section(names_size)
+        columns.literals = section(literals_size)
+        live_objects: list[str] = section(live_size)
+        occurred: list[str] = section(occurred_size)
+
+        if offset != len(body):
+            raise ValueError("Cache entry has the wrong size.")
+
+        columns.symbols.update(names)
+        columns.literal_codes = {literal: index for index, literal in enumerate(columns.literals)}
+
+        instruction_buffer: InstructionBuffer = InstructionBuffer()
+        instruction_buffer.set_symbol_table(columns.symbols)
+        instruction_buffer.set_occured_variables(set(occurred))
+
+        # One pass over the columns, every row's tokens are shared rather than re-created
+        try:
+            instruction_buffer.add_instructions(columns.instructions())
+        except IndexError:
+            raise ValueError("Cache entry refers to missing names.")
+
+        instruction_buffer.set_live_objects(live_objects)
+
+        # Already built, so liveness doesn't have to convert the instructions again
+        instruction_buffer.columns = columns
+
+        return instruction_buffer
+
+    def get(self, text: str) -> InstructionBuffer | None:
+        """
+        Gets the cached buffer for an input text.
+
+        :param text: The input text.
+        :type text: str
+        :return: The cached buffer, None if there isn't a usable one.
+        :rtype: InstructionBuffer | None
+        """
+        path: str = self._path(self.key(text))
+
+        try:
+            with open(path, "rb") as file:
+                data: bytes = file.read()
+        except OSError:
+            return None
+
+        try:
+            instruction_buffer: InstructionBuffer = self.load(data)
+        except ValueError:
+            # Unusable, get rid of it so it gets rewritten
+            self._remove(path)
+            return None
+
+        # Mark it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return instruction_buffer
+
+    def put(self, text: str, instruction_buffer: InstructionBuffer) -> None:
+        """
+        Caches the parsed buffer of an input text, then evicts entries if the cache got too big.
+
+        :param text: The input text.
+        :type text: str
+        :param instruction_buffer: The buffer parsed from the text.
+        :type instruction_buffer: InstructionBuffer
+        """
+        path: str = self._path(self.key(text))
+        temp: str = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(temp, "wb") as file:
+                file.write(self.dump(instruction_buffer))
+
+            # Readers only ever see a whole entry
+            os.replace(temp, path)
+        except OSError:
+            self._remove(temp)
+            return
+
+        self._evict()
+
+    def parse(self, text: str) -> InstructionBuffer:
+        """
+        Gets the buffer for an input text from the cache, parsing and caching it on a miss.
+
+        :param text: The input text.
+        :type text: str
+        :return: An InstructionBuffer containing all valid instructions and live objects.
+        :rtype: InstructionBuffer
+        :raises ValueError: If the text is not valid input (nothing is cached then).
+        """
+        instruction_buffer: InstructionBuffer | None = self.get(text)
+
+        if instruction_buffer is None:
+            instruction_buffer = self.parser_class(self.scanner_class(io.StringIO(text))).parse()
+            self.put(text, instruction_buffer)
+
+        return instruction_buffer
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache is under max_bytes.
+        """
+        entries: list[tuple[float, int, str]] = []
+
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(self.extension):
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total: int = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            self._remove(path)
+            total -= size
@@ -0,0 +1,155 @@
+from input.instruction_buffer import InstructionBuffer
+from input.symbol_table import SymbolTable
+
+class ControlFlowGraph:
+    """
+    A function made of labeled blocks. Every block is an InstructionBuffer whose
+    successors are the labels of the blocks control can go to after it.
+    The first block added is the entry.
+
+    All blocks share one symbol table, so a variable has the same ID in every block.
+    """
+
+    def __init__(self, symbols: SymbolTable | None = None) -> None:
+        self.blocks: dict[str, InstructionBuffer] = {} # Blocks by label, in the order they were added
+        self.symbols: SymbolTable = symbols if symbols is not None else SymbolTable()
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.blocks
+
+    def add_block(self, block: InstructionBuffer) -> None:
+        """
+        Adds a block to the graph. Its successors don't need to exist yet, see validate().
+
+        :param block: The block to add, with its label set.
+        :type block: InstructionBuffer
+        :raises ValueError: If the block has no label or its label is already used.
+        """
+        label: str | None = block.get_label()
+
+        if label is None:
+            raise ValueError("A block needs a label to be added to a control flow graph.")
+
+        if label in self.blocks:
+            raise ValueError(f"Block '{label}' is defined more than once.")
+
+        self.blocks[label] = block
+
+    def get_block(self, label: str) -> InstructionBuffer:
+        """
+        Gets a block by its label.
+
+        :param label: The block's label.
+        :type label: str
+        :return: The block.
+        :rtype: InstructionBuffer
+        :raises KeyError: If there is no such block.
+        """
+        return self.blocks[label]
+
+    def list_labels(self) -> list[str]:
+        """
+        Lists the labels of the blocks, in the order they were added.
+
+        :return: The labels.
+        :rtype: list[str]
+        """
+        return list(self.blocks)
+
+    def get_entry(self) -> str | None:
+        """
+        Gets the label of the entry block.
+
+        :return: The entry's label, None if the graph is empty.
+        :rtype: str | None
+        """
+        return next(iter(self.blocks), None)
+
+    def predecessors(self) -> dict[str, list[str]]:
+        """
+        Gets the blocks control can come from, for every block.
+
+        :return: The labels of the predecessors of each block.
+        :rtype: dict[str, list[str]]
+        """
+        predecessors: dict[str, list[str]] = {label: [] for label in self.blocks}
+
+        for label, block in self.blocks.items():
+            for successor in block.list_successors():
+                predecessors[successor].append(label)
+
+        return predecessors
+
+    def _postorder(self, root: str, visited: set[str]) -> list[str]:
+        """
+        Lists the blocks reachable from root that weren't visited yet, each after its successors (back edges aside).
+        """
+        postorder: list[str] = []
+        visited.add(root)
+        stack: list[tuple[str, int]] = [(root, 0)]
+
+        # Iterative depth-first search, long chains of blocks would overflow the recursion limit
+        while stack:
+            label, index = stack[-1]
+            successors: list[str] = self.blocks[label].successors
+
+            if index < len(successors):
+                stack[-1] = (label, index + 1)
+
+                if successors[index] not in visited:
+                    visited.add(successors[index])
+                    stack.append((successors[index], 0))
+            else:
+                stack.pop()
+                postorder.append(label)
+
+        return postorder
+
+    def reverse_postorder(self) -> list[str]:
+        """
+        Orders the blocks so that each comes before its successors, back edges aside.
+        Blocks that can't be reached from the entry come after all the others.
+
+        :return: The labels in reverse postorder.
+        :rtype: list[str]
+        """
+        order: list[str] = []
+        visited: set[str] = set()
+
+        # The entry is the first block, so it's searched from first
+        for root in self.blocks:
+            if root not in visited:
+                order.extend(reversed(self._postorder(root, visited)))
+
+        return order
+
+    def validate(self) -> None:
+        """
+        Checks that every successor is a block of the graph.
+
+        :raises ValueError: If a block goes to a label that doesn't exist.
+        """
+        for label, block in self.blocks.items():
+            for successor in block.list_successors():
+                if successor not in self.blocks:
+                    raise ValueError(f"Block '{label}' goes to undefined block '{successor}'.")
+
+    def __str__(self) -> str:
+        string = ""
+
+        for label, block in self.blocks.items():
+            string += f"block: {label}\n"
+
+            for instruction in block.iter_instructions():
+                string += str(instruction) + "\n"
+
+            if block.successors:
+                string += f"next: {', '.join(block.successors)}\n"
+
+            if block.live_objects:
+                string += f"live: {', '.join(block.list_live_objects())}\n"
+
+        return string
@@ -0,0 +1,140 @@
+import re
+from typing import Iterator
+from input.instruction_buffer import InstructionBuffer, Instruction
+from input.parser import Parser
+from input.scanner import Scanner
+from input.token import Token
+
+class FastParser(Parser):
+    """
+        Parser that recognizes the three instruction shapes straight from the text
+        of each line and builds the instructions directly, without tokenizing.
+
+        Lines that don't match a shape (the 'live:' section, unusual spacing or
+        names, errors) go through the scanner and the regular token-based path,
+        so the results and error messages are exactly the same as Parser's.
+        The scanner must read from a text stream (Scanner or TableScanner).
+    """
+
+    # dest = operand operator operand | dest = operator operand | dest = operand
+    instruction_pattern = re.compile(
+        r"[ \t]*(?P<dest>[A-Za-z][A-Za-z0-9]*) *= *(?:"
+        r"(?P<operand1>[0-9]+|[A-Za-z][A-Za-z0-9]*) *(?P<operator>[-+*/]) *(?P<operand2>[0-9]+|[A-Za-z][A-Za-z0-9]*)"
+        r"|(?P<unary_operator>[-+*/]) *(?P<unary_operand>[0-9]+|[A-Za-z][A-Za-z0-9]*)"
+        r"|(?P<source>[0-9]+|[A-Za-z][A-Za-z0-9]*)"
+        r") *\n"
+    )
+
+    operator_tokens = {op: Token.shared(op, Parser.types["operator"]) for op in ['+', '-', '*', '/']}
+
+    def __init__(self, scanner: Scanner):
+        super().__init__(scanner)
+
+        # Matched names repeat a lot, so each distinct one only gets one token
+        self.dest_tokens: dict[str, Token] = {}
+        self.operand_tokens: dict[str, Token] = {}
+
+    def _start_block(self) -> None:
+        super()._start_block()
+
+        # Cached tokens are how variables get tracked, so start over for every block
+        self.dest_tokens.clear()
+        self.operand_tokens.clear()
+
+    def _dest_token(self, value: str) -> Token:
+        """
+            Gets the shared destination token for a matched name.
+        """
+        token = self.dest_tokens.get(value)
+
+        if token is None:
+            self.occurred_variables.add(value)
+            token = self.dest_tokens[value] = Token(value, self.types["destination"])
+
+        return token
+
+    def _operand_token(self, value: str) -> Token:
+        """
+            Gets the shared operand token for a matched name or number.
+            Operands are literals when they start with a digit, variables otherwise.
+        """
+        token = self.operand_tokens.get(value)
+
+        if token is None:
+            if value[0].isdigit():
+                token = Token(value, self.types["literal"])
+            else:
+                self.occurred_variables.add(value)
+                token = Token(value, self.types["variable"])
+
+            self.operand_tokens[value] = token
+
+        return token
+
+    def _parse_slow(self, instruction_buffer: InstructionBuffer, line: str) -> list[Token] | None:
+        """
+            Parses a single line through the scanner and the token-based path.
+
+            :return: The rest of the line starting at 'live:' if it is encountered, None otherwise.
+            :rtype: list[Token] | None
+            :raises ValueError: If the line is not a valid instruction.
+        """
+        self.scanner.buffer = []
+        self.scanner.index = 0
+        self.scanner._tokenize_line(line)
+
+        if not self.scanner.buffer:
+            return None
+
+        return super()._parse_instructions(instruction_buffer, iter([self.scanner.buffer]))
+
+    def _parse_instructions(self, instruction_buffer: InstructionBuffer, lines: Iterator[list[Token]]) -> list[Token] | None:
+        """
+            Parses through lines representing instructions, validating
+            and adding them to the instruction buffer.
+
+            :param instruction_buffer: The instruction buffer to which instructions will be added.
+            :type instruction_buffer: InstructionBuffer
+            :param lines: Unused, lines are read as text from the scanner's stream instead.
+            :type lines: Iterator[list[Token]]
+            :return: The rest of the line starting at 'live:' if it is encountered, None if EOF is reached.
+            :rtype: list[Token] | None
+            :raises ValueError: If an invalid instruction format is encountered.
+        """
+        readline = self.scanner.file.readline
+        match_line = self.instruction_pattern.match
+        add_instruction = instruction_buffer.add_instruction
+        operator_tokens = self.operator_tokens
+        dest_token = self._dest_token
+        operand_token = self._operand_token
+        frequency: int = self.frequency
+
+        while True:
+            text: str = readline()
+            match = match_line(text)
+
+            if match is None:
+                line: str = text.lstrip()
+
+                if line == '': # EOF (or a blank line)
+                    if text != '' and self.scanner.skip_blank_lines:
+                        continue
+
+                    return None
+
+                live_line = self._parse_slow(instruction_buffer, line)
+                if live_line is not None:
+                    return live_line
+
+                # The line might have been a 'freq:' line
+                frequency = self.frequency
+                continue
+
+            dest, operand1, operator, operand2, unary_operator, unary_operand, source = match.groups()
+
+            if operand1 is not None:
+                add_instruction(Instruction(0, dest_token(dest), operand_token(operand1), operator_tokens[operator], operand_token(operand2), frequency))
+            elif unary_operator is not None:
+                add_instruction(Instruction(1, dest_token(dest), None, operator_tokens[unary_operator], operand_token(unary_operand), frequency))
+            else:
+                add_instruction(Instruction(2, dest_token(dest), operand_token(source), frequency=frequency))
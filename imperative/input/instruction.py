@@ -1,6 +1,8 @@
 from input.token import Token
 
 class Instruction:
+    __slots__ = ("type", "dest", "operand1", "operator", "operand2", "frequency")
+
     instruction_types = {
         "invalid": -1,
         "binary_operator": 0,
@@ -8,12 +10,13 @@ class Instruction:
         "assignment": 2
     }
 
-    def __init__(self, type: int, dest: Token, operand1: Token=None, operator: Token=None, operand2: Token=None):
+    def __init__(self, type: int, dest: Token, operand1: Token=None, operator: Token=None, operand2: Token=None, frequency: int=1):
         self.type: int = type
         self.dest: Token = dest
         self.operand1: Token = operand1
         self.operator: Token = operator
         self.operand2: Token = operand2
+        self.frequency: int = frequency # How often the instruction runs, relative to the others ('freq:' in the input)
 
     def __str__(self):
         match self.type:
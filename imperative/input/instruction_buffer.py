@@ -1,12 +1,19 @@
+from typing import Iterator
 from llist import dllist, dllistnode
 from input.instruction import Instruction
+from input.instruction_columns import InstructionColumns
 from input.scanner import Token
+from input.symbol_table import SymbolTable
 
 class InstructionBuffer:
     def __init__(self):
         self.instructions: dllist = dllist() # Instruction objects
         self.live_objects: dllist = dllist() # Strings representing live objects
         self.occured_variables: set[str] = set() # Set of unique variable names that have occurred in instructions
+        self.symbol_table: SymbolTable = SymbolTable() # IDs of the variables, filled in by the parser
+        self.columns: InstructionColumns | None = None # Columnar copy of the instructions, only made when asked for
+        self.label: str | None = None # Name of the block, only set in a control flow graph
+        self.successors: list[str] = [] # Labels of the blocks control can go to next
 
     def add_instruction(self, instruction: Instruction) -> None:
         """
@@ -17,6 +24,83 @@ class InstructionBuffer:
         """
         self.instructions.append(instruction)
 
+        if self.columns is not None:
+            self.columns.append(instruction)
+
+    def add_instructions(self, instructions: list[Instruction]) -> None:
+        """
+        Adds several instructions to the end of the instruction buffer, in order.
+
+        :param instructions: The instructions to add.
+        :type instructions: list[Instruction]
+        """
+        self.instructions.extend(instructions)
+
+        if self.columns is not None:
+            for instruction in instructions:
+                self.columns.append(instruction)
+
+    def insert_instruction(self, index: int, instruction: Instruction) -> None:
+        """
+        Inserts an instruction before the one currently at the given index.
+        An index equal to the number of instructions appends it.
+
+        :param index: Where the instruction is inserted.
+        :type index: int
+        :param instruction: The instruction to insert.
+        :type instruction: Instruction
+        """
+        if index == len(self.instructions):
+            self.instructions.append(instruction)
+        else:
+            self.instructions.insert(instruction, self.instructions.nodeat(index))
+
+        if self.columns is not None:
+            self.columns.insert(index, instruction)
+
+    def remove_instruction(self, index: int) -> Instruction:
+        """
+        Removes the instruction at the given index.
+
+        :param index: Index of the instruction to remove.
+        :type index: int
+        :return: The removed instruction.
+        :rtype: Instruction
+        """
+        if self.columns is not None:
+            self.columns.remove(index)
+
+        return self.instructions.remove(self.instructions.nodeat(index))
+
+    def replace_instruction(self, index: int, instruction: Instruction) -> Instruction:
+        """
+        Replaces the instruction at the given index.
+
+        :param index: Index of the instruction to replace.
+        :type index: int
+        :param instruction: The new instruction.
+        :type instruction: Instruction
+        :return: The instruction that was replaced.
+        :rtype: Instruction
+        """
+        node: dllistnode = self.instructions.nodeat(index)
+        old: Instruction = node.value
+        node.value = instruction
+
+        if self.columns is not None:
+            self.columns.replace(index, instruction)
+
+        return old
+
+    def set_live_objects(self, live_objects: list[str]) -> None:
+        """
+        Replaces the live objects of the instruction buffer.
+
+        :param live_objects: The new live objects.
+        :type live_objects: list[str]
+        """
+        self.live_objects = dllist(live_objects)
+
     def add_live_object(self, live_object: str) -> None:
         """
         Adds a live object to the instruction buffer.
@@ -26,6 +110,42 @@ class InstructionBuffer:
         """
         self.live_objects.append(live_object)
 
+    def set_label(self, label: str) -> None:
+        """
+        Sets the name of the block.
+
+        :param label: The block's label.
+        :type label: str
+        """
+        self.label = label
+
+    def get_label(self) -> str | None:
+        """
+        Gets the name of the block.
+
+        :return: The block's label, None if it isn't part of a control flow graph.
+        :rtype: str | None
+        """
+        return self.label
+
+    def set_successors(self, successors: list[str]) -> None:
+        """
+        Sets the blocks control can go to after this one.
+
+        :param successors: The labels of the successor blocks.
+        :type successors: list[str]
+        """
+        self.successors = list(successors)
+
+    def list_successors(self) -> list[str]:
+        """
+        Lists the blocks control can go to after this one.
+
+        :return: The labels of the successor blocks.
+        :rtype: list[str]
+        """
+        return list(self.successors)
+
     def list_instructions(self) -> list[Token]:
         """
             Lists all instructions in the instruction buffer.
@@ -35,6 +155,75 @@ class InstructionBuffer:
         """
         return [node.value for node in self.instructions.iternodes()]
 
+    def iter_instructions(self, reverse: bool = False) -> Iterator[Instruction]:
+        """
+            Iterates over the instructions without copying them into a list.
+
+            :param reverse: Whether to go from the last instruction to the first.
+            :type reverse: bool
+            :return: Iterator over the instructions.
+            :rtype: Iterator[Instruction]
+        """
+        node: dllistnode | None = self.instructions.last if reverse else self.instructions.first
+
+        while node is not None:
+            yield node.value
+            node = node.prev if reverse else node.next
+
+    def iter_variable_ids(self, reverse: bool = False) -> Iterator[tuple[int, int, int, int]]:
+        """
+            Iterates over the opcode and variable IDs of each instruction. They are read from
+            the columns if those were already made (see get_columns()), from the instructions
+            otherwise, so the columns are never built just for this.
+
+            :param reverse: Whether to go from the last instruction to the first.
+            :type reverse: bool
+            :return: Iterator over (opcode, destination, operand 1, operand 2), operands that
+                aren't variables are -1.
+            :rtype: Iterator[tuple[int, int, int, int]]
+        """
+        if self.columns is not None:
+            columns: InstructionColumns = self.columns
+            indices: range = range(len(columns) - 1, -1, -1) if reverse else range(len(columns))
+
+            for i in indices:
+                src1: int = columns.src1[i]
+                src2: int = columns.src2[i]
+                yield columns.opcode[i], columns.dest[i], src1 if src1 >= 0 else -1, src2 if src2 >= 0 else -1
+
+            return
+
+        add = self.symbol_table.add
+        variable_type: int = 1 # Token type for variables
+
+        for instruction in self.iter_instructions(reverse):
+            operand1: Token | None = instruction.operand1
+            operand2: Token | None = instruction.operand2
+
+            yield (
+                instruction.type,
+                add(instruction.dest.value),
+                add(operand1.value) if operand1 is not None and operand1.type == variable_type else -1,
+                add(operand2.value) if operand2 is not None and operand2.type == variable_type else -1
+            )
+
+    def get_columns(self) -> InstructionColumns:
+        """
+        Gets the instructions in columnar (struct-of-arrays) form. They are converted
+        the first time this is called, then kept in sync as instructions are
+        added, inserted, removed or replaced through the buffer.
+
+        :return: The columnar instructions.
+        :rtype: InstructionColumns
+        """
+        if self.columns is None:
+            self.columns = InstructionColumns(self.symbol_table)
+
+            for instruction in self.iter_instructions():
+                self.columns.append(instruction)
+
+        return self.columns
+
     def list_live_objects(self) -> list[str]:
         """
             Lists all live objects in the instruction buffer.
@@ -79,11 +268,35 @@ class InstructionBuffer:
         """
         return self.occured_variables
 
+    def set_symbol_table(self, symbol_table: SymbolTable) -> None:
+        """
+        Sets the symbol table giving the IDs of the variables in the instruction buffer.
+        :param symbol_table: The symbol table.
+        :type symbol_table: SymbolTable
+        """
+        self.symbol_table = symbol_table
+        self.columns = None # Its variable codes were IDs from the old table
+
+    def get_symbol_table(self) -> SymbolTable:
+        """
+        Gets the symbol table giving the IDs of the variables in the instruction buffer.
+        Variables that weren't in it yet get an ID when something asks for one.
+        :return: The symbol table.
+        :rtype: SymbolTable
+        """
+        return self.symbol_table
+
     def __str__(self):
         string = ""
+        frequency = 1
+
+        for instruction in self.iter_instructions():
+            # Frequencies only show up where they change, the way they are read
+            if instruction.frequency != frequency:
+                frequency = instruction.frequency
+                string += f"freq: {frequency}\n"
 
-        for node in self.list_instructions():
-            string += node + "\n"
+            string += str(instruction) + "\n"
 
 
         string += "live: "
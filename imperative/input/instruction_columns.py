@@ -0,0 +1,238 @@
+from array import array
+from input.instruction import Instruction
+from input.symbol_table import SymbolTable
+from input.token import Token
+
+class InstructionColumns:
+    """
+    Struct-of-arrays form of an instruction stream: instruction i is row i across
+    the opcode, dest, src1, op, src2 and frequency arrays.
+
+    Operands are stored as integer codes into shared tables:
+        >= 0  a variable, its ID in the symbol table
+        -1    no operand
+        <= -2 a literal, index (-code - 2) into literals
+    Operators are stored as their index in operators, -1 if there is none.
+    """
+
+    # Token types needed to rebuild instructions
+    types = {
+        'destination': 0,
+        'variable': 1,
+        'literal': 2,
+        'operator': 3
+    }
+
+    operators = ['+', '-', '*', '/']
+    operator_codes = {op: code for code, op in enumerate(operators)}
+
+    none = -1 # Code for a missing operand/operator
+
+    def __init__(self, symbols: SymbolTable | None = None) -> None:
+        self.opcode: array = array('b') # Instruction type
+        self.dest: array = array('i')
+        self.src1: array = array('i')
+        self.op: array = array('b')
+        self.src2: array = array('i')
+        self.frequency: array = array('I') # Execution frequency, 1 unless the input gave one
+
+        self.symbols: SymbolTable = symbols if symbols is not None else SymbolTable() # Variable names, by code
+        self.literals: list[str] = [] # Literal values, by -code - 2
+        self.literal_codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.opcode)
+
+    def name_code(self, name: str) -> int:
+        """
+        Gets the code (symbol table ID) of a variable name, adding it to the table if it's new.
+
+        :param name: The variable name.
+        :type name: str
+        :return: The variable's code.
+        :rtype: int
+        """
+        return self.symbols.add(name)
+
+    def _literal_code(self, literal: str) -> int:
+        index = self.literal_codes.get(literal)
+
+        if index is None:
+            index = self.literal_codes[literal] = len(self.literals)
+            self.literals.append(literal)
+
+        return -index - 2
+
+    def _operand_code(self, token: Token | None) -> int:
+        if token is None:
+            return self.none
+
+        if token.type == self.types["literal"]:
+            return self._literal_code(token.value)
+
+        return self.name_code(token.value)
+
+    def _row(self, instruction: Instruction) -> tuple[int, int, int, int, int, int]:
+        """
+        Encodes an instruction into its row of codes.
+        """
+        return (
+            instruction.type,
+            self.name_code(instruction.dest.value),
+            self._operand_code(instruction.operand1),
+            self.none if instruction.operator is None else self.operator_codes[instruction.operator.value],
+            self._operand_code(instruction.operand2),
+            instruction.frequency
+        )
+
+    def append(self, instruction: Instruction) -> None:
+        """
+        Adds an instruction as the last row.
+
+        :param instruction: The instruction to add.
+        :type instruction: Instruction
+        """
+        opcode, dest, src1, op, src2, frequency = self._row(instruction)
+
+        self.opcode.append(opcode)
+        self.dest.append(dest)
+        self.src1.append(src1)
+        self.op.append(op)
+        self.src2.append(src2)
+        self.frequency.append(frequency)
+
+    def insert(self, index: int, instruction: Instruction) -> None:
+        """
+        Inserts an instruction as a row before the given index.
+
+        :param index: Where the row is inserted.
+        :type index: int
+        :param instruction: The instruction to insert.
+        :type instruction: Instruction
+        """
+        for column, code in zip(self.columns(), self._row(instruction)):
+            column.insert(index, code)
+
+    def replace(self, index: int, instruction: Instruction) -> None:
+        """
+        Replaces the row at the given index.
+
+        :param index: Index of the row to replace.
+        :type index: int
+        :param instruction: The new instruction.
+        :type instruction: Instruction
+        """
+        for column, code in zip(self.columns(), self._row(instruction)):
+            column[index] = code
+
+    def remove(self, index: int) -> None:
+        """
+        Removes the row at the given index.
+
+        :param index: Index of the row to remove.
+        :type index: int
+        """
+        for column in self.columns():
+            del column[index]
+
+    def columns(self) -> tuple[array, array, array, array, array, array]:
+        """
+        Gets the opcode, dest, src1, op, src2 and frequency columns.
+
+        :return: The six columns, in that order.
+        :rtype: tuple[array, array, array, array, array, array]
+        """
+        return (self.opcode, self.dest, self.src1, self.op, self.src2, self.frequency)
+
+    def view(self, column: str) -> memoryview:
+        """
+        Gets a read-only view over one column, without copying it.
+        The columns can't change size while a view is held, so release it before editing.
+
+        :param column: One of "opcode", "dest", "src1", "op", "src2" or "frequency".
+        :type column: str
+        :return: A read-only memoryview of the column.
+        :rtype: memoryview
+        """
+        return memoryview(getattr(self, column)).toreadonly()
+
+    def variables(self, index: int) -> list[int]:
+        """
+        Gets the codes of the variables in a row, destination first
+        (same order as Instruction.get_variables()).
+
+        :param index: Index of the row.
+        :type index: int
+        :return: The variable codes.
+        :rtype: list[int]
+        """
+        variables: list[int] = [self.dest[index]]
+
+        if self.src1[index] >= 0:
+            variables.append(self.src1[index])
+        if self.src2[index] >= 0:
+            variables.append(self.src2[index])
+
+        return variables
+
+    def operand(self, code: int) -> str:
+        """
+        Gets the text of an operand code.
+
+        :param code: The operand code.
+        :type code: int
+        :return: The variable name or literal value.
+        :rtype: str
+        """
+        return self.symbols.names[code] if code >= 0 else self.literals[-code - 2]
+
+    def instructions(self) -> list[Instruction]:
+        """
+        Builds the Instruction objects for every row. Each variable, literal and operator
+        only gets one token per role, shared by all the rows using it.
+
+        :return: The instructions, in order.
+        :rtype: list[Instruction]
+        """
+        names: list[str] = self.symbols.names
+        dest_tokens: list[Token] = [Token(name, self.types["destination"]) for name in names]
+
+        # Laid out so that every operand code indexes it directly: variables from the front,
+        # -1 (none) is the last item, and literal -2, -3, ... counting back from it
+        operand_tokens: list[Token | None] = (
+            [Token(name, self.types["variable"]) for name in names] +
+            [Token(literal, self.types["literal"]) for literal in reversed(self.literals)] +
+            [None]
+        )
+        operator_tokens: list[Token | None] = [Token.shared(op, self.types["operator"]) for op in self.operators] + [None]
+
+        return [
+            Instruction(opcode, dest_tokens[dest], operand_tokens[src1], operator_tokens[op], operand_tokens[src2], frequency)
+            for opcode, dest, src1, op, src2, frequency in zip(*self.columns())
+        ]
+
+    def instruction(self, index: int) -> Instruction:
+        """
+        Builds the Instruction object for a row.
+
+        :param index: Index of the row.
+        :type index: int
+        :return: The instruction.
+        :rtype: Instruction
+        """
+        def token(code: int) -> Token | None:
+            if code == self.none:
+                return None
+
+            return Token(self.operand(code), self.types["variable"] if code >= 0 else self.types["literal"])
+
+        op: int = self.op[index]
+
+        return Instruction(
+            self.opcode[index],
+            Token(self.symbols.names[self.dest[index]], self.types["destination"]),
+            token(self.src1[index]),
+            None if op == self.none else Token.shared(self.operators[op], self.types["operator"]),
+            token(self.src2[index]),
+            self.frequency[index]
+        )
@@ -0,0 +1,226 @@
+import mmap
+import re
+from typing import Iterator
+from input.scanner import Scanner
+from input.token import Token
+
+class SpanToken(Token):
+    """
+        Token that only references its symbol inside a mapped buffer.
+        The text is decoded the first time its value is needed.
+    """
+    __slots__ = ("source", "offset", "length", "_value")
+
+    def __init__(self, source, offset: int, length: int, type: int):
+        self.source = source
+        self.offset: int = offset
+        self.length: int = length
+        self.type: int = type
+        self._value: str | None = None
+
+    @property
+    def value(self) -> str:
+        if self._value is None:
+            self._value = self.source[self.offset:self.offset + self.length].decode()
+
+        return self._value
+
+class MappedScanner(Scanner):
+    """
+        Scanner that memory-maps its input file and tokenizes it in place.
+        Tokens are kept as (offset, length, type) spans over the mapped bytes,
+        so no symbol is copied until something asks for its value.
+
+        Produces the same tokens and raises the same errors as Scanner for ASCII input.
+
+        close() (or leaving the scanner when used as a context manager) only drops the
+        scanner's own reference to the mapping. Tokens that haven't decoded their value yet
+        keep it alive, so a parsed block stays usable, and it is unmapped once the last of
+        them goes away.
+    """
+
+    # Each alternative names the token it matched, so most symbols are
+    # identified by the regex itself. Spaces and commas are never matched.
+    symbol_pattern = re.compile(
+        rb"(?P<single>[\n=+\-*/])"
+        rb"|(?P<literal>[0-9]+)(?![^\n=, +\-*/])"
+        rb"|(?P<live>live:)(?![^\n=, +\-*/])"
+        rb"|(?P<label_keyword>block:|next:)(?![^\n=, +\-*/])"
+        rb"|(?P<frequency>freq:)(?![^\n=, +\-*/])"
+        rb"|(?P<word>[^\n=, +\-*/]+)"
+    )
+
+    reject_pattern = re.compile(b"[" + re.escape("".join(Scanner.invalid + Scanner.operators).encode()) + b"]")
+
+    # Same characters str.lstrip() removes from the start of a line
+    leading_space = re.compile(rb"[ \t\n\r\x0b\x0c\x1c-\x1f]*")
+
+    # Single byte symbols, indexed by byte value
+    single_types = {ord(op): Scanner.types["operator"] for op in Scanner.operators}
+    single_types[ord('\n')] = Scanner.types["newline"]
+    single_types[ord('=')] = Scanner.types["equals"]
+
+    # Single byte symbols never need a span, they use the shared tokens
+    single_tokens = {byte: Token.shared(chr(byte), type) for byte, type in single_types.items()}
+
+    def __init__(self, path: str):
+        super().__init__(None) # There is no text stream, the mapped file is read directly
+
+        with open(path, "rb") as file:
+            try:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # Empty files cannot be mapped
+                self.map = b""
+
+        # Byte offset of the next line to be read
+        self.position: int = 0
+
+    def close(self) -> None:
+        """
+            Lets go of the mapped file, it is unmapped as soon as no token refers to it.
+            Reading on afterwards behaves as if EOF was reached.
+        """
+        self.map = b""
+        self.position = 0
+        self._reset()
+
+    def __enter__(self) -> "MappedScanner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _identify_word(self, start: int, end: int) -> int:
+        """
+            Identifies a symbol that is not a delimiter, literal or keyword.
+
+            :param start: Offset of the symbol in the mapped file.
+            :type start: int
+            :param end: Offset just past the symbol.
+            :type end: int
+            :return: Identified type as an integer.
+            :rtype: int
+            :raises ValueError: If the symbol contains invalid characters.
+        """
+
+        if self.reading == "live":
+            return self.types["live_symbol"]
+
+        if self.reading == "labels":
+            return self.types["label"]
+
+        if self.reject_pattern.search(self.map, start, end):
+            raise ValueError(f"Invalid character in symbol: {self.map[start:end].decode()}")
+
+        if 48 <= self.map[start] <= 57: # ASCII digit
+            raise ValueError(f"Invalid symbol starting with number: {self.map[start:end].decode()}")
+
+        return self.types["destination"] if len(self.buffer) == 0 else self.types["variable"]
+
+    def _readline(self) -> bool:
+        """
+            Tokenizes the next line of the mapped file into spans in the internal buffer.
+
+            :return: True if EOF, False otherwise.
+            :rtype: bool
+        """
+        source = self.map
+
+        while True:
+            newline = source.find(b"\n", self.position)
+            line_end = len(source) if newline == -1 else newline + 1
+
+            # Same as lstrip(), a blank line ends the input unless blank lines are skipped
+            start = self.leading_space.match(source, self.position, line_end).end()
+            self.position = line_end
+
+            if start < line_end:
+                break
+
+            if not self.skip_blank_lines or line_end == len(source):
+                return True
+
+        self.buffer = []
+        self.index = 0
+
+        # A '\r\n' line ending reads as '\n' in text mode
+        content_end = line_end if newline == -1 else newline
+        if newline > start and source[newline - 1] == 13:
+            content_end -= 1
+
+        self._tokenize_span(start, content_end)
+
+        if newline != -1:
+            self.buffer.append((newline, 1, self.types["newline"]))
+
+        return False
+
+    def _tokenize_span(self, start: int, end: int):
+        buffer = self.buffer
+
+        for match in self.symbol_pattern.finditer(self.map, start, end):
+            symbol_start, symbol_end = match.span()
+
+            match match.lastgroup:
+                case "single":
+                    type = self.single_types[self.map[symbol_start]]
+                case "literal":
+                    type = self.types["literal"]
+                case "live":
+                    self.reading = "live"
+                    type = self.types["live"]
+                case "label_keyword":
+                    self.reading = "labels"
+                    type = self.label_keywords[self.map[symbol_start:symbol_end].decode()]
+                case "frequency":
+                    type = self.types["frequency"]
+                case _:
+                    type = self._identify_word(symbol_start, symbol_end)
+
+            buffer.append((symbol_start, symbol_end - symbol_start, type))
+
+    def next_span(self) -> tuple[int, int, int]:
+        """
+            Get the next token from the mapped file as an (offset, length, type) span.
+
+            :return: Next span. An EOF span of length 0 when the file is exhausted.
+            :rtype: tuple[int, int, int]
+        """
+        if len(self.buffer) - 1 == self.index or len(self.buffer) == 0:
+            if (self._readline()): # EOF reached
+                return (self.position, 0, self.types["EOF"])
+        else:
+            self.index += 1
+
+        return self.buffer[self.index]
+
+    def next_token(self) -> Token:
+        """
+            Get the next token from the mapped file. Its value is decoded lazily.
+
+            :return: Next token from the file. EOF token when the file is exhausted.
+            :rtype: Token
+        """
+        return self._span_token(self.next_span())
+
+    def _span_token(self, span: tuple[int, int, int]) -> Token:
+        """
+            Wraps a span into a token, using the shared tokens where possible.
+        """
+        offset, length, type = span
+
+        if type in self.shared_types:
+            return self.single_tokens[self.map[offset]]
+
+        return SpanToken(self.map, offset, length, type)
+
+    def lines(self) -> Iterator[list[Token]]:
+        """
+            Lazily yields the tokens of each line of the mapped file, until EOF.
+
+            :return: Iterator over the tokenized lines.
+            :rtype: Iterator[list[Token]]
+        """
+        while not self._readline():
+            if self.buffer:
+                yield [self._span_token(span) for span in self.buffer]
@@ -0,0 +1,167 @@
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from input.instruction import Instruction
+from input.instruction_buffer import InstructionBuffer
+from input.parser import Parser
+from input.symbol_table import SymbolTable
+from input.table_scanner import TableScanner
+
+# A line holding nothing but whitespace reads as EOF to the scanner
+blank_line = re.compile(r"^[^\S\n]*\n", re.MULTILINE)
+
+# Frequency of the instructions before a chunk's first 'freq:' line, which comes from earlier chunks.
+# 'freq:' only takes a literal, so no line can set it
+carried_frequency = -1
+
+def _parse_chunk(path: str, start: int, end: int) -> tuple[list[Instruction], SymbolTable, str, int]:
+    """
+        Scans and validates the instructions in bytes [start, end) of the file.
+        Runs inside a worker process.
+
+        :param path: Path to the input file.
+        :type path: str
+        :param start: Offset of the first byte of the chunk (start of a line).
+        :type start: int
+        :param end: Offset just past the chunk (start of a line, or end of file).
+        :type end: int
+        :return: The chunk's instructions and occurred variables, how it ended:
+                "end" if the whole chunk was read,
+                "eof" if a blank line ended the input,
+                "live" if 'live:' was found (nothing else is returned then),
+                and the frequency set by its last 'freq:' line. Instructions before the
+                chunk's first 'freq:' line (and the returned frequency, if there is none)
+                are carried_frequency, it comes from earlier chunks.
+        :rtype: tuple[list[Instruction], SymbolTable, str, int]
+        :raises ValueError: If an invalid instruction is found in the chunk.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        data: bytes = file.read(end - start)
+
+    # Decode the same way the sequential parser's text stream does (universal newlines)
+    text: str = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").read()
+    ending: str = "end"
+
+    blank = blank_line.search(text)
+    if blank:
+        text = text[:blank.start()]
+        ending = "eof"
+
+    parser = Parser(TableScanner(io.StringIO(text)))
+    parser.frequency = carried_frequency
+    instruction_buffer = InstructionBuffer()
+
+    if parser._parse_instructions(instruction_buffer, parser.scanner.lines()) is not None:
+        return [], SymbolTable(), "live", carried_frequency
+
+    return instruction_buffer.list_instructions(), parser.occurred_variables, ending, parser.frequency
+
+class ParallelParser:
+    """
+        Parses a large input file by splitting it on line boundaries, then scanning
+        and validating the chunks in a process pool. The results are stitched back
+        together in order, and the 'live:' section is parsed sequentially.
+
+        The resulting InstructionBuffer, and any error raised, are the same as
+        the sequential Parser's on the same file.
+    """
+
+    def __init__(self, path: str, workers: int | None = None, chunk_size: int = 1 << 20):
+        self.path: str = path
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size: int = chunk_size # Bytes per chunk, before moving to the next line break
+
+    def _chunks(self) -> list[tuple[int, int]]:
+        """
+            Splits the file into byte ranges that each end at a line break.
+
+            :return: List of (start, end) byte offsets.
+            :rtype: list[tuple[int, int]]
+        """
+        size: int = os.path.getsize(self.path)
+        chunks: list[tuple[int, int]] = []
+        start: int = 0
+
+        with open(self.path, "rb") as file:
+            while start < size:
+                end = min(start + self.chunk_size, size)
+
+                # Move the end of the chunk just past the next newline
+                if end < size:
+                    file.seek(end)
+                    end += len(file.readline())
+
+                chunks.append((start, end))
+                start = end
+
+        return chunks
+
+    def _parse_tail(self, instruction_buffer: InstructionBuffer, occurred_variables: SymbolTable, start: int, frequency: int = 1) -> None:
+        """
+            Sequentially parses the file from the given offset to its end,
+            continuing from what the workers have already parsed.
+        """
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            parser = Parser(TableScanner(io.TextIOWrapper(file, encoding="utf-8")))
+            parser.occurred_variables = occurred_variables
+            parser.frequency = frequency
+
+            parser._parse_into(instruction_buffer)
+
+    def parse(self) -> InstructionBuffer:
+        """
+            Parses the file, using the process pool when it spans more than one chunk.
+
+            :return: An InstructionBuffer containing all valid instructions and live objects.
+            :rtype: InstructionBuffer
+            :raises ValueError: For the first invalid instruction or live object in the file.
+        """
+        chunks: list[tuple[int, int]] = self._chunks()
+        instruction_buffer: InstructionBuffer = InstructionBuffer()
+        occurred_variables: SymbolTable = SymbolTable()
+
+        if len(chunks) <= 1 or self.workers == 1:
+            self._parse_tail(instruction_buffer, occurred_variables, 0)
+            return instruction_buffer
+
+        frequency: int = 1 # Set by the last 'freq:' line so far
+        pool = ProcessPoolExecutor(self.workers)
+        try:
+            starts = [start for start, _ in chunks]
+            ends = [end for _, end in chunks]
+
+            # map() hands back results (and raises errors) in chunk order, so the
+            # first invalid line of the file is the one reported
+            for start, (instructions, variables, ending, last_frequency) in zip(starts, pool.map(_parse_chunk, repeat(self.path), starts, ends)):
+                if ending == "live":
+                    # Everything from here on depends on the variables seen so far
+                    self._parse_tail(instruction_buffer, occurred_variables, start, frequency)
+                    return instruction_buffer
+
+                for instruction in instructions:
+                    # Up to the chunk's first 'freq:' line, the frequency is carried over from before it
+                    if instruction.frequency == carried_frequency:
+                        instruction.frequency = frequency
+
+                    instruction_buffer.add_instruction(instruction)
+
+                if last_frequency != carried_frequency:
+                    frequency = last_frequency
+
+                # Chunks are merged in order, so IDs come out the same as the sequential parser's
+                occurred_variables.update(variables)
+
+                if ending == "eof":
+                    break
+        finally:
+            # Later chunks are not needed once the input has ended
+            pool.shutdown(cancel_futures=True)
+
+        instruction_buffer.set_symbol_table(occurred_variables)
+        instruction_buffer.set_occured_variables(set(occurred_variables))
+
+        return instruction_buffer
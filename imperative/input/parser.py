@@ -1,5 +1,9 @@
+from itertools import chain
+from typing import Iterator
+from input.control_flow_graph import ControlFlowGraph
 from input.instruction_buffer import InstructionBuffer, Instruction
 from input.scanner import Scanner
+from input.symbol_table import SymbolTable
 from input.token import Token
 
 class Parser:
@@ -12,9 +16,19 @@ class Parser:
         'live': 5,         # 'live:' occurs once
         'live_symbol': 6,  # ex. 'a,', 'c,', 'd,', etc... (excluding commas in tokens)
         'newline': 7,      # '\n', terminating character
+        'block': 8,        # 'block:' starts a labeled block (control flow graphs only)
+        'next': 9,         # 'next:' lists the successors of a block (control flow graphs only)
+        'label': 10,       # ex. 'entry', 'loop', block names after 'block:' or 'next:'
+        'frequency': 11,   # 'freq:' sets how often the instructions after it run
         'EOF': -1          # End of File
     }
 
+    # Token types that can be used as an operand
+    operand_types = {types["literal"], types["variable"]}
+
+    # Token types that end the instructions of a block
+    keyword_types = {types["live"], types["block"], types["next"]}
+
     instruction_types = {
         "invalid": -1,
         "binary_operator": 0,
@@ -24,7 +38,8 @@ class Parser:
 
     def __init__(self, scanner: Scanner):
         self.scanner = scanner
-        self.occurred_variables: set[str] = set()
+        self.occurred_variables: SymbolTable = SymbolTable() # Variables seen so far, numbered as they occur
+        self.frequency: int = 1 # Execution frequency of the instructions being read, set by 'freq:' lines
 
     def _validate_instruction(self, instruction: list[Token]) -> int:
         """
@@ -45,22 +60,22 @@ class Parser:
             case 6: # binary operator check
                 if (instruction[0].type == self.types["destination"] and  # destination
                     instruction[1].type == self.types["equals"] and  # equals sign
-                    instruction[2].type in [self.types["literal"], self.types["variable"]] and  # identifier or number
+                    instruction[2].type in self.operand_types and  # identifier or number
                     instruction[3].type == self.types["operator"] and  # operator
-                    instruction[4].type in [self.types["literal"], self.types["variable"]] and  # identifier or number
+                    instruction[4].type in self.operand_types and  # identifier or number
                     instruction[5].type == self.types["newline"]):  # newline
                     return self.instruction_types["binary_operator"]                    
             case 5: # unary operator check
                 if (instruction[0].type == self.types["destination"] and  # destination
                     instruction[1].type == self.types["equals"] and  # equals sign
                     instruction[2].type == self.types["operator"] and  # operator
-                    instruction[3].type in [self.types["literal"], self.types["variable"]] and  # identifier or number
+                    instruction[3].type in self.operand_types and  # identifier or number
                     instruction[4].type == self.types["newline"]):  # newline
                     return self.instruction_types["unary_operator"]
             case 4: # assignment check
                 if (instruction[0].type == self.types["destination"] and  # destination
                     instruction[1].type == self.types["equals"] and  # equals sign
-                    instruction[2].type in [self.types["literal"], self.types["variable"]] and  # identifier or number
+                    instruction[2].type in self.operand_types and  # identifier or number
                     instruction[3].type == self.types["newline"]):  # newline
                     return self.instruction_types["assignment"]
                 
@@ -68,66 +83,143 @@ class Parser:
         return self.instruction_types["invalid"]
        
 
-    def _parse_instructions(self, instruction_buffer: InstructionBuffer) -> bool:
+    def _track_variables(self, tokens: list[Token]) -> None:
+        """
+            Keeps track of every variable/destination among the given tokens.
+
+            :param tokens: The tokens to look through.
+            :type tokens: list[Token]
+        """
+        for token in tokens:
+            if token.type == self.types["variable"] or token.type == self.types["destination"]:
+                self.occurred_variables.add(token.value)
+
+    def _find_keyword(self, line: list[Token]) -> int | None:
+        """
+            Finds where a keyword ('live:', 'block:' or 'next:') is in a line of tokens.
+
+            :param line: The line of tokens.
+            :type line: list[Token]
+            :return: The index of the keyword token, None if there is none.
+            :rtype: int | None
+        """
+        for index, token in enumerate(line):
+            if token.type in self.keyword_types:
+                return index
+
+        return None
+
+    def _parse_frequency(self, line: list[Token]) -> int:
+        """
+            Reads the execution frequency after a 'freq:' keyword. It applies to the
+            instructions after it, until the next 'freq:' line or the end of the block.
+
+            :param line: The line starting at 'freq:'.
+            :type line: list[Token]
+            :return: The frequency.
+            :rtype: int
+            :raises ValueError: If the keyword isn't followed by exactly one literal, or it is too large.
+        """
+        values: list[Token] = [token for token in line[1:] if token.type != self.types["newline"]]
+
+        if len(values) != 1 or values[0].type != self.types["literal"]:
+            raise ValueError(f"A 'freq:' line needs exactly one literal, got {' '.join(token.value for token in values) or 'nothing'}.")
+
+        if int(values[0].value) > 0xFFFFFFFF:
+            raise ValueError(f"Frequency {values[0].value} is too large.")
+
+        return int(values[0].value)
+
+    def _expect_live(self, line: list[Token]) -> None:
+        """
+            Makes sure a line that ended the instructions is a 'live:' line.
+            Block labels and successors only mean something in a control flow graph.
+
+            :raises ValueError: If the line starts at 'block:' or 'next:'.
+        """
+        if line[0].type != self.types["live"]:
+            raise ValueError(f"'{line[0].value}' is only allowed in control flow graphs, parse them with parse_cfg().")
+
+    def _parse_instructions(self, instruction_buffer: InstructionBuffer, lines: Iterator[list[Token]]) -> list[Token] | None:
         """
-            Parses through tokens representing instructions, validating
+            Parses through lines of tokens representing instructions, validating
             and adding them to the instruction buffer.
-        
+
             :param instruction_buffer: The instruction buffer to which instructions will be added.
             :type instruction_buffer: InstructionBuffer
-            :return: True if EOF is reached, False if 'live:' is encountered.
-            :rtype: bool
+            :param lines: The tokenized lines, as given by Scanner.lines().
+            :type lines: Iterator[list[Token]]
+            :return: The rest of the line starting at a keyword ('live:', 'block:' or 'next:')
+                    if one is encountered, None if EOF is reached.
+            :rtype: list[Token] | None
             :raises ValueError: If an invalid instruction format is encountered.
         """
-        token: Token = self.scanner.next_token()
-        line: list[Token] = [] # Could change into a different implementation
+        add_variable = self.occurred_variables.add
+        add_instruction = instruction_buffer.add_instruction
+        variable: int = self.types["variable"]
 
-        # for now parse back into lines ig :/
-        while token.type != self.types["EOF"] and token.type != self.types["live"]:  # While not live or EOF
-            # Keep track of all tokens in the input
-            if token.type == self.types["variable"] or token.type == self.types["destination"]:
-                self.occurred_variables.add(token.value)
+        for line in lines:
+            type: int = self._validate_instruction(line)
 
-            line.append(token)
+            match type:
+                case 0: # binary operator
+                    add_variable(line[0].value)
+                    if line[2].type == variable:
+                        add_variable(line[2].value)
+                    if line[4].type == variable:
+                        add_variable(line[4].value)
 
-            if token.type == self.types["newline"]:
-                type: int = self._validate_instruction(line)
-
-                match type:
-                    case 0: # binary operator
-                        instr = Instruction(
-                            type=0,
-                            dest=line[0],
-                            operand1=line[2],
-                            operator=line[3],
-                            operand2=line[4]
-                        )
-                        instruction_buffer.add_instruction(instr)
-                    case 1: # unary operator
-                        instr = Instruction(
-                            type=1,
-                            dest=line[0],
-                            operator=line[2],
-                            operand2=line[3]
-                        )
-                        instruction_buffer.add_instruction(instr)
-                    case 2: # assignment
-                        instr = Instruction(
-                            type=2,
-                            dest=line[0],
-                            operand1=line[2]
-                        )
-                        instruction_buffer.add_instruction(instr)
-                    case -1:
-                        raise ValueError(f'Invalid instruction format. {" ".join([token.value for token in line])}')
+                    add_instruction(Instruction(
+                        type=0,
+                        dest=line[0],
+                        operand1=line[2],
+                        operator=line[3],
+                        operand2=line[4],
+                        frequency=self.frequency
+                    ))
+                case 1: # unary operator
+                    add_variable(line[0].value)
+                    if line[3].type == variable:
+                        add_variable(line[3].value)
+
+                    add_instruction(Instruction(
+                        type=1,
+                        dest=line[0],
+                        operator=line[2],
+                        operand2=line[3],
+                        frequency=self.frequency
+                    ))
+                case 2: # assignment
+                    add_variable(line[0].value)
+                    if line[2].type == variable:
+                        add_variable(line[2].value)
+
+                    add_instruction(Instruction(
+                        type=2,
+                        dest=line[0],
+                        operand1=line[2],
+                        frequency=self.frequency
+                    ))
+                case -1:
+                    if line[0].type == self.types["frequency"]:
+                        self.frequency = self._parse_frequency(line)
+                        continue
 
-                line = [] # reset line after validating
+                    keyword: int | None = self._find_keyword(line)
 
-            token = self.scanner.next_token() # get next token
+                    # Anything before the keyword is still tracked, but not validated
+                    self._track_variables(line if keyword is None else line[:keyword])
+
+                    if keyword is not None:
+                        return line[keyword:]
+
+                    # A last line without a newline never forms an instruction, it's dropped
+                    if line[-1].type == self.types["newline"]:
+                        raise ValueError(f'Invalid instruction format. {" ".join([token.value for token in line])}')
 
-        return token.type == self.types["EOF"]
+        return None
 
-    def _parse_live(self, instruction_buffer: InstructionBuffer) -> None:
+    def _parse_live(self, instruction_buffer: InstructionBuffer, live_line: list[Token], lines: Iterator[list[Token]]) -> None:
         """
             Parses through tokens representing live objects and adds them to the instruction buffer.
 
@@ -135,18 +227,19 @@ class Parser:
 
             :param instruction_buffer: The instruction buffer to which live objects will be added.
             :type instruction_buffer: InstructionBuffer
+            :param live_line: The line starting at 'live:'.
+            :type live_line: list[Token]
+            :param lines: The remaining tokenized lines.
+            :type lines: Iterator[list[Token]]
             :raises ValueError: If a live object has not been declared in previous instructions.
         """
-        # Here, "live:" has already been read
-        token = self.scanner.next_token()
-
         # Keep track of objects, dropping duplicates
         seen: set[str] = set()
 
-        while token.type != self.types["EOF"]:
+        # Here, "live:" has already been read
+        for token in chain(live_line[1:], chain.from_iterable(lines)):
             # Skip newlines, they don't affect the live objects
             if token.type == self.types["newline"]:
-                token = self.scanner.next_token()
                 continue
 
             # Make sure all tokens are live symbols!
@@ -161,7 +254,83 @@ class Parser:
                     instruction_buffer.add_live_object(token.value)
                     seen.add(token.value)
 
-            token = self.scanner.next_token()
+    def _parse_into(self, instruction_buffer: InstructionBuffer) -> None:
+        """
+            Parses through all remaining tokens from the scanner into the given buffer.
+
+            :param instruction_buffer: The instruction buffer to fill.
+            :type instruction_buffer: InstructionBuffer
+        """
+        lines: Iterator[list[Token]] = self.scanner.lines()
+
+        # Split into two, instructions, then lives objects.
+        live_line: list[Token] | None = self._parse_instructions(instruction_buffer, lines)
+
+        if live_line is not None:
+            self._expect_live(live_line)
+            self._parse_live(instruction_buffer, live_line, lines)
+
+        # Pass all of our occured variables, we will need this later
+        self._finish_block(instruction_buffer)
+
+    def _start_block(self) -> None:
+        """
+            Forgets the variables seen so far, before parsing a new block.
+        """
+        self.occurred_variables = SymbolTable()
+        self.frequency = 1
+
+    def _finish_block(self, instruction_buffer: InstructionBuffer) -> None:
+        """
+            Hands the variables seen in the block, and their IDs, to its instruction buffer.
+        """
+        instruction_buffer.set_symbol_table(self.occurred_variables)
+        instruction_buffer.set_occured_variables(set(self.occurred_variables))
+
+    def iter_blocks(self) -> Iterator[InstructionBuffer]:
+        """
+            Parses a stream holding several blocks, yielding one InstructionBuffer
+            at a time so that only the current block is ever held in memory.
+
+            Each block ends with its own 'live:' line, whose live objects are the rest
+            of that line ('live:' alone ends a block with nothing live). The last
+            block can also end at EOF without a 'live:' line. Blank lines, between
+            blocks or anywhere else, are skipped instead of ending the input.
+
+            :return: Iterator over the parsed blocks, in order.
+            :rtype: Iterator[InstructionBuffer]
+            :raises ValueError: If an invalid instruction or live object is encountered.
+        """
+        # Only while the blocks are read, a scanner used again afterwards ends at a blank line as usual
+        skip_blank_lines: bool = self.scanner.skip_blank_lines
+        self.scanner.skip_blank_lines = True
+
+        try:
+            lines: Iterator[list[Token]] = self.scanner.lines()
+
+            while True:
+                instruction_buffer: InstructionBuffer = InstructionBuffer()
+                self._start_block()
+
+                live_line: list[Token] | None = self._parse_instructions(instruction_buffer, lines)
+
+                if live_line is None:
+                    # EOF, only yield the last block if it has anything in it
+                    if len(instruction_buffer.get_instructions()) > 0:
+                        self._finish_block(instruction_buffer)
+                        yield instruction_buffer
+
+                    return
+
+                # Only the 'live:' line itself belongs to this block
+                self._expect_live(live_line)
+                self._parse_live(instruction_buffer, live_line, iter(()))
+                self.scanner.reading = "instructions"
+
+                self._finish_block(instruction_buffer)
+                yield instruction_buffer
+        finally:
+            self.scanner.skip_blank_lines = skip_blank_lines
 
     def parse(self) -> InstructionBuffer:
         """
@@ -173,13 +342,105 @@ class Parser:
         """
         instruction_buffer: InstructionBuffer = InstructionBuffer()
 
-        # Split into two, instructions, then lives objects.
-        eof: bool = self._parse_instructions(instruction_buffer)
+        self._parse_into(instruction_buffer)
 
-        if not eof:
-            self._parse_live(instruction_buffer)
+        return instruction_buffer
 
-        # Pass all of our occured variables, we will need this later
-        instruction_buffer.set_occured_variables(self.occurred_variables)
+    def _parse_labels(self, line: list[Token]) -> list[str]:
+        """
+            Reads the labels after a 'block:' or 'next:' keyword, dropping duplicates.
 
-        return instruction_buffer
+            :param line: The line starting at the keyword.
+            :type line: list[Token]
+            :return: The labels, in order.
+            :rtype: list[str]
+            :raises ValueError: If anything other than a label follows the keyword.
+        """
+        labels: list[str] = []
+
+        for token in line[1:]:
+            if token.type == self.types["newline"]:
+                continue
+
+            if token.type != self.types["label"]:
+                raise ValueError(f"Invalid label format. Expected label, got {token.type_string()}.")
+
+            if token.value not in labels:
+                labels.append(token.value)
+
+        return labels
+
+    def parse_cfg(self) -> ControlFlowGraph:
+        """
+            Parses a function made of labeled blocks into a control flow graph.
+
+            Every block starts with a 'block:' line naming it. It can end with a 'next:'
+            line listing the blocks control can go to after it, and a 'live:' line listing
+            objects live when control leaves the function from it. The first block is the entry:
+
+                block: entry
+                i = 0
+                next: loop
+                block: loop
+                i = i + 1
+                next: loop, exit
+                block: exit
+                live: i
+
+            :return: The blocks, sharing one symbol table.
+            :rtype: ControlFlowGraph
+            :raises ValueError: If an instruction, label or live object is invalid, a block is
+                    defined twice, instructions come outside of a block or after its 'next:'
+                    or 'live:' line, or a block goes to an undefined block.
+        """
+        lines: Iterator[list[Token]] = self.scanner.lines()
+        self._start_block() # One symbol table for the whole function
+
+        cfg: ControlFlowGraph = ControlFlowGraph(self.occurred_variables)
+        block: InstructionBuffer = InstructionBuffer() # Stays unlabeled until the first 'block:' line
+        ended: bool = False # Whether the block's 'next:' or 'live:' line was read
+
+        while True:
+            count: int = len(block.get_instructions())
+            line: list[Token] | None = self._parse_instructions(block, lines)
+            self.scanner.reading = "instructions"
+
+            if len(block.get_instructions()) > count and (ended or block.get_label() is None):
+                raise ValueError("Instructions must come after a 'block:' line and before the block's 'next:' or 'live:' line.")
+
+            if line is None or line[0].type == self.types["block"]:
+                if block.get_label() is not None:
+                    cfg.add_block(block)
+
+                if line is None:
+                    break
+
+                labels: list[str] = self._parse_labels(line)
+                if len(labels) != 1:
+                    raise ValueError(f"A 'block:' line needs exactly one label, got {len(labels)}.")
+
+                block = InstructionBuffer()
+                block.set_label(labels[0])
+                self.frequency = 1
+                ended = False
+            elif block.get_label() is None:
+                raise ValueError(f"'{line[0].value}' must come after a 'block:' line.")
+            elif line[0].type == self.types["next"]:
+                block.set_successors(list(dict.fromkeys(block.list_successors() + self._parse_labels(line))))
+                ended = True
+            else:
+                # Live objects only need to occur somewhere before them in the function
+                self._parse_live(block, line, iter(()))
+                block.set_live_objects(list(dict.fromkeys(block.list_live_objects())))
+                ended = True
+
+        cfg.validate()
+
+        for block in cfg.blocks.values():
+            block.set_symbol_table(self.occurred_variables)
+            block.set_occured_variables(
+                {token.value for instruction in block.iter_instructions() for token in instruction.get_variables()} |
+                set(block.list_live_objects())
+            )
+
+        return cfg
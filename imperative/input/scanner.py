@@ -1,4 +1,4 @@
-from typing import TextIO
+from typing import Iterator, TextIO
 from input.token import Token
 
 class Scanner:
@@ -21,14 +21,28 @@ class Scanner:
         'live': 5,         # 'live:' occurs once
         'live_symbol': 6,  # ex. 'a,', 'c,', 'd,', etc... (excluding commas in tokens)
         'newline': 7,      # '\n', terminating character
+        'block': 8,        # 'block:' starts a labeled block (control flow graphs only)
+        'next': 9,         # 'next:' lists the successors of a block (control flow graphs only)
+        'label': 10,       # ex. 'entry', 'loop', block names after 'block:' or 'next:'
+        'frequency': 11,   # 'freq:' sets how often the instructions after it run
         'EOF': -1          # End of File
     }
 
+    # Keywords naming blocks, the symbols after them on their line are labels
+    label_keywords = {'block:': types["block"], 'next:': types["next"]}
+
+    # Keyword giving the execution frequency of the instructions after it, a literal follows it
+    frequency_keyword = 'freq:'
+
+    # Types whose tokens always look the same, these are shared instead of re-created
+    shared_types = {types["operator"], types["equals"], types["newline"]}
+
     def __init__(self, file: TextIO):  
         self.file: TextIO = file
 
         # State on what we are reading
         self.reading: str = "instructions"  # instructions or live
+        self.skip_blank_lines: bool = False # A blank line ends the input, unless this is set
 
         # Scanner should hold the read line and which token it is passing
         self.index: int = 0 # to avoid shifting and quicker checks
@@ -73,8 +87,18 @@ class Scanner:
             self.reading = "live"
             return self.types["live"]
 
+        if symbol in self.label_keywords:
+            self.reading = "labels"
+            return self.label_keywords[symbol]
+
+        if symbol == self.frequency_keyword:
+            return self.types["frequency"]
+
         if self.reading == "live":
             return self.types["live_symbol"]
+
+        if self.reading == "labels":
+            return self.types["label"]
         
         # If the symbol is not any of the above, it's probably a variable; first check for invalid characters
         # if theres an invalid character, reject; if theres an operator with other stuff; also reject 
@@ -102,6 +126,9 @@ class Scanner:
         """
         type: int = self._identify(symbol)
 
+        if type in self.shared_types:
+            return Token.shared(symbol, type)
+
         return Token(symbol, type)
 
     def _readline(self) -> bool:
@@ -114,8 +141,13 @@ class Scanner:
             :rtype: bool
         """
         
+        line = self.file.readline()
+
+        while self.skip_blank_lines and line != '' and line.isspace():
+            line = self.file.readline()
+
         # get leading whitespace out so we can assume we are reading destination immediately
-        line = self.file.readline().lstrip()
+        line = line.lstrip()
 
         if line == '':
             return True
@@ -167,4 +199,25 @@ class Scanner:
 
         return self.buffer[self.index]
 
-        
+    def lines(self) -> Iterator[list[Token]]:
+        """
+            Lazily yields the tokens of each line of the input stream, until EOF.
+            Only one line is read at a time, so this also works on piped input.
+
+            :return: Iterator over the tokenized lines.
+            :rtype: Iterator[list[Token]]
+        """
+        while not self._readline():
+            if self.buffer:
+                yield self.buffer
+
+    def tokens(self) -> Iterator[Token]:
+        """
+            Lazily yields every token of the input stream, until EOF.
+            Unlike next_token(), no EOF token is produced.
+
+            :return: Iterator over the tokens.
+            :rtype: Iterator[Token]
+        """
+        for line in self.lines():
+            yield from line
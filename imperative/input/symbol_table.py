@@ -0,0 +1,73 @@
+from typing import Iterable, Iterator
+
+class SymbolTable:
+    """
+    Gives every variable name in a block a dense integer ID (0, 1, 2, ... in the
+    order the names first occur), so later passes can key on small integers
+    instead of hashing strings, and index arrays or bitsets with them.
+
+    IDs are never reused or taken back, a name keeps its ID for as long as the table lives.
+    """
+
+    def __init__(self) -> None:
+        self.names: list[str] = [] # Variable names, by ID
+        self.ids: dict[str, int] = {} # IDs, by variable name
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def add(self, name: str) -> int:
+        """
+        Adds a variable name to the table, if it isn't already in it.
+
+        :param name: The variable name.
+        :type name: str
+        :return: The name's ID.
+        :rtype: int
+        """
+        id = self.ids.get(name)
+
+        if id is None:
+            id = self.ids[name] = len(self.names)
+            self.names.append(name)
+
+        return id
+
+    def update(self, names: Iterable[str]) -> None:
+        """
+        Adds several variable names, in order.
+
+        :param names: The variable names.
+        :type names: Iterable[str]
+        """
+        for name in names:
+            self.add(name)
+
+    def get_id(self, name: str) -> int:
+        """
+        Gets the ID of a variable name.
+
+        :param name: The variable name.
+        :type name: str
+        :return: The name's ID.
+        :rtype: int
+        :raises KeyError: If the name is not in the table.
+        """
+        return self.ids[name]
+
+    def get_name(self, id: int) -> str:
+        """
+        Gets the variable name with the given ID.
+
+        :param id: The ID.
+        :type id: int
+        :return: The variable name.
+        :rtype: str
+        """
+        return self.names[id]
@@ -0,0 +1,79 @@
+import re
+from input.scanner import Scanner
+from input.token import Token
+
+class TableScanner(Scanner):
+    """
+        Scanner that tokenizes a whole line in a single pass using a precompiled
+        regex and lookup tables, instead of building symbols one character at a time.
+
+        Produces the same tokens and raises the same errors as Scanner.
+    """
+
+    # Matches either a full symbol or a delimiter that is a token by itself.
+    # Spaces and commas only separate symbols, so they are never matched.
+    symbol_pattern = re.compile(r"[^\n=, +\-*/]+|[\n=+\-*/]")
+
+    # Invalid characters, or an operator glued to other characters, reject a symbol
+    reject_pattern = re.compile("[" + re.escape("".join(Scanner.invalid + Scanner.operators)) + "]")
+
+    # Single character symbols are identified with one lookup
+    single_types = dict.fromkeys(Scanner.operators, Scanner.types["operator"])
+    single_types['\n'] = Scanner.types["newline"]
+    single_types['='] = Scanner.types["equals"]
+
+    # ...and always map to the same shared token
+    single_tokens = {symbol: Token.shared(symbol, type) for symbol, type in single_types.items()}
+
+    def _identify(self, symbol: str) -> int:
+        """
+            Identifies the given object/string into its tokenized 'type'.
+
+            :return: Identified type as an integer.
+            :rtype: int
+            :raises ValueError: If the symbol contains invalid characters.
+        """
+
+        type = self.single_types.get(symbol)
+        if type is not None:
+            return type
+
+        if symbol.isdigit():
+            return self.types["literal"]
+
+        if symbol == 'live:':
+            self.reading = "live"
+            return self.types["live"]
+
+        if symbol in self.label_keywords:
+            self.reading = "labels"
+            return self.label_keywords[symbol]
+
+        if symbol == self.frequency_keyword:
+            return self.types["frequency"]
+
+        if self.reading == "live":
+            return self.types["live_symbol"]
+
+        if self.reading == "labels":
+            return self.types["label"]
+
+        if self.reject_pattern.search(symbol):
+            raise ValueError(f"Invalid character in symbol: {symbol}")
+
+        if symbol[0].isdigit():
+            raise ValueError(f"Invalid symbol starting with number: {symbol}")
+
+        return self.types["destination"] if len(self.buffer) == 0 else self.types["variable"]
+
+    def _tokenize_line(self, line: str):
+        buffer = self.buffer
+        single_tokens = self.single_tokens
+
+        for symbol in self.symbol_pattern.findall(line):
+            # Delimiter tokens skip the full identification
+            token = single_tokens.get(symbol)
+            if token is None:
+                token = Token(symbol, self._identify(symbol))
+
+            buffer.append(token)
@@ -1,4 +1,7 @@
 class Token:
+    # Tokens are created for every symbol read, so skip the per-instance __dict__
+    __slots__ = ("value", "type")
+
     # Reference dict for types
     types = {
         0: "destination",  # 'd', 't3', 'z', destination (variable)
@@ -9,13 +12,48 @@ class Token:
         5: "live",         # 'live:' occurs once
         6: "live_symbol",  # 'a,', 'c,', 'd,', etc... (excluding commas in tokens)
         7: "newline",      # '\n', terminating character   
+        8: "block",        # 'block:' starts a labeled block
+        9: "next",         # 'next:' lists the successors of a block
+        10: "label",       # 'entry', 'loop', block names after 'block:' or 'next:'
+        11: "frequency",   # 'freq:' sets how often the instructions after it run
         -1: "EOF"          # End of File
     }
 
+    # Shared instances for symbols that always look the same (operators, '=', newline)
+    _shared: dict[tuple[str, int], "Token"] = {}
+
     def __init__(self, value: str, type: int):
         self.value: str = value
         self.type: int = type
 
+    @classmethod
+    def shared(cls, value: str, type: int) -> "Token":
+        """
+            Returns a shared (flyweight) token for the given value and type,
+            creating it the first time it is requested.
+            Shared tokens are used by many instructions, so they must not be modified.
+
+            :param value: The token's value.
+            :type value: str
+            :param type: The token's type.
+            :type type: int
+            :return: The shared token.
+            :rtype: Token
+        """
+        token = cls._shared.get((value, type))
+
+        if token is None:
+            token = cls._shared[(value, type)] = Token(value, type)
+
+        return token
+
+    def __reduce__(self):
+        # Shared tokens stay shared when sent to or from another process
+        if self._shared.get((self.value, self.type)) is self:
+            return (Token.shared, (self.value, self.type))
+
+        return (Token, (self.value, self.type))
+
     def type_string(self):
         """
             Returns the human-readable representation of the
@@ -0,0 +1,333 @@
+from collections import Counter
+from input.instruction_buffer import InstructionBuffer, Instruction
+from input.symbol_table import SymbolTable
+from intermediate.liveness import Liveness
+from intermediate.interference_graph import InterferenceGraph
+
+class AllocationSession:
+    """
+    Keeps the liveness, interference graph and coloring of a block up to date
+    while its instructions are edited.
+
+    Liveness only flows backwards, so an edit can only change the lines above it,
+    and only until a line comes out the same as before. Edges are counted per instruction
+    so they can be taken back out, and only the nodes whose edges changed get recolored.
+    Like Liveness and InterferenceGraph, everything is keyed on variable IDs internally.
+    """
+
+    def __init__(self, instruction_buffer: InstructionBuffer, registers: int) -> None:
+        self.instruction_buffer: InstructionBuffer = instruction_buffer
+        self.registers: int = registers
+
+        self.instructions: list[Instruction] = instruction_buffer.list_instructions() # Indexable copy, kept in sync
+        self.analysis: Liveness = Liveness(instruction_buffer)
+        self.symbols: SymbolTable = self.analysis.symbols
+        self.liveness: list[dict[int, int]] = self.analysis.get_liveness_ids() # One line per instruction, plus the end of the block
+        self.definitions: list[tuple[int, int | None]] = [] # Destination and copied variable of each instruction, as counted
+        self.entry: dict[int, int] = {} # The first line, as its entry interferences were counted
+        self.interference_graph: InterferenceGraph = InterferenceGraph()
+        self.interference_graph.symbols = self.symbols
+
+        self.edge_counts: Counter[tuple[int, int]] = Counter() # Number of lines each edge comes from
+        self.references: Counter[int] = Counter() # Number of instructions/live objects using each variable
+        self.touched: set[int] = set() # Nodes whose edges changed since the last recoloring
+        self.memory: set[int] = set() # Spilled variables, kept in memory: they have no node and take no register
+        self.defer_coloring: bool = False # While set, edits leave the coloring to recolor()
+
+        for instruction in self.instructions:
+            self._reference(instruction, 1)
+
+        for live in instruction_buffer.list_live_objects():
+            self._reference_variable(self.symbols.add(live), 1)
+
+        columns = instruction_buffer.get_columns()
+        for i in range(len(columns)):
+            self.definitions.append(self.interference_graph.definition(columns, i))
+            self._count_line(i, 1)
+
+        self._update_entry()
+
+        self.touched.clear()
+        self.interference_graph.color_graph(registers)
+
+    def _reference_variable(self, variable: int, count: int) -> None:
+        """
+        Adds (or takes back) references to a variable, keeping its node in the graph
+        only while something refers to it.
+        """
+        self.references[variable] += count
+
+        if self.references[variable] == 0:
+            del self.references[variable]
+            self.instruction_buffer.get_occured_variables().discard(self.symbols.get_name(variable))
+
+            if variable in self.memory:
+                self.memory.discard(variable)
+            else:
+                self.interference_graph.interference_graph.remove_node(variable)
+                del self.interference_graph.colors[variable]
+        elif variable not in self.interference_graph.colors and variable not in self.memory:
+            self.instruction_buffer.get_occured_variables().add(self.symbols.get_name(variable))
+            self.interference_graph.interference_graph.add_node(variable)
+            self.interference_graph.colors[variable] = None
+            self.touched.add(variable)
+
+    def _reference(self, instruction: Instruction, count: int) -> None:
+        for variable in {self.symbols.add(token.value) for token in instruction.get_variables()}:
+            self._reference_variable(variable, count)
+
+    def _count_edges(self, edges, count: int) -> None:
+        """
+        Adds (or takes back) one count of each edge.
+        """
+        graph = self.interference_graph.interference_graph
+
+        for var1, var2 in edges:
+            if var1 in self.memory or var2 in self.memory:
+                continue
+
+            edge = (var1, var2) if var1 < var2 else (var2, var1)
+            self.edge_counts[edge] += count
+
+            if self.edge_counts[edge] == 0:
+                del self.edge_counts[edge]
+                graph.remove_edge(*edge)
+                self.touched.update(edge)
+            elif count > 0 and self.edge_counts[edge] == count:
+                graph.add_edge(*edge)
+                self.touched.update(edge)
+
+    def _count_line(self, index: int, count: int) -> None:
+        """
+        Adds (or takes back) the edges coming from the instruction at the given index,
+        as it stands in the liveness and definitions lists.
+        """
+        self._count_edges(self.interference_graph.line_interferences(self.liveness[index], *self.definitions[index]), count)
+
+    def _update_entry(self) -> None:
+        """
+        Recounts the edges between the variables live coming into the block, if they changed.
+        """
+        if list(self.liveness[0].items()) != list(self.entry.items()):
+            self._count_edges(self.interference_graph.entry_interferences(self.entry), -1)
+            self.entry = self.liveness[0]
+            self._count_edges(self.interference_graph.entry_interferences(self.entry), 1)
+
+    def _update_liveness(self, index: int) -> None:
+        """
+        Recomputes liveness from the given line upwards, stopping as soon as
+        a line ends up the same as it was (every line above it then stays the same too).
+        A line set to None is recomputed regardless.
+
+        :param index: Index of the lowest line that might have changed.
+        :type index: int
+        """
+        # The buffer keeps its columns in sync with every edit, so they can be read directly
+        columns = self.instruction_buffer.get_columns()
+
+        for i in range(index, -1, -1):
+            carry_vars: list[int] = [var for var, state in self.liveness[i + 1].items() if state != Liveness.states["defined"]]
+            line: dict[int, int] = {}
+
+            self.analysis._mark_liveness(columns.variables(i), line, carry_vars)
+
+            old: dict[int, int] | None = self.liveness[i]
+            if old is not None:
+                # Order matters too, it's what liveness_info() shows
+                if list(old.items()) == list(line.items()):
+                    return
+
+                self._count_line(i, -1)
+
+            self.liveness[i] = line
+            self._count_line(i, 1)
+
+    def _update_coloring(self) -> None:
+        """
+        Recolors the nodes whose edges changed, if they now clash with a neighbor.
+        Falls back to coloring the whole graph when a node can't be recolored locally.
+        """
+        if self.defer_coloring:
+            return
+
+        graph = self.interference_graph
+        colors = graph.colors
+
+        for node in self.touched:
+            if node not in colors:
+                continue
+
+            color = colors[node]
+            if color is not None and all(colors[neighbor] != color for neighbor in graph.interference_graph.neighbors(node)):
+                continue
+
+            colors[node] = None
+            possible: set[int] = graph._possible_colors(node, self.registers)
+
+            if not possible:
+                for variable in colors:
+                    colors[variable] = None
+
+                graph.color_graph(self.registers)
+                break
+
+            colors[node] = min(possible)
+
+        self.touched.clear()
+
+    def recolor(self) -> set[str]:
+        """
+        Colors the whole graph again, with the graph's default strategy.
+
+        :return: The names of the variables left without a register.
+        :rtype: set[str]
+        """
+        self.touched.clear()
+
+        return self.interference_graph.color_graph(self.registers)
+
+    def keep_in_memory(self, variable: str) -> None:
+        """
+        Takes a variable out of the registers: its node and edges are dropped, and it isn't
+        counted in any edge from then on. Instructions still refer to it, reading or writing
+        it is a load or store. It stays in memory until nothing refers to it anymore.
+
+        :param variable: The name of the variable.
+        :type variable: str
+        """
+        id: int = self.symbols.get_id(variable)
+        if id in self.memory:
+            return
+
+        graph = self.interference_graph.interference_graph
+
+        # Every edge of the node is counted, and nothing else with it is
+        for neighbor in list(graph.neighbors(id)):
+            del self.edge_counts[(id, neighbor) if id < neighbor else (neighbor, id)]
+            self.touched.add(neighbor)
+
+        graph.remove_node(id)
+        del self.interference_graph.colors[id]
+        self.memory.add(id)
+
+    def insert(self, index: int, instruction: Instruction) -> None:
+        """
+        Inserts an instruction before the one at the given index (or at the end).
+
+        :param index: Where the instruction is inserted.
+        :type index: int
+        :param instruction: The instruction to insert.
+        :type instruction: Instruction
+        """
+        self.instruction_buffer.insert_instruction(index, instruction)
+        self.instructions.insert(index, instruction)
+        self._reference(instruction, 1)
+
+        self.liveness.insert(index, None)
+        self.definitions.insert(index, self.interference_graph.definition(self.instruction_buffer.get_columns(), index))
+        self._update_liveness(index)
+        self._update_entry()
+        self._update_coloring()
+
+    def delete(self, index: int) -> Instruction:
+        """
+        Deletes the instruction at the given index.
+
+        :param index: Index of the instruction to delete.
+        :type index: int
+        :return: The deleted instruction.
+        :rtype: Instruction
+        """
+        instruction: Instruction = self.instruction_buffer.remove_instruction(index)
+        del self.instructions[index]
+
+        self._count_line(index, -1)
+        del self.liveness[index]
+        del self.definitions[index]
+        self._update_liveness(index - 1)
+        self._update_entry()
+        self._reference(instruction, -1)
+        self._update_coloring()
+
+        return instruction
+
+    def replace(self, index: int, instruction: Instruction) -> Instruction:
+        """
+        Replaces the instruction at the given index.
+
+        :param index: Index of the instruction to replace.
+        :type index: int
+        :param instruction: The new instruction.
+        :type instruction: Instruction
+        :return: The instruction that was replaced.
+        :rtype: Instruction
+        """
+        old: Instruction = self.instruction_buffer.replace_instruction(index, instruction)
+        self.instructions[index] = instruction
+        self._reference(instruction, 1)
+
+        # The line's edges depend on the instruction too, so it's recounted even if its liveness stays the same
+        self._count_line(index, -1)
+        self.liveness[index] = None
+        self.definitions[index] = self.interference_graph.definition(self.instruction_buffer.get_columns(), index)
+
+        self._update_liveness(index)
+        self._update_entry()
+        self._reference(old, -1)
+        self._update_coloring()
+
+        return old
+
+    def set_live_objects(self, live_objects: list[str]) -> None:
+        """
+        Changes the objects that are live at the end of the block.
+
+        :param live_objects: The new live objects, duplicates are ignored.
+        :type live_objects: list[str]
+        :raises ValueError: If a live object is not used by any instruction.
+        """
+        live_objects = list(dict.fromkeys(live_objects))
+        current: list[str] = self.instruction_buffer.list_live_objects()
+
+        for live in live_objects:
+            # Current live objects count as references too, so leave them out
+            if live not in self.symbols or self.references[self.symbols.get_id(live)] - current.count(live) <= 0:
+                raise ValueError(f"Live object '{live}' has not been declared in previous instructions.")
+
+        ids: list[int] = [self.symbols.get_id(live) for live in live_objects]
+
+        for live in ids:
+            self._reference_variable(live, 1)
+
+        self.instruction_buffer.set_live_objects(live_objects)
+
+        # The end of the block is a line of its own, made of just the live objects
+        self.liveness[-1] = {live: Liveness.states["live"] for live in ids}
+
+        self._update_liveness(len(self.liveness) - 2)
+        self._update_entry()
+
+        for live in current:
+            self._reference_variable(self.symbols.get_id(live), -1)
+
+        self._update_coloring()
+
+    def get_liveness(self) -> list[dict[str, int]]:
+        """
+        Retrieves the current liveness information, in the same form as Liveness.get_liveness().
+
+        :return: A list of dictionaries representing the liveness information.
+        :rtype: list[dict[str, int]]
+        """
+        names: list[str] = self.symbols.names
+
+        return [{names[var]: state for var, state in line.items()} for line in self.liveness]
+
+    def get_colors(self) -> dict[str, int | None]:
+        """
+        Retrieves the current register (color) of every variable.
+
+        :return: The color of each variable, None if it couldn't be colored.
+        :rtype: dict[str, int | None]
+        """
+        return self.interference_graph.get_colors()
@@ -0,0 +1,217 @@
+from input.instruction import Instruction
+from input.instruction_buffer import InstructionBuffer
+from input.instruction_columns import InstructionColumns
+from input.symbol_table import SymbolTable
+from intermediate.graph import Graph
+from intermediate.interference_graph import InterferenceGraph
+
+class Coalescer:
+    """
+    Conservative move coalescing on top of an InterferenceGraph.
+
+    A copy (x = y) whose two variables don't interfere can use one register for both,
+    and then the copy costs nothing. Such pairs are merged into a single node, as long
+    as that can't make the graph harder to color with n colors:
+        - Briggs: the merged node has fewer than n neighbors with n or more neighbors.
+        - George: every neighbor of one node has fewer than n neighbors or already
+          interferes with the other.
+
+    Copies that run more often (see 'freq:') are tried first, and the merges are retried
+    until none passes the tests. The copies left over still bias coloring: a node prefers
+    a color one of its move partners already has.
+
+    The graph is changed in place, merged variables leave it and only get their color back
+    from color_graph(), which colors what is left and hands each variable the color of the
+    node it was merged into.
+    """
+
+    def __init__(self, interference_graph: InterferenceGraph, instruction_buffer: InstructionBuffer) -> None:
+        """
+        :param interference_graph: The block's interference graph, already built.
+        :type interference_graph: InterferenceGraph
+        :param instruction_buffer: The block the graph was built from.
+        :type instruction_buffer: InstructionBuffer
+        """
+        self.interference_graph: InterferenceGraph = interference_graph
+        self.symbols: SymbolTable = interference_graph.symbols
+        self.moves: list[tuple[int, int]] = self._moves(instruction_buffer.get_columns()) # (destination, source) of every copy
+        self.alias: dict[int, int] = {} # Node each merged variable went into
+
+    @staticmethod
+    def _moves(columns: InstructionColumns) -> list[tuple[int, int]]:
+        """
+        Gets the copies of the block, the ones that run most often first.
+        """
+        assignment: int = Instruction.instruction_types["assignment"]
+        moves: list[tuple[int, int, int]] = [(columns.frequency[i], columns.dest[i], columns.src1[i]) for i in range(len(columns)) if columns.opcode[i] == assignment and columns.src1[i] >= 0]
+
+        # Stable, so copies that run as often stay in block order
+        moves.sort(key=lambda move: move[0], reverse=True)
+
+        return [(dest, source) for _, dest, source in moves]
+
+    def _find(self, var: int) -> int:
+        """
+        Gets the node a variable ended up in, shortening the chain of merges on the way.
+        """
+        root: int = var
+        while root in self.alias:
+            root = self.alias[root]
+
+        while var != root:
+            self.alias[var], var = root, self.alias[var]
+
+        return root
+
+    def _briggs(self, node1: int, node2: int, n: int) -> bool:
+        """
+        Checks whether the merged node would have fewer than n neighbors of significant
+        degree (n or more). A neighbor of both loses one neighbor in the merge.
+        """
+        graph: Graph = self.interference_graph.interference_graph
+        neighbors1: set[int] = set(graph.neighbors(node1))
+        neighbors2: set[int] = set(graph.neighbors(node2))
+        significant: int = 0
+
+        for neighbor in neighbors1 | neighbors2:
+            if graph.degree(neighbor) - (neighbor in neighbors1 and neighbor in neighbors2) >= n:
+                significant += 1
+
+                if significant >= n:
+                    return False
+
+        return True
+
+    def _george(self, node: int, into: int, n: int) -> bool:
+        """
+        Checks whether every neighbor of node has fewer than n neighbors or already interferes with into.
+        """
+        graph: Graph = self.interference_graph.interference_graph
+
+        return all(graph.degree(neighbor) < n or graph.has_edge(neighbor, into) for neighbor in graph.neighbors(node))
+
+    def _merge(self, node: int, into: int) -> None:
+        """
+        Merges node into another one, which takes over its edges and its spill cost.
+        """
+        graph: Graph = self.interference_graph.interference_graph
+        spill_costs: dict[int, float] = self.interference_graph.spill_costs
+
+        graph.add_edges_from((into, neighbor) for neighbor in graph.neighbors(node))
+        graph.remove_node(node)
+        self.alias[node] = into
+
+        if node in spill_costs or into in spill_costs:
+            spill_costs[into] = spill_costs.get(into, 1) + spill_costs.pop(node, 1)
+
+    def coalesce(self, n: int) -> int:
+        """
+        Merges the variables of every copy that passes the Briggs or George test for n colors,
+        then records the copies left over as move partners for coloring.
+
+        :param n: The number of colors the graph will be colored with.
+        :type n: int
+        :return: The number of copies whose two variables are now one node.
+        :rtype: int
+        """
+        graph: Graph = self.interference_graph.interference_graph
+        merged: bool = True
+
+        while merged:
+            merged = False
+
+            for dest, source in self.moves:
+                node1: int = self._find(dest)
+                node2: int = self._find(source)
+
+                if node1 == node2 or graph.has_edge(node1, node2):
+                    continue
+
+                # Merging into the node with more neighbors changes fewer edges
+                if graph.degree(node1) > graph.degree(node2):
+                    node1, node2 = node2, node1
+
+                if self._george(node1, node2, n) or self._george(node2, node1, n) or self._briggs(node1, node2, n):
+                    self._merge(node1, node2)
+                    merged = True
+
+        partners: dict[int, set[int]] = {}
+        coalesced: int = 0
+
+        for dest, source in self.moves:
+            node1, node2 = self._find(dest), self._find(source)
+
+            if node1 == node2:
+                coalesced += 1
+            elif not graph.has_edge(node1, node2):
+                partners.setdefault(node1, set()).add(node2)
+                partners.setdefault(node2, set()).add(node1)
+
+        self.interference_graph.move_partners = partners
+
+        return coalesced
+
+    def color_graph_ids(self, n: int, strategy: str = "briggs") -> set[int]:
+        """
+        Colors the coalesced graph, see color_graph().
+
+        :return: The IDs of the variables left without a color.
+        :rtype: set[int]
+        :raises ValueError: If the strategy is unknown.
+        """
+        spilled: set[int] = self.interference_graph.color_graph_ids(n, strategy)
+        colors: dict[int, int | None] = self.interference_graph.colors
+
+        for var in self.alias:
+            node: int = self._find(var)
+            colors[var] = colors[node]
+
+            if node in spilled:
+                spilled.add(var)
+
+        return spilled
+
+    def color_graph(self, n: int, strategy: str = "briggs") -> set[str]:
+        """
+        Colors the coalesced graph with at most n colors (see InterferenceGraph.color_graph()),
+        then gives every merged variable the color of the node it went into.
+
+        :param n: The number of colors to use.
+        :type n: int
+        :param strategy: The coloring strategy.
+        :type strategy: str
+        :return: The names of the spilled variables, empty if the whole graph was colored.
+        :rtype: set[str]
+        :raises ValueError: If the strategy is unknown.
+        """
+        return {self.symbols.names[var] for var in self.color_graph_ids(n, strategy)}
+
+    def eliminated_moves(self) -> int:
+        """
+        Counts the copies made useless: their two variables were merged (so they share a
+        register or, if spilled, a memory slot) or got the same color from the bias.
+
+        :return: The number of copies that can be removed.
+        :rtype: int
+        """
+        colors: dict[int, int | None] = self.interference_graph.colors
+
+        return sum(1 for dest, source in self.moves if self._find(dest) == self._find(source) or (colors.get(dest) is not None and colors.get(dest) == colors.get(source)))
+
+    def get_aliases(self) -> dict[str, str]:
+        """
+        Gets the node every merged variable went into, keyed on variable names.
+
+        :return: The name of the variable whose node each merged variable joined.
+        :rtype: dict[str, str]
+        """
+        return {self.symbols.names[var]: self.symbols.names[self._find(var)] for var in list(self.alias)}
+
+    def get_colors(self) -> dict[str, int | None]:
+        """
+        Gets the color of every variable, merged ones included, keyed on variable names.
+
+        :return: The color of each variable, None if it isn't colored.
+        :rtype: dict[str, int | None]
+        """
+        return self.interference_graph.get_colors()
@@ -0,0 +1,217 @@
+import sys
+from array import array
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator
+from input.instruction_buffer import InstructionBuffer
+from input.instruction_columns import InstructionColumns
+from intermediate.liveness import Liveness
+
+class CompactLiveness(Liveness):
+    """
+    Liveness analysis that doesn't keep a dictionary for every line, so it can
+    run on very long blocks within a fixed memory budget.
+
+    The backward pass keeps the live variables in an insertion-ordered dict, which
+    makes each line O(1) to step over: the destination is dropped, new operands are
+    appended. Their order is also the order Liveness shows them in, since a variable
+    keeps its place for as long as it stays live.
+
+    Only the live set at every interval-th line is kept (a checkpoint). Lines are
+    rebuilt on demand by stepping up from the checkpoint below them, so
+    get_liveness() and liveness_info() give exactly the same answers as Liveness.
+    When the checkpoints outgrow the budget, every other one is dropped and the interval doubles.
+    """
+
+    def __init__(self, instruction_buffer: InstructionBuffer, memory_budget: int = 16 << 20, live_out: list[str] | None = None) -> None:
+        """
+        :param instruction_buffer: The instructions to analyze.
+        :type instruction_buffer: InstructionBuffer
+        :param memory_budget: Roughly how many bytes the checkpoints can take.
+        :type memory_budget: int
+        :param live_out: The objects live after the last instruction, the buffer's live objects if None.
+        :type live_out: list[str] | None
+        """
+        self.memory_budget: int = memory_budget
+        self.interval: int = 64 # Lines between checkpoints
+        self.checkpoints: dict[int, array] = {} # Live variables coming into each checkpointed line from below, in order
+        self.checkpoint_lines: list[int] = [] # The checkpointed lines, sorted, to bisect on
+        self.checkpoint_bytes: int = 0
+        self.columns: InstructionColumns = instruction_buffer.get_columns()
+
+        super().__init__(instruction_buffer, live_out)
+
+    def _checkpoint(self, line: int, carry: dict[int, None]) -> None:
+        """
+        Keeps the live set coming into a line, thinning out the checkpoints if they got too big.
+        """
+        checkpoint: array = array('i', carry)
+        self.checkpoints[line] = checkpoint
+        insort(self.checkpoint_lines, line)
+        self.checkpoint_bytes += sys.getsizeof(checkpoint)
+
+        # The end of the block is always kept, everything starts from there
+        end: int = len(self.columns)
+
+        while self.checkpoint_bytes > self.memory_budget and len(self.checkpoints) > 1:
+            self.interval *= 2
+
+            for kept in self.checkpoint_lines:
+                if kept % self.interval != 0 and kept != end:
+                    self.checkpoint_bytes -= sys.getsizeof(self.checkpoints.pop(kept))
+
+            self.checkpoint_lines = [kept for kept in self.checkpoint_lines if kept in self.checkpoints]
+
+    def _step(self, index: int, carry: dict[int, None]) -> None:
+        """
+        Steps the live set from below a line to above it.
+
+        :param index: Index of the instruction.
+        :type index: int
+        :param carry: The variables live after the instruction, in order. Updated in place.
+        :type carry: dict[int, None]
+        """
+        dest: int = self.columns.dest[index]
+        src1: int = self.columns.src1[index]
+        src2: int = self.columns.src2[index]
+
+        # Same as Liveness: anything not defined here carries up, with new operands at the end
+        if src1 == dest or src2 == dest:
+            if dest not in carry:
+                carry[dest] = None
+        else:
+            carry.pop(dest, None)
+
+        if src1 >= 0 and src1 not in carry:
+            carry[src1] = None
+        if src2 >= 0 and src2 not in carry:
+            carry[src2] = None
+
+    def _line(self, index: int, carry: dict[int, None]) -> dict[int, int]:
+        """
+        Builds the liveness dictionary of a line, the same way Liveness._mark_liveness() does.
+
+        :param index: Index of the instruction.
+        :type index: int
+        :param carry: The variables live after the instruction, in order.
+        :type carry: dict[int, None]
+        :return: The line's liveness.
+        :rtype: dict[int, int]
+        """
+        line_liveness: dict[int, int] = dict.fromkeys(carry, self.states["live"])
+        line_liveness[self.columns.dest[index]] = self.states["defined"]
+
+        for src in (self.columns.src1[index], self.columns.src2[index]):
+            if src >= 0:
+                line_liveness[src] = self.states["live"] if src in carry else self.states["unlive"]
+
+        return line_liveness
+
+    def _determine_liveness(self) -> None:
+        """
+        Runs the backward pass, keeping only the checkpoints.
+        """
+        end: int = len(self.columns)
+        carry: dict[int, None] = dict.fromkeys(self._determine_initial_liveness())
+
+        # _determine_initial_liveness() keeps the end of the block line itself, this class doesn't
+        self.liveness.clear()
+        self._checkpoint(end, carry)
+
+        for i in range(end - 1, 0, -1):
+            self._step(i, carry)
+
+            if i % self.interval == 0:
+                self._checkpoint(i, carry)
+
+    def _segment(self, start: int, stop: int) -> list[dict[int, int]]:
+        """
+        Rebuilds the lines between two checkpoints.
+
+        :param start: A checkpointed line (or 0).
+        :type start: int
+        :param stop: The next checkpointed line below it.
+        :type stop: int
+        :return: The liveness of the lines from start up to (not including) stop, first line first.
+        :rtype: list[dict[int, int]]
+        """
+        carry: dict[int, None] = dict.fromkeys(self.checkpoints[stop])
+        lines: list[dict[int, int]] = []
+
+        for i in range(stop - 1, start - 1, -1):
+            lines.append(self._line(i, carry))
+            self._step(i, carry)
+
+        lines.reverse()
+
+        return lines
+
+    def _carry(self, line: int) -> dict[int, None]:
+        """
+        Gets the variables live coming into a line from below, stepping up from the nearest checkpoint.
+        """
+        checkpoints: list[int] = self.checkpoint_lines
+        stop: int = checkpoints[bisect_left(checkpoints, line)]
+        carry: dict[int, None] = dict.fromkeys(self.checkpoints[stop])
+
+        for i in range(stop - 1, line - 1, -1):
+            self._step(i, carry)
+
+        return carry
+
+    def iter_liveness_ids(self) -> Iterator[dict[int, int]]:
+        """
+        Iterates over the liveness information line by line, keyed on variable IDs.
+        Only one stretch between checkpoints is rebuilt at a time.
+
+        :return: Iterator over the dictionaries, first line first.
+        :rtype: Iterator[dict[int, int]]
+        """
+        end: int = len(self.columns)
+        checkpoints: list[int] = self.checkpoint_lines
+
+        for start, stop in zip([0] + checkpoints, checkpoints):
+            if start < stop:
+                yield from self._segment(start, stop)
+
+        yield dict.fromkeys(self.checkpoints[end], self.states["live"])
+
+    def _mask(self, variables: Iterable[int]) -> int:
+        """
+        Packs variable IDs into a bitmask, setting bits in a byte array first
+        so it doesn't build a new big int for every variable.
+        """
+        bits: bytearray = bytearray((len(self.symbols) + 7) // 8)
+
+        for var in variables:
+            bits[var >> 3] |= 1 << (var & 7)
+
+        return int.from_bytes(bits, "little")
+
+    def live_in(self, line: int) -> int:
+        """
+        Gets the variables live before a line, as a bitmask over variable IDs.
+        The line after the last instruction is the end of the block.
+
+        :param line: Index of the line.
+        :type line: int
+        :return: Bit i is set if the variable with ID i is live.
+        :rtype: int
+        """
+        if line == len(self.columns):
+            return self._mask(self.checkpoints[line])
+
+        carry: dict[int, None] = self._carry(line + 1)
+        self._step(line, carry)
+
+        return self._mask(carry)
+
+    def live_out(self, line: int) -> int:
+        """
+        Gets the variables live after an instruction, as a bitmask over variable IDs.
+
+        :param line: Index of the instruction.
+        :type line: int
+        :return: Bit i is set if the variable with ID i is live.
+        :rtype: int
+        """
+        return self._mask(self._carry(line + 1))
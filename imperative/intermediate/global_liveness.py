@@ -0,0 +1,166 @@
+from heapq import heappop, heappush
+from input.control_flow_graph import ControlFlowGraph
+from input.instruction_columns import InstructionColumns
+from input.symbol_table import SymbolTable
+from intermediate.liveness import Liveness
+
+class GlobalLiveness:
+    """
+    Liveness across the blocks of a control flow graph, so the live-out set of
+    every block no longer has to be worked out by hand.
+
+    Each block is summarized by a transfer function over bitmasks of variable IDs:
+    live_in = used | (live_out & ~defined), where used holds the variables read before
+    being written in the block. live_out is the union of the successors' live_in,
+    plus the block's own 'live:' objects.
+
+    The sets are solved with a worklist. Liveness flows backwards, so blocks are taken
+    in postorder (the reverse postorder of the reversed graph): successors before
+    predecessors, and only loops send a block back onto the worklist.
+    """
+
+    def __init__(self, cfg: ControlFlowGraph) -> None:
+        self.cfg: ControlFlowGraph = cfg
+        self.symbols: SymbolTable = cfg.symbols
+
+        # Bitmasks by block label, bit i is the variable with ID i
+        self.used: dict[str, int] = {}
+        self.defined: dict[str, int] = {}
+        self.exits: dict[str, int] = {} # The block's own live objects
+        self.live_ins: dict[str, int] = {}
+        self.live_outs: dict[str, int] = {}
+
+        self.evaluations: int = 0 # Number of times a block's sets were recomputed
+
+        self._determine_transfer()
+        self._solve()
+
+    def _mask(self, names: list[str]) -> int:
+        mask: int = 0
+
+        for name in names:
+            mask |= 1 << self.symbols.add(name)
+
+        return mask
+
+    def _determine_transfer(self) -> None:
+        """
+        Finds the variables each block uses before defining, and the ones it defines.
+        """
+        for label, block in self.cfg.blocks.items():
+            columns: InstructionColumns = block.get_columns()
+            used: int = 0
+            defined: int = 0
+
+            # Going backwards, a definition hides any use of the variable below it
+            for i in range(len(columns) - 1, -1, -1):
+                dest: int = 1 << columns.dest[i]
+                defined |= dest
+                used &= ~dest
+
+                if columns.src1[i] >= 0:
+                    used |= 1 << columns.src1[i]
+                if columns.src2[i] >= 0:
+                    used |= 1 << columns.src2[i]
+
+            self.used[label] = used
+            self.defined[label] = defined
+            self.exits[label] = self._mask(block.list_live_objects())
+            self.live_ins[label] = 0
+            self.live_outs[label] = 0
+
+    def _solve(self) -> None:
+        """
+        Iterates the transfer functions until no live_in set changes.
+        """
+        order: list[str] = self.cfg.reverse_postorder()[::-1]
+        priority: dict[str, int] = {label: i for i, label in enumerate(order)}
+        predecessors: dict[str, list[str]] = self.cfg.predecessors()
+
+        # Always take the pending block that comes first in postorder
+        worklist: list[int] = list(range(len(order)))
+        pending: set[int] = set(worklist)
+
+        while worklist:
+            index: int = heappop(worklist)
+            pending.discard(index)
+            label: str = order[index]
+
+            live_out: int = self.exits[label]
+            for successor in self.cfg.blocks[label].successors:
+                live_out |= self.live_ins[successor]
+
+            live_in: int = self.used[label] | (live_out & ~self.defined[label])
+            self.live_outs[label] = live_out
+            self.evaluations += 1
+
+            if live_in != self.live_ins[label]:
+                self.live_ins[label] = live_in
+
+                for predecessor in predecessors[label]:
+                    if priority[predecessor] not in pending:
+                        pending.add(priority[predecessor])
+                        heappush(worklist, priority[predecessor])
+
+    def _names(self, mask: int) -> list[str]:
+        """
+        Gets the names of the variables in a bitmask, in ID order.
+        """
+        names: list[str] = self.symbols.names
+
+        return [names[var] for var in range(mask.bit_length()) if mask >> var & 1]
+
+    def live_in(self, label: str) -> int:
+        """
+        Gets the variables live coming into a block, as a bitmask over variable IDs.
+
+        :param label: The block's label.
+        :type label: str
+        :return: Bit i is set if the variable with ID i is live.
+        :rtype: int
+        """
+        return self.live_ins[label]
+
+    def live_out(self, label: str) -> int:
+        """
+        Gets the variables live leaving a block, as a bitmask over variable IDs.
+
+        :param label: The block's label.
+        :type label: str
+        :return: Bit i is set if the variable with ID i is live.
+        :rtype: int
+        """
+        return self.live_outs[label]
+
+    def get_live_in(self, label: str) -> list[str]:
+        """
+        Gets the names of the variables live coming into a block.
+
+        :param label: The block's label.
+        :type label: str
+        :return: The variable names, in ID order.
+        :rtype: list[str]
+        """
+        return self._names(self.live_ins[label])
+
+    def get_live_out(self, label: str) -> list[str]:
+        """
+        Gets the names of the variables live leaving a block.
+
+        :param label: The block's label.
+        :type label: str
+        :return: The variable names, in ID order.
+        :rtype: list[str]
+        """
+        return self._names(self.live_outs[label])
+
+    def block_liveness(self, label: str) -> Liveness:
+        """
+        Runs the line-by-line liveness of a block, starting from its solved live-out set.
+
+        :param label: The block's label.
+        :type label: str
+        :return: The block's liveness.
+        :rtype: Liveness
+        """
+        return Liveness(self.cfg.get_block(label), self.get_live_out(label))
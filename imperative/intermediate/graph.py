@@ -0,0 +1,265 @@
+from typing import Iterable, Iterator
+
+def _bits(mask: int) -> Iterator[int]:
+    """
+    Yields the positions of the set bits of a mask, lowest first.
+    """
+    while mask:
+        low: int = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class BitMatrixStorage:
+    """
+    Dense storage: row i of the adjacency matrix is one int, bit j set if i and j are adjacent.
+    Membership is a single bit test and degree a popcount. Rows take as many bits as the
+    highest node ID, so this is meant for small and medium graphs with dense IDs.
+    """
+
+    def __init__(self) -> None:
+        self.rows: dict[int, int] = {} # Rows by node, in the order the nodes were added
+
+    def add_node(self, node: int) -> None:
+        self.rows.setdefault(node, 0)
+
+    def remove_node(self, node: int) -> None:
+        row: int = self.rows.pop(node)
+        bit: int = 1 << node
+
+        for neighbor in _bits(row):
+            self.rows[neighbor] &= ~bit
+
+    def add_edge(self, node1: int, node2: int) -> None:
+        self.rows[node1] |= 1 << node2
+        self.rows[node2] |= 1 << node1
+
+    def remove_edge(self, node1: int, node2: int) -> None:
+        self.rows[node1] &= ~(1 << node2)
+        self.rows[node2] &= ~(1 << node1)
+
+    def has_edge(self, node1: int, node2: int) -> bool:
+        return node1 in self.rows and self.rows[node1] >> node2 & 1 == 1
+
+    def neighbors(self, node: int) -> Iterator[int]:
+        return _bits(self.rows[node])
+
+    def degree(self, node: int) -> int:
+        return self.rows[node].bit_count()
+
+    def nodes(self) -> Iterable[int]:
+        return self.rows.keys()
+
+class AdjacencySetStorage:
+    """
+    Sparse storage: every node keeps a set of its neighbors.
+    Memory only grows with the number of edges, so this is meant for very large graphs.
+    """
+
+    def __init__(self) -> None:
+        self.adjacency: dict[int, set[int]] = {} # Neighbors by node, in the order the nodes were added
+
+    def add_node(self, node: int) -> None:
+        if node not in self.adjacency:
+            self.adjacency[node] = set()
+
+    def remove_node(self, node: int) -> None:
+        for neighbor in self.adjacency.pop(node):
+            self.adjacency[neighbor].discard(node)
+
+    def add_edge(self, node1: int, node2: int) -> None:
+        self.adjacency[node1].add(node2)
+        self.adjacency[node2].add(node1)
+
+    def remove_edge(self, node1: int, node2: int) -> None:
+        self.adjacency[node1].discard(node2)
+        self.adjacency[node2].discard(node1)
+
+    def has_edge(self, node1: int, node2: int) -> bool:
+        return node1 in self.adjacency and node2 in self.adjacency[node1]
+
+    def neighbors(self, node: int) -> Iterator[int]:
+        return iter(self.adjacency[node])
+
+    def degree(self, node: int) -> int:
+        return len(self.adjacency[node])
+
+    def nodes(self) -> Iterable[int]:
+        return self.adjacency.keys()
+
+class Graph:
+    """
+    Undirected graph over integer nodes (variable IDs), with no self loops.
+
+    The method names follow networkx's Graph, which this replaces, so callers didn't
+    have to change. The edges are kept by a storage: BitMatrixStorage for small and medium
+    graphs, AdjacencySetStorage for very large ones. networkx is only needed for to_networkx().
+    """
+
+    def __init__(self, storage: BitMatrixStorage | AdjacencySetStorage | None = None) -> None:
+        """
+        :param storage: Where the edges are kept, adjacency sets if None.
+        :type storage: BitMatrixStorage | AdjacencySetStorage | None
+        """
+        self.storage: BitMatrixStorage | AdjacencySetStorage = storage if storage is not None else AdjacencySetStorage()
+
+    def __len__(self) -> int:
+        return len(self.storage.nodes())
+
+    def __contains__(self, node: int) -> bool:
+        return node in self.storage.nodes()
+
+    def add_node(self, node: int) -> None:
+        """
+        Adds a node, if it isn't already in the graph.
+
+        :param node: The node.
+        :type node: int
+        """
+        self.storage.add_node(node)
+
+    def add_nodes_from(self, nodes: Iterable[int]) -> None:
+        """
+        Adds several nodes.
+
+        :param nodes: The nodes.
+        :type nodes: Iterable[int]
+        """
+        for node in nodes:
+            self.storage.add_node(node)
+
+    def remove_node(self, node: int) -> None:
+        """
+        Removes a node and its edges.
+
+        :param node: The node.
+        :type node: int
+        :raises KeyError: If the node is not in the graph.
+        """
+        self.storage.remove_node(node)
+
+    def add_edge(self, node1: int, node2: int) -> None:
+        """
+        Adds an edge, adding its nodes first if they aren't in the graph. Self loops are ignored.
+
+        :param node1: One end of the edge.
+        :type node1: int
+        :param node2: The other end.
+        :type node2: int
+        """
+        if node1 == node2:
+            return
+
+        self.storage.add_node(node1)
+        self.storage.add_node(node2)
+        self.storage.add_edge(node1, node2)
+
+    def add_edges_from(self, edges: Iterable[tuple[int, int]]) -> None:
+        """
+        Adds several edges.
+
+        :param edges: The edges, as pairs of nodes.
+        :type edges: Iterable[tuple[int, int]]
+        """
+        for node1, node2 in edges:
+            self.add_edge(node1, node2)
+
+    def remove_edge(self, node1: int, node2: int) -> None:
+        """
+        Removes an edge, if it is in the graph. Nothing happens if it isn't,
+        even when one of the nodes isn't in the graph either.
+
+        :param node1: One end of the edge.
+        :type node1: int
+        :param node2: The other end.
+        :type node2: int
+        """
+        if self.storage.has_edge(node1, node2):
+            self.storage.remove_edge(node1, node2)
+
+    def has_edge(self, node1: int, node2: int) -> bool:
+        """
+        Checks whether two nodes are adjacent.
+
+        :param node1: The first node.
+        :type node1: int
+        :param node2: The second node.
+        :type node2: int
+        :return: True if there is an edge between them, false otherwise
+        :rtype: bool
+        """
+        return self.storage.has_edge(node1, node2)
+
+    # Two variables interfere when their nodes are adjacent
+    interferes = has_edge
+
+    def neighbors(self, node: int) -> Iterator[int]:
+        """
+        Iterates over the nodes adjacent to a node.
+
+        :param node: The node.
+        :type node: int
+        :return: Iterator over the neighbors.
+        :rtype: Iterator[int]
+        """
+        return self.storage.neighbors(node)
+
+    def degree(self, node: int) -> int:
+        """
+        Gets the number of neighbors of a node.
+
+        :param node: The node.
+        :type node: int
+        :return: The node's degree.
+        :rtype: int
+        """
+        return self.storage.degree(node)
+
+    def nodes(self) -> list[int]:
+        """
+        Lists the nodes, in the order they were added.
+
+        :return: The nodes.
+        :rtype: list[int]
+        """
+        return list(self.storage.nodes())
+
+    def edges(self) -> list[tuple[int, int]]:
+        """
+        Lists every edge once, ordered by the node that was added first.
+
+        :return: The edges, as pairs of nodes.
+        :rtype: list[tuple[int, int]]
+        """
+        edges: list[tuple[int, int]] = []
+        done: set[int] = set()
+
+        for node in self.storage.nodes():
+            edges.extend((node, neighbor) for neighbor in self.storage.neighbors(node) if neighbor not in done)
+            done.add(node)
+
+        return edges
+
+    def number_of_edges(self) -> int:
+        """
+        Counts the edges.
+
+        :return: The number of edges.
+        :rtype: int
+        """
+        return sum(self.storage.degree(node) for node in self.storage.nodes()) // 2
+
+    def to_networkx(self):
+        """
+        Exports the graph to networkx, which has to be installed for this.
+
+        :return: A networkx Graph with the same nodes and edges.
+        :rtype: networkx.Graph
+        """
+        # Imported here, so that nothing else pays for importing networkx
+        import networkx
+
+        graph = networkx.Graph()
+        graph.add_nodes_from(self.storage.nodes())
+        graph.add_edges_from(self.edges())
+
+        return graph
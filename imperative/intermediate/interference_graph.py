@@ -1,60 +1,173 @@
-from networkx import Graph
+import time
+from collections import Counter
+from heapq import heapify, heappop, heappush
+from importlib.util import find_spec
 from itertools import combinations
+from typing import Iterator
 
+from input.instruction import Instruction
+from input.instruction_columns import InstructionColumns
+from input.symbol_table import SymbolTable
+from intermediate.graph import Graph, BitMatrixStorage, AdjacencySetStorage
+from intermediate.linear_scan import LinearScan
 from intermediate.liveness import Liveness 
 
+# NumPy is optional, only the bulk edge finding (see InterferenceMatrix) uses it
+numpy_installed: bool = find_spec("numpy") is not None
+
 class InterferenceGraph:
+    # Up to this many variables, edges are kept in a bit matrix, beyond it in adjacency sets
+    dense_limit = 4096
+
+    # Up to this many lines x variables, and if NumPy is installed, build_graph() finds the edges
+    # in bulk (the matrices it uses take a byte per cell), beyond it one instruction at a time
+    matrix_limit = 1 << 25
+
     def __init__(self) -> None:
+        # Nodes are variable IDs from the symbol table, names only come back for output
         self.interference_graph = Graph()
-        self.colors: dict[str, int | None] = {}
+        self.colors: dict[int, int | None] = {}
+        self.symbols: SymbolTable = SymbolTable()
+        self.spill_costs: dict[int, float] = {} # Cost of spilling each variable, Chaitin-Briggs gives up the cheapest first
+        self.move_partners: dict[int, set[int]] = {} # Variables copied to or from each variable, whose color it prefers
+        self.liveness: Liveness | None = None # What the graph was built from, the "linear" strategy allocates from it
+
+    @classmethod
+    def _new_graph(cls, variables: int) -> Graph:
+        """
+        Makes an empty graph with the storage suited to the number of variables.
+        """
+        return Graph(BitMatrixStorage() if variables <= cls.dense_limit else AdjacencySetStorage())
 
     def build_graph(self, liveness: Liveness, variables: set[str]) -> None:
         """
-        Builds the interference graph based on the provided liveness analysis.
+        Builds the interference graph based on the provided liveness analysis. Blocks within
+        matrix_limit are handed to build_graph_matrix() when NumPy is installed, the edges
+        are the same either way.
 
         :param liveness: The liveness analysis object.
         :type liveness: Liveness
+        :param variables: The names of the variables that occur in the instructions.
+        :type variables: set[str]
         """
+        self.symbols = liveness.symbols
+        self.liveness = liveness
+
+        if len(self.interference_graph) == 0:
+            cells: int = (len(liveness.instruction_buffer.get_instructions()) + 1) * len(self.symbols)
+
+            if numpy_installed and cells <= self.matrix_limit:
+                self.build_graph_matrix(liveness, variables)
+                return
+
+            self.interference_graph = self._new_graph(len(self.symbols))
 
         # First, construct all nodes using the instruction buffer's variables
         for var in variables:
-            self.interference_graph.add_node(var)
-            self.colors[var] = None
+            id: int = self.symbols.add(var)
+            self.interference_graph.add_node(id)
+            self.colors[id] = None
+
+        # Then we add our edges, each definition interferes with whatever is live past it
+        assignment: int = Instruction.instruction_types["assignment"]
+        instructions: Iterator[tuple[int, int, int, int]] = liveness.instruction_buffer.iter_variable_ids()
+
+        for i, line in enumerate(liveness.iter_liveness_ids()):
+            if i == 0:
+                self.interference_graph.add_edges_from(self.entry_interferences(line))
+
+            # The last line is the end of the block, it has no instruction
+            row: tuple[int, int, int, int] | None = next(instructions, None)
 
-        # Then we add our edges
-        for line in liveness.get_liveness():
-            # Now check all combinations of live variables on this line
-            combs = combinations([var for var, state in line.items() if state != 2], r=2)
-            for var1, var2 in combs:
-                self.interference_graph.add_edge(var1, var2)
+            if row is not None:
+                opcode, dest, src1, _ = row
+                self.interference_graph.add_edges_from(self.line_interferences(line, dest, src1 if opcode == assignment and src1 >= 0 else None))
 
-    def _is_solved(self) -> bool:
+    def build_graph_matrix(self, liveness: Liveness, variables: set[str]) -> None:
         """
-        Checks if the interference graph has been successfully colored.
+        Builds the same graph as build_graph(), but always finds the edges in bulk with NumPy
+        (see InterferenceMatrix), whatever the size of the block. NumPy is only needed for this.
 
-        :return: True if the graph is properly coloured, false otherwise
-        :rtype: bool
+        :param liveness: The liveness analysis object.
+        :type liveness: Liveness
+        :param variables: The names of the variables that occur in the instructions.
+        :type variables: set[str]
         """
+        # Imported here, so that nothing else pays for importing NumPy
+        from intermediate.interference_matrix import InterferenceMatrix
 
-        for node in self.interference_graph.nodes():
-            color = self.colors[node]
+        self.symbols = liveness.symbols
+        self.liveness = liveness
+        nodes: list[int] = [self.symbols.add(var) for var in variables]
+
+        matrix = InterferenceMatrix(liveness)
+
+        # Same as add_edge() in build_graph(), anything with an edge is a node too
+        listed: set[int] = set(nodes)
+        nodes.extend(var for var in matrix.degrees().nonzero()[0].tolist() if var not in listed)
+
+        self.interference_graph = matrix.to_graph(nodes, dense=len(self.symbols) <= self.dense_limit)
+
+        for id in nodes:
+            self.colors[id] = None
+
+    @staticmethod
+    def definition(columns: InstructionColumns, index: int) -> tuple[int, int | None]:
+        """
+        Gets what an instruction defines, as needed by line_interferences().
+
+        :param columns: The instructions.
+        :type columns: InstructionColumns
+        :param index: Index of the instruction.
+        :type index: int
+        :return: The destination's ID, and the source's ID if the instruction copies a variable (None otherwise).
+        :rtype: tuple[int, int | None]
+        """
+        copy: bool = columns.opcode[index] == Instruction.instruction_types["assignment"] and columns.src1[index] >= 0
+
+        return columns.dest[index], columns.src1[index] if copy else None
+
+    @staticmethod
+    def line_interferences(line: dict[int, int], dest: int, copy: int | None = None) -> Iterator[tuple[int, int]]:
+        """
+        Gets the pairs of variables that interfere because of a single instruction:
+        its destination against every variable live after it. Pairs that stay live across
+        the instruction were already found where the later of the two was defined.
+
+        :param line: The instruction's line of liveness, as given by Liveness.get_liveness_ids().
+        :type line: dict[int, int]
+        :param dest: The ID of the instruction's destination.
+        :type dest: int
+        :param copy: The ID of the variable copied, if the instruction is a copy. It is left out,
+            so the two can still be coalesced.
+        :type copy: int | None
+        :return: The pairs, destination first.
+        :rtype: Iterator[tuple[int, int]]
+        """
+        # Only the variables live after the instruction are marked live on its line
+        live: int = Liveness.states["live"]
 
-            if color is None:
-                return False
-        
-            # Make sure no neighbors have the same color
-            for neighbor in self.interference_graph.neighbors(node):
-                if color == self.colors[neighbor]:
-                    return False
-            
-        return True
+        return ((dest, var) for var, state in line.items() if state == live and var != dest and var != copy)
 
-    def _possible_colors(self, node: str, n: int) -> set[int]:
+    @staticmethod
+    def entry_interferences(line: dict[int, int]) -> combinations:
+        """
+        Gets the pairs of variables live coming into the block. Nothing in the block defines
+        them, so they are treated as all being defined together on entry.
+
+        :param line: The first line of liveness (the end of the block if there are no instructions).
+        :type line: dict[int, int]
+        :return: Every pair of variables live before the first instruction.
+        :rtype: combinations
+        """
+        return combinations([var for var, state in line.items() if state != Liveness.states["defined"]], r=2)
+
+    def _possible_colors(self, node: int, n: int) -> set[int]:
         """
         Returns a set of possible colors for a given node.
 
-        :param node: The node to check.
-        :type node: str
+        :param node: The node (variable ID) to check.
+        :type node: int
         :param n: The number of colors available.
         :type n: int
         :return: A set of possible colors for the node.
@@ -67,40 +180,500 @@ class InterferenceGraph:
 
         return set(range(n)) - used
 
-    def _solve_graph_coloring(self, index: int, n: int) -> bool:
-        if self._is_solved():
+    def _lowest_color(self, node: int, n: int) -> int | None:
+        """
+        Gets the lowest color none of a node's colored neighbors has. A color already given
+        to one of its move partners comes first if it is free, so the copy between them goes away.
+
+        :return: The color, None if all n are taken.
+        :rtype: int | None
+        """
+        used: set[int | None] = {self.colors[neighbor] for neighbor in self.interference_graph.neighbors(node)}
+
+        for partner in self.move_partners.get(node, ()):
+            color: int | None = self.colors.get(partner)
+
+            if color is not None and color < n and color not in used:
+                return color
+
+        return next((color for color in range(n) if color not in used), None)
+
+    def _simplify(self, n: int) -> list[int]:
+        """
+        Takes the nodes out of the graph one by one, each time one with fewer than n
+        neighbors left if there is one (it is sure to get a color), otherwise an optimistic
+        spill candidate: the one with the most neighbors left or, if spill_costs are set,
+        the lowest cost per neighbor left (a node missing from them costs 1). Degrees are
+        kept in buckets, so finding the next node is amortized constant time. Candidates
+        by cost come from a heap whose stale entries are fixed up as they are popped.
+
+        :param n: The number of colors available.
+        :type n: int
+        :return: The nodes in the order they were taken out.
+        :rtype: list[int]
+        """
+        graph: Graph = self.interference_graph
+        degrees: dict[int, int] = {node: graph.degree(node) for node in graph.nodes()}
+        buckets: list[dict[int, None]] = [{} for _ in range(max(degrees.values(), default=0) + 1)]
+
+        for node, degree in degrees.items():
+            buckets[degree][node] = None
+
+        removed: list[int] = []
+        low: int = 0 # No node has fewer neighbors left than this
+        high: int = len(buckets) - 1 # Nor more than this
+        candidates: list[tuple[float, int, int]] | None = None # (cost per neighbor, degree, node), made when first needed
+
+        def metric(node: int, degree: int) -> float:
+            return self.spill_costs.get(node, 1) / max(degree, 1)
+
+        for _ in range(len(degrees)):
+            while not buckets[low]:
+                low += 1
+            while not buckets[high]:
+                high -= 1
+
+            if low < n or not self.spill_costs:
+                degree: int = low if low < n else high
+                node: int = next(iter(buckets[degree]))
+            else:
+                if candidates is None:
+                    candidates = [(metric(node, degree), degree, node) for node, degree in degrees.items()]
+                    heapify(candidates)
+
+                # An entry is stale once its node lost neighbors, its real cost per neighbor is only higher
+                while candidates[0][2] not in degrees or candidates[0][1] != degrees[candidates[0][2]]:
+                    _, _, node = heappop(candidates)
+
+                    if node in degrees:
+                        heappush(candidates, (metric(node, degrees[node]), degrees[node], node))
+
+                _, degree, node = heappop(candidates)
+
+            del buckets[degree][node]
+            del degrees[node]
+            removed.append(node)
+
+            for neighbor in graph.neighbors(node):
+                if neighbor in degrees:
+                    del buckets[degrees[neighbor]][neighbor]
+                    degrees[neighbor] -= 1
+                    buckets[degrees[neighbor]][neighbor] = None
+
+            low = max(low - 1, 0)
+
+        return removed
+
+    def _color_briggs(self, n: int) -> set[int]:
+        """
+        Chaitin-Briggs coloring: simplify, then put the nodes back in reverse order, each
+        getting the lowest color its neighbors left free. Spill candidates often still
+        get one, only those that don't are spilled.
+
+        :param n: The number of colors available.
+        :type n: int
+        :return: The IDs of the spilled variables.
+        :rtype: set[int]
+        """
+        spilled: set[int] = set()
+
+        for node in reversed(self._simplify(n)):
+            self.colors[node] = self._lowest_color(node, n)
+
+            if self.colors[node] is None:
+                spilled.add(node)
+
+        return spilled
+
+    def _color_dsatur(self, n: int | None) -> set[int]:
+        """
+        DSATUR coloring: the next node colored is always the one whose neighbors already
+        use the most distinct colors (ties go to the higher degree), and it gets the lowest
+        color they left free. Saturations are kept in a heap with lazy deletion, stale
+        entries are skipped when popped.
+
+        :param n: The number of colors available, unlimited if None.
+        :type n: int | None
+        :return: The IDs of the nodes that didn't fit in n colors (left uncolored).
+        :rtype: set[int]
+        """
+        graph: Graph = self.interference_graph
+        degrees: dict[int, int] = {node: graph.degree(node) for node in graph.nodes()}
+        saturation: dict[int, set[int]] = {node: set() for node in degrees}
+        heap: list[tuple[int, int, int]] = [(0, -degree, node) for node, degree in degrees.items()]
+        done: set[int] = set()
+        spilled: set[int] = set()
+
+        heap.sort()
+
+        while heap:
+            negative_saturation, _, node = heappop(heap)
+
+            if node in done or -negative_saturation != len(saturation[node]):
+                continue
+
+            done.add(node)
+            color: int = next(color for color in range(len(saturation[node]) + 1) if color not in saturation[node])
+
+            if n is not None and color >= n:
+                spilled.add(node)
+                continue
+
+            self.colors[node] = color
+
+            for neighbor in graph.neighbors(node):
+                if neighbor not in done and color not in saturation[neighbor]:
+                    saturation[neighbor].add(color)
+                    heappush(heap, (-len(saturation[neighbor]), -degrees[neighbor], neighbor))
+
+        return spilled
+
+    def _clique(self) -> list[int]:
+        """
+        Greedily grows a clique from the node with the most neighbors, each time adding the
+        highest degree node adjacent to the whole clique. Its size is a lower bound on the
+        number of colors.
+
+        :return: The nodes of the clique.
+        :rtype: list[int]
+        """
+        graph: Graph = self.interference_graph
+
+        if len(graph) == 0:
+            return []
+
+        clique: list[int] = [max(graph.nodes(), key=graph.degree)]
+        candidates: set[int] = set(graph.neighbors(clique[0]))
+
+        while candidates:
+            clique.append(max(candidates, key=graph.degree))
+            candidates &= set(graph.neighbors(clique[-1]))
+
+        return clique
+
+    def color_graph_minimum(self, time_budget: float | None = None, node_budget: int | None = None, lower_bound: int = 0) -> tuple[int, bool]:
+        """
+        Colors the graph with as few colors as it can. DSATUR gives a coloring right away,
+        after which a DSATUR-ordered branch and bound looks for one with fewer colors, until
+        it proves there is none or runs out of budget. The best coloring found is left in
+        self.colors.
+
+        :param time_budget: Seconds from the call until the search stops, unlimited if None. The first DSATUR coloring always finishes.
+        :type time_budget: float | None
+        :param node_budget: Number of search nodes it may expand, unlimited if None.
+        :type node_budget: int | None
+        :param lower_bound: A number of colors known to be needed, on top of the clique found here.
+        :type lower_bound: int
+        :return: The number of colors used, and whether that is proven to be the minimum.
+        :rtype: tuple[int, bool]
+        """
+        graph: Graph = self.interference_graph
+        deadline: float | None = time.perf_counter() + time_budget if time_budget is not None else None
+
+        for node in graph.nodes():
+            self.colors[node] = None
+
+        self._color_dsatur(None)
+
+        best: dict[int, int | None] = dict(self.colors)
+        best_count: int = max((color + 1 for color in best.values() if color is not None), default=0)
+        lower: int = max(len(self._clique()), lower_bound)
+
+        # Search state: the partial coloring and, for every node, its neighbors' colors
+        colors: dict[int, int] = {}
+        uncolored: set[int] = set(graph.nodes())
+        neighbor_colors: dict[int, Counter[int]] = {node: Counter() for node in uncolored}
+        count: int = 0 # Colors used by the partial coloring
+        frames: list[list] = [] # [node, colors to try, index of the next one, count before the node was colored]
+        expanded: int = 0
+        descend: bool = True
+        proven: bool = True
+
+        while best_count > lower:
+            if descend:
+                if not uncolored:
+                    best = dict(colors)
+                    best_count = count
+                    descend = False
+                    continue
+
+                node: int = max(uncolored, key=lambda node: (len(neighbor_colors[node]), graph.degree(node)))
+
+                # A new color is only ever the next unused one, which rules out relabeled duplicates
+                frames.append([node, [color for color in range(count + 1) if color not in neighbor_colors[node]], 0, count])
+
+            if not frames:
+                break
+
+            frame: list = frames[-1]
+            node, candidates, index, before = frame
+
+            if node in colors:
+                for neighbor in graph.neighbors(node):
+                    neighbor_colors[neighbor][colors[node]] -= 1
+                    if neighbor_colors[neighbor][colors[node]] == 0:
+                        del neighbor_colors[neighbor][colors[node]]
+
+                del colors[node]
+                uncolored.add(node)
+                count = before
+
+            # Only colorings using fewer colors than the best one are worth finishing
+            if index == len(candidates) or candidates[index] >= best_count - 1:
+                frames.pop()
+                descend = False
+                continue
+
+            expanded += 1
+            if (node_budget is not None and expanded > node_budget) or (deadline is not None and time.perf_counter() > deadline):
+                proven = False
+                break
+
+            color: int = candidates[index]
+            frame[2] = index + 1
+            colors[node] = color
+            uncolored.discard(node)
+            count = max(count, color + 1)
+
+            for neighbor in graph.neighbors(node):
+                neighbor_colors[neighbor][color] += 1
+
+            descend = True
+
+        self.colors.update(best)
+
+        return best_count, proven
+
+    def register_sweep_ids(self, liveness: Liveness | None = None, time_budget: float | None = None, node_budget: int | None = None) -> tuple[int, bool, dict[int, set[int]]]:
+        """
+        Finds the minimum number of registers the graph needs, and what has to be spilled
+        with every smaller number, in one run.
+
+        The minimum comes from color_graph_minimum(), given the block's max-live as a lower
+        bound. A copy shares a line with its source without interfering with it, so max-live
+        only bounds blocks without copies and is left out otherwise.
+
+        The smaller numbers reuse that coloring instead of starting over: going from k + 1
+        registers to k, the smallest color class is taken out and its nodes moved to a color
+        their neighbors left free, those that can't be moved are spilled. Each step only
+        touches the nodes of one class and their neighbors, and the spill sets are nested.
+        The minimum's coloring is left in self.colors.
+
+        :param liveness: The liveness the graph was built from, for the max-live bound. Only the clique bound is used if None.
+        :type liveness: Liveness | None
+        :param time_budget: Seconds the minimum search may take, see color_graph_minimum().
+        :type time_budget: float | None
+        :param node_budget: Search nodes the minimum search may expand, see color_graph_minimum().
+        :type node_budget: int | None
+        :return: The minimum number of registers found, whether it's proven, and the IDs of the
+            variables spilled with each number of registers from 1 up to it.
+        :rtype: tuple[int, bool, dict[int, set[int]]]
+        """
+        lower_bound: int = 0
+
+        if liveness is not None:
+            columns: InstructionColumns = liveness.instruction_buffer.get_columns()
+
+            if all(self.definition(columns, i)[1] is None for i in range(len(columns))):
+                lower_bound = liveness.max_live()
+
+        registers, proven = self.color_graph_minimum(time_budget, node_budget, lower_bound)
+
+        colors: dict[int, int | None] = dict(self.colors)
+        classes: list[set[int]] = [set() for _ in range(registers)]
+        for node, color in colors.items():
+            if color is not None:
+                classes[color].add(node)
+
+        spilled: set[int] = set()
+        spills: dict[int, set[int]] = {registers: set()}
+
+        for k in range(registers - 1, 0, -1):
+            # Colors stay 0 to k - 1: the last class takes the place of the one taken out
+            drop: int = min(range(k + 1), key=lambda color: len(classes[color]))
+            classes[drop], classes[k] = classes[k], classes[drop]
+            moved: set[int] = classes.pop()
+
+            if drop < k:
+                for node in classes[drop]:
+                    colors[node] = drop
+
+            for node in moved:
+                colors[node] = None
+                used: set[int | None] = {colors[neighbor] for neighbor in self.interference_graph.neighbors(node)}
+                free: int | None = next((color for color in range(k) if color not in used), None)
+
+                if free is None:
+                    spilled.add(node)
+                else:
+                    colors[node] = free
+                    classes[free].add(node)
+
+            spills[k] = set(spilled)
+
+        return registers, proven, dict(sorted(spills.items()))
+
+    def register_sweep(self, liveness: Liveness | None = None, time_budget: float | None = None, node_budget: int | None = None) -> tuple[int, bool, dict[int, set[str]]]:
+        """
+        Finds the minimum number of registers and the spills with fewer, see register_sweep_ids().
+
+        :return: The minimum number of registers found, whether it's proven, and the names of
+            the variables spilled with each number of registers from 1 up to it.
+        :rtype: tuple[int, bool, dict[int, set[str]]]
+        """
+        registers, proven, spills = self.register_sweep_ids(liveness, time_budget, node_budget)
+        names: list[str] = self.symbols.names
+
+        return registers, proven, {k: {names[node] for node in spilled} for k, spilled in spills.items()}
+
+    def _solve_graph_coloring(self, nodes: list[int], index: int, n: int) -> bool:
+        if index == len(nodes):
             return True
-        
-        node = list(self.interference_graph.nodes())[index]
+
+        node = nodes[index]
         for color in self._possible_colors(node, n):
             self.colors[node] = color
 
-            if self._solve_graph_coloring(index + 1, n):
+            if self._solve_graph_coloring(nodes, index + 1, n):
                 return True
-            
+
             self.colors[node] = None
 
         return False
 
+    def _color_backtracking(self, n: int) -> set[int]:
+        """
+        Exhaustive coloring, exponential in the worst case. Either every node gets a color
+        or none does, in which case they are all reported as spilled.
+
+        :param n: The number of colors available.
+        :type n: int
+        :return: The IDs of the spilled variables.
+        :rtype: set[int]
+        """
+        nodes: list[int] = self.interference_graph.nodes()
+
+        if self._solve_graph_coloring(nodes, 0, n):
+            return set()
+
+        return set(nodes)
+
+    def _color_linear(self, n: int) -> set[int]:
+        """
+        Linear scan over the live intervals the graph was built from (see LinearScan),
+        the edges themselves aren't looked at.
+
+        :param n: The number of colors available.
+        :type n: int
+        :return: The IDs of the spilled variables.
+        :rtype: set[int]
+        :raises ValueError: If the graph wasn't built from a liveness analysis.
+        """
+        if self.liveness is None:
+            raise ValueError("The 'linear' strategy needs a graph built with build_graph().")
+
+        scan: LinearScan = LinearScan(self.liveness)
+        spilled: set[int] = scan.color_graph_ids(n)
+
+        for node in self.interference_graph.nodes():
+            self.colors[node] = scan.colors.get(node)
+
+        return spilled
+
+    def color_graph_ids(self, n: int, strategy: str = "briggs") -> set[int]:
+        """
+        Colors the interference graph, see color_graph().
+
+        :return: The IDs of the variables left without a color.
+        :rtype: set[int]
+        :raises ValueError: If the strategy is unknown.
+        """
+        for node in self.interference_graph.nodes():
+            self.colors[node] = None
+
+        match strategy:
+            case "briggs":
+                return self._color_briggs(n)
+            case "dsatur":
+                return self._color_dsatur(n)
+            case "backtracking":
+                return self._color_backtracking(n)
+            case "linear":
+                return self._color_linear(n)
+            case _:
+                raise ValueError(f"Unknown coloring strategy '{strategy}'.")
 
-    def color_graph(self, n: int) -> None:
+    def color_graph(self, n: int, strategy: str = "briggs") -> set[str]:
         """
-        Colors the interference graph using a greedy coloring algorithm.
+        Colors the interference graph with at most n colors. The coloring is always proper,
+        variables that don't fit are left uncolored and returned as the spill set.
+
+        Strategies:
+            - "briggs": Chaitin-Briggs simplify/select, roughly linear time (the default).
+            - "dsatur": DSATUR, O((V + E) log V). See color_graph_minimum() for a search on top of it.
+            - "backtracking": exhaustive search, only for small graphs.
+            - "linear": linear scan, O(V log V) but more conservative (see LinearScan, which
+              also works without building a graph at all).
 
         :param n: The number of colors to use.
         :type n: int
+        :param strategy: The coloring strategy.
+        :type strategy: str
+        :return: The names of the spilled variables, empty if the whole graph was colored.
+        :rtype: set[str]
+        :raises ValueError: If the strategy is unknown.
+        """
+        return {self.symbols.names[node] for node in self.color_graph_ids(n, strategy)}
+
+    def nodes(self) -> list[str]:
+        """
+        Gets the names of the variables in the graph.
+
+        :return: The variable names.
+        :rtype: list[str]
+        """
+        return [self.symbols.names[node] for node in self.interference_graph.nodes()]
+
+    def edges(self) -> list[tuple[str, str]]:
+        """
+        Gets the edges of the graph, as pairs of variable names.
+
+        :return: The edges.
+        :rtype: list[tuple[str, str]]
+        """
+        names: list[str] = self.symbols.names
+
+        return [(names[var1], names[var2]) for var1, var2 in self.interference_graph.edges()]
+
+    def has_edge(self, var1: str, var2: str) -> bool:
+        """
+        Checks if two variables interfere.
+
+        :param var1: The name of the first variable.
+        :type var1: str
+        :param var2: The name of the second variable.
+        :type var2: str
+        :return: True if there is an edge between them, false otherwise
+        :rtype: bool
+        """
+        if var1 not in self.symbols or var2 not in self.symbols:
+            return False
+
+        return self.interference_graph.has_edge(self.symbols.get_id(var1), self.symbols.get_id(var2))
+
+    def get_colors(self) -> dict[str, int | None]:
+        """
+        Gets the color of every variable, keyed on variable names.
+
+        :return: The color of each variable, None if it isn't colored.
+        :rtype: dict[str, int | None]
         """
-        if self._solve_graph_coloring(0, n):
-            print("Graph successfully colored.")
-        else:
-            print("Failed to color the graph with the given number of colors.")
-        
-        
+        return {self.symbols.names[node]: color for node, color in self.colors.items()}
 
     def __str__(self) -> str:
         string = f"Interference Graph:\n\
-                    Nodes: {self.interference_graph.nodes()}\n\
-                    Edges: {self.interference_graph.edges()}\n\
-                    Colors: {self.colors}"
+                    Nodes: {self.nodes()}\n\
+                    Edges: {self.edges()}\n\
+                    Colors: {self.get_colors()}"
 
         return string
\ No newline at end of file
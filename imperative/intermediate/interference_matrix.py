@@ -0,0 +1,229 @@
+import numpy as np
+from input.instruction import Instruction
+from input.instruction_buffer import InstructionBuffer
+from input.instruction_columns import InstructionColumns
+from intermediate.graph import Graph, BitMatrixStorage, AdjacencySetStorage
+from intermediate.liveness import Liveness
+
+class InterferenceMatrix:
+    """
+    The whole interference relation of a block as a NumPy boolean matrix, computed in bulk.
+
+    The liveness states are laid out as a (lines x variables) matrix, derived straight from
+    the instructions' variable IDs rather than read back from Liveness line by line (see
+    _live_after()). The edges are then the same ones build_graph() used to add one by one:
+    every destination against the variables live after it (leaving out the variable a copy
+    reads), plus every pair of variables live coming into the block. Each instruction's live
+    row is OR-ed into its destination's row in one vectorized step.
+
+    Everything is dense, memory grows with lines x variables.
+    """
+
+    absent = -1 # State of a variable that isn't on a line at all
+
+    def __init__(self, liveness: Liveness) -> None:
+        """
+        :param liveness: The liveness analysis to build from, only its symbols and live objects are read.
+        :type liveness: Liveness
+        """
+        self.symbols = liveness.symbols
+        self.opcode, self.dest, self.src1, self.src2 = self._instruction_arrays(liveness.instruction_buffer)
+        self.live_out: np.ndarray = np.array([self.symbols.add(live) for live in liveness.live_objects], dtype=np.intp)
+        self.states: np.ndarray = self._state_matrix() # (lines x variables), the end of the block included
+        self.matrix: np.ndarray = self._interference_matrix() # (variables x variables), symmetric
+
+    @staticmethod
+    def _instruction_arrays(instruction_buffer: InstructionBuffer) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets the opcode, destination and operand IDs of every instruction, -1 for operands
+        that aren't variables. The columns are used as they are if they were already made.
+        """
+        columns: InstructionColumns | None = instruction_buffer.columns
+
+        if columns is None:
+            rows: np.ndarray = np.array(list(instruction_buffer.iter_variable_ids()), dtype=np.intp).reshape(-1, 4)
+
+            return rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3]
+
+        # Literals have negative codes too, they are no different from no operand here
+        src1: np.ndarray = np.maximum(np.frombuffer(columns.src1, dtype=np.int32), -1).astype(np.intp)
+        src2: np.ndarray = np.maximum(np.frombuffer(columns.src2, dtype=np.int32), -1).astype(np.intp)
+
+        return np.frombuffer(columns.opcode, dtype=np.int8), np.frombuffer(columns.dest, dtype=np.int32).astype(np.intp), src1, src2
+
+    def _live_after(self) -> np.ndarray:
+        """
+        Finds the variables live after each instruction: those whose next event (a line
+        reading or defining it, the live objects being read at the end of the block) is a read.
+        Only the events are sorted, the (lines x variables) result is filled in one pass.
+
+        :return: A (lines x variables) boolean matrix, the end of the block not included.
+        :rtype: np.ndarray
+        """
+        count: int = len(self.dest)
+        rows: np.ndarray = np.arange(count)
+        used1: np.ndarray = self.src1 >= 0
+        used2: np.ndarray = self.src2 >= 0
+
+        # A line reading its own destination reads it first, so reads sort ahead of definitions
+        defines, uses = 0, 1
+        lines: np.ndarray = np.concatenate([rows, rows[used1], rows[used2], np.full(len(self.live_out), count)])
+        variables: np.ndarray = np.concatenate([self.dest, self.src1[used1], self.src2[used2], self.live_out])
+        kinds: np.ndarray = np.concatenate([np.full(count, defines), np.full(used1.sum() + used2.sum() + len(self.live_out), uses)])
+
+        order: np.ndarray = np.lexsort((-kinds, lines, variables))
+        lines, variables, kinds = lines[order], variables[order], kinds[order]
+
+        first: np.ndarray = np.ones(len(order), dtype=bool) # First event of its variable on its line
+        first[1:] = (variables[1:] != variables[:-1]) | (lines[1:] != lines[:-1])
+        lines, variables, kinds = lines[first], variables[first], kinds[first]
+
+        # A read keeps the variable live from its previous event, or from the start of the block
+        starts: np.ndarray = np.zeros(len(lines), dtype=np.intp)
+        same: np.ndarray = variables[1:] == variables[:-1]
+        starts[1:][same] = lines[:-1][same]
+
+        reads: np.ndarray = (kinds == uses) & (starts < lines)
+
+        # Ranges of one variable don't overlap, a running sum over the line boundaries fills them in
+        boundaries: np.ndarray = np.zeros((count + 1, len(self.symbols)), dtype=np.int8)
+        np.add.at(boundaries, (starts[reads], variables[reads]), 1)
+        np.add.at(boundaries, (lines[reads], variables[reads]), -1)
+
+        # The sums are all 0 or 1, taken in place
+        live_after: np.ndarray = boundaries[:count]
+        np.add.accumulate(live_after, axis=0, out=live_after)
+
+        return live_after.view(bool)
+
+    def _state_matrix(self) -> np.ndarray:
+        """
+        Computes the liveness states as a matrix, the same ones Liveness finds line by line,
+        with absent where a variable isn't on a line.
+        """
+        count: int = len(self.dest)
+        rows: np.ndarray = np.arange(count)
+        live_after: np.ndarray = self._live_after()
+        live: int = Liveness.states["live"]
+
+        states: np.ndarray = np.empty((count + 1, len(self.symbols)), dtype=np.int8)
+        # live where live_after is 1, absent where it is 0, as plain byte arithmetic
+        np.multiply(live_after.view(np.int8), live - self.absent, out=states[:count])
+        states[:count] += self.absent
+        states[count] = self.absent
+        states[count, self.live_out] = live
+        states[rows, self.dest] = Liveness.states["defined"]
+
+        # An operand is unlive on the line it is last read on
+        for src in (self.src1, self.src2):
+            used: np.ndarray = src >= 0
+            states[rows[used], src[used]] = np.where(live_after[rows[used], src[used]], live, Liveness.states["unlive"])
+
+        return states
+
+    def _interference_matrix(self) -> np.ndarray:
+        """
+        Derives the interference matrix from the states.
+        """
+        count: int = len(self.dest)
+        variables: int = len(self.symbols)
+        rows: np.ndarray = np.arange(count)
+        dest: np.ndarray = self.dest
+        src1: np.ndarray = self.src1
+
+        # Only the variables live after an instruction are marked live on its line
+        live_out: np.ndarray = self.states[:count] == Liveness.states["live"]
+
+        live_out[rows, dest] = False
+
+        # A copy leaves out the variable it reads, so the two can still be coalesced
+        copies: np.ndarray = (self.opcode == Instruction.instruction_types["assignment"]) & (src1 >= 0)
+        live_out[rows[copies], src1[copies]] = False
+
+        # Each destination's row gets every live row it was defined over. Rows are packed into
+        # bits first, so the scatter moves bytes instead of bools
+        packed: np.ndarray = np.zeros((variables, (variables + 7) // 8), dtype=np.uint8)
+        np.bitwise_or.at(packed, dest, np.packbits(live_out, axis=1, bitorder="little"))
+        matrix: np.ndarray = np.unpackbits(packed, axis=1, count=variables, bitorder="little").astype(bool)
+
+        # Whatever is live coming into the block is defined together, before it
+        first: np.ndarray = self.states[0]
+        live_in: np.ndarray = (first != self.absent) & (first != Liveness.states["defined"])
+        matrix |= np.outer(live_in, live_in)
+
+        matrix |= matrix.T
+        np.fill_diagonal(matrix, False)
+
+        return matrix
+
+    def interferes(self, var1: int, var2: int) -> bool:
+        """
+        Checks if two variables interfere.
+
+        :param var1: The ID of the first variable.
+        :type var1: int
+        :param var2: The ID of the second variable.
+        :type var2: int
+        :return: True if they interfere, false otherwise
+        :rtype: bool
+        """
+        return bool(self.matrix[var1, var2])
+
+    def degrees(self) -> np.ndarray:
+        """
+        Gets the number of variables each variable interferes with.
+
+        :return: The degree of each variable, indexed by ID.
+        :rtype: np.ndarray
+        """
+        return self.matrix.sum(axis=1)
+
+    def pressure(self) -> np.ndarray:
+        """
+        Gets the number of registers needed on each line: the variables live after the
+        instruction plus its destination (the end of the block is just the live objects).
+
+        :return: The register pressure of each line, the end of the block last.
+        :rtype: np.ndarray
+        """
+        return ((self.states != self.absent) & (self.states != Liveness.states["unlive"])).sum(axis=1)
+
+    def peak_pressure(self) -> np.ndarray:
+        """
+        Gets the highest register pressure each variable is live through.
+
+        :return: For each variable (by ID), the highest pressure of a line it is live or defined on, 0 if none.
+        :rtype: np.ndarray
+        """
+        occupied: np.ndarray = (self.states != self.absent) & (self.states != Liveness.states["unlive"])
+
+        return np.where(occupied, self.pressure()[:, None], 0).max(axis=0, initial=0)
+
+    def to_graph(self, nodes: list[int], dense: bool = True) -> Graph:
+        """
+        Builds a Graph holding the edges between the given nodes.
+
+        :param nodes: The IDs of the variables to add as nodes, in order.
+        :type nodes: list[int]
+        :param dense: Whether to use BitMatrixStorage (rows are copied straight from the matrix) or AdjacencySetStorage.
+        :type dense: bool
+        :return: The graph.
+        :rtype: Graph
+        """
+        keep: np.ndarray = np.zeros(len(self.symbols), dtype=bool)
+        keep[nodes] = True
+        matrix: np.ndarray = self.matrix & keep
+
+        if dense:
+            storage = BitMatrixStorage()
+            packed: np.ndarray = np.packbits(matrix, axis=1, bitorder="little")
+
+            for node in nodes:
+                storage.rows[node] = int.from_bytes(packed[node].tobytes(), "little")
+        else:
+            storage = AdjacencySetStorage()
+
+            for node in nodes:
+                storage.adjacency[node] = set(np.flatnonzero(matrix[node]).tolist())
+
+        return Graph(storage)
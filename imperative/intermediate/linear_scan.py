@@ -0,0 +1,117 @@
+from heapq import heapify, heappop, heappush
+from input.instruction_columns import InstructionColumns
+from input.symbol_table import SymbolTable
+from intermediate.liveness import Liveness
+
+class LinearScan:
+    """
+    Linear-scan register allocation, for blocks too large to build an interference graph for.
+
+    Each variable gets one interval, from the first line it shows up on to the last (the
+    hull of its ranges from Liveness.intervals_ids()). Intervals are allocated in order of
+    their start: those that have ended give their register back, and when none is left the
+    interval that ends furthest away is spilled. That is O(V log V) after the intervals.
+
+    The result is a proper coloring of the interference graph, just not always as tight:
+    a variable keeps its register through the gaps between its ranges, and a copy doesn't
+    share one with its source. InterferenceGraph.color_graph() runs it as its "linear"
+    strategy. Used on its own, nothing but the liveness is needed, and color_graph() and
+    get_colors() return the spill set and color map in the same shapes.
+    """
+
+    def __init__(self, liveness: Liveness) -> None:
+        """
+        :param liveness: The liveness analysis of the block.
+        :type liveness: Liveness
+        """
+        self.liveness: Liveness = liveness
+        self.symbols: SymbolTable = liveness.symbols
+        self.colors: dict[int, int | None] = {}
+
+    def _intervals(self) -> list[tuple[int, bool, int, int]]:
+        """
+        Gets the interval of every variable, in the order they are allocated.
+
+        :return: (start, whether the variable is defined on its start line, end, variable ID) for every variable,
+            sorted. A variable that isn't defined on its start line is live coming into the block.
+        :rtype: list[tuple[int, bool, int, int]]
+        """
+        columns: InstructionColumns = self.liveness.instruction_buffer.get_columns()
+        intervals: list[tuple[int, bool, int, int]] = []
+
+        for var, ranges in self.liveness.intervals_ids().items():
+            start: int = ranges[0][0]
+            defined: bool = start < len(columns) and columns.dest[start] == var and var not in (columns.src1[start], columns.src2[start])
+
+            intervals.append((start, defined, ranges[-1][1], var))
+
+        # Whatever is live coming into the block comes before the first definition
+        intervals.sort()
+
+        return intervals
+
+    def color_graph_ids(self, n: int) -> set[int]:
+        """
+        Allocates the registers, see color_graph().
+
+        :return: The IDs of the variables left without a register.
+        :rtype: set[int]
+        """
+        free: list[int] = list(range(n))
+        active: dict[int, int] = {} # Register of each variable currently holding one
+        by_end: list[tuple[int, int]] = [] # Active intervals, the one ending first on top
+        by_far: list[tuple[int, int]] = [] # Active intervals, the one ending last on top (stale entries are skipped)
+        spilled: set[int] = set()
+
+        heapify(free)
+        self.colors = {}
+
+        for start, defined, end, var in self._intervals():
+            # A variable last read on the line defining this one can hand over its register
+            while by_end and (by_end[0][0] < start or (defined and by_end[0][0] == start)):
+                _, done = heappop(by_end)
+
+                if done in active:
+                    heappush(free, active.pop(done))
+
+            if not free:
+                while by_far and by_far[0][1] not in active:
+                    heappop(by_far)
+
+                if not by_far or -by_far[0][0] <= end:
+                    self.colors[var] = None
+                    spilled.add(var)
+                    continue
+
+                _, victim = heappop(by_far)
+                heappush(free, active.pop(victim))
+                self.colors[victim] = None
+                spilled.add(victim)
+
+            active[var] = heappop(free)
+            self.colors[var] = active[var]
+            heappush(by_end, (end, var))
+            heappush(by_far, (-end, var))
+
+        return spilled
+
+    def color_graph(self, n: int) -> set[str]:
+        """
+        Allocates at most n registers, with the same results as InterferenceGraph.color_graph():
+        variables that don't fit are left without a color and returned.
+
+        :param n: The number of registers.
+        :type n: int
+        :return: The names of the spilled variables, empty if everything fit.
+        :rtype: set[str]
+        """
+        return {self.symbols.names[var] for var in self.color_graph_ids(n)}
+
+    def get_colors(self) -> dict[str, int | None]:
+        """
+        Gets the register of every variable, keyed on variable names.
+
+        :return: The register of each variable, None if it was spilled.
+        :rtype: dict[str, int | None]
+        """
+        return {self.symbols.names[var]: color for var, color in self.colors.items()}
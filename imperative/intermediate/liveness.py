@@ -1,6 +1,7 @@
+from typing import Iterator
 from llist import dllist
 from input.instruction_buffer import InstructionBuffer, Instruction
-from input.scanner import Token
+from input.symbol_table import SymbolTable
 
 class Liveness:
     # Possible states for a variable listed in our liveness analysis
@@ -10,24 +11,33 @@ class Liveness:
         "unlive": 2
     }
 
-    def __init__(self, instruction_buffer: InstructionBuffer) -> None:
-        
+    def __init__(self, instruction_buffer: InstructionBuffer, live_out: list[str] | None = None) -> None:
+        """
+        :param instruction_buffer: The instructions to analyze.
+        :type instruction_buffer: InstructionBuffer
+        :param live_out: The objects live after the last instruction, the buffer's live objects if None.
+            A block in a control flow graph gets these from GlobalLiveness.
+        :type live_out: list[str] | None
+        """
         # { a: 0, t1: 1, etc... } where 0 is defined and 1 is live. (according to the current line)
+        # Variables are keyed on their IDs from the symbol table, names only come back for output
         self.liveness: dllist = dllist() # list of dicts of line-by-line liveness
         self.instruction_buffer: InstructionBuffer = instruction_buffer
+        self.symbols: SymbolTable = instruction_buffer.get_symbol_table()
+        self.live_objects: list[str] = instruction_buffer.list_live_objects() if live_out is None else live_out
 
         self._determine_liveness()
 
-    def _mark_liveness(self, variables: list[Token], line_liveness: dict[str, int], carry_vars: list[str]) -> None:
+    def _mark_liveness(self, variables: list[int], line_liveness: dict[int, int], carry_vars: list[int]) -> None:
         """
         Marks the liveness of a set of variables.
         
-        :param instruction: The instruction to analyze.
-        :type instruction: Instruction
+        :param variables: The IDs of the variables in the instruction, destination first.
+        :type variables: list[int]
         :param line_liveness: The current line's liveness dictionary.
-        :type line_liveness: dict[str, int]
+        :type line_liveness: dict[int, int]
         :param carry_vars: The list of carry variables from the previous line.
-        :type carry_vars: list[str]
+        :type carry_vars: list[int]
         """
 
         # First, we mark any carry variables as live in this line
@@ -35,15 +45,15 @@ class Liveness:
             line_liveness[c] = self.states["live"]
 
         # Destination is always a variable (index 0)
-        line_liveness[variables[0].value] = self.states["defined"]
+        line_liveness[variables[0]] = self.states["defined"]
 
         # Check for any variables in the line
         match len(variables):
             case 3:
-                line_liveness[variables[1].value] = self.states["unlive"] if variables[1].value not in carry_vars else self.states["live"]
-                line_liveness[variables[2].value] = self.states["unlive"] if variables[2].value not in carry_vars else self.states["live"]
+                line_liveness[variables[1]] = self.states["unlive"] if variables[1] not in carry_vars else self.states["live"]
+                line_liveness[variables[2]] = self.states["unlive"] if variables[2] not in carry_vars else self.states["live"]
             case 2:
-                line_liveness[variables[1].value] = self.states["unlive"] if variables[1].value not in carry_vars else self.states["live"]
+                line_liveness[variables[1]] = self.states["unlive"] if variables[1] not in carry_vars else self.states["live"]
 
         # Make sure to clear the carry var array before repopulating
         # This is done so that unliveness/liveness states are properly applied
@@ -54,20 +64,21 @@ class Liveness:
             if state != self.states["defined"]:
                 carry_vars.append(var)
 
-    def _determine_initial_liveness(self) -> list[str]:
+    def _determine_initial_liveness(self) -> list[int]:
         """
         Determines the initial liveness of variables based on the live objects specified
-        at the end of the instruction buffer.
+        at the end of the instruction buffer (or given as live_out).
 
-        :return: A list of variables that are live after the last instruction.
-        :rtype: list[str]
+        :return: A list of variable IDs that are live after the last instruction.
+        :rtype: list[int]
         """
-        line_liveness: dict[str, int] = {}
-        carry_vars: list[str] = []
+        line_liveness: dict[int, int] = {}
+        carry_vars: list[int] = []
 
-        for live in self.instruction_buffer.list_live_objects():
-            line_liveness[live] = self.states["live"]
-            carry_vars.append(live) # We carry these forward to the previous line (itll make sense later)
+        for live in self.live_objects:
+            id: int = self.symbols.add(live)
+            line_liveness[id] = self.states["live"]
+            carry_vars.append(id) # We carry these forward to the previous line (itll make sense later)
 
         self.liveness.appendleft(line_liveness)
 
@@ -79,20 +90,25 @@ class Liveness:
         """
         
         # This algorithm is freaky, will try to comment it as best as possible
-        carry_vars: list[str] = [] # Holds variables that were were live and not defined in the last line, 
+        carry_vars: list[int] = [] # Holds variables that were were live and not defined in the last line, 
 
         # First, determine liveness for after this code block (found in the live: etc. section)
         # and also get any carry variables (i.e. variables that are live)
         carry_vars = self._determine_initial_liveness()
         # Here, carry vars are just what is after "live: " in the input stream
 
-        # We iterate backwards, finding the last use of a variable, then marking when it gets defined
-        for instruction in reversed(self.instruction_buffer.list_instructions()):
-            line_liveness: dict[str, int] = {} # Holds liveness for the current line
+        # Walking backwards in place means no copy of the instruction list, and the columns
+        # are only read if something else already made them
+        for _, dest, src1, src2 in self.instruction_buffer.iter_variable_ids(reverse=True):
+            line_liveness: dict[int, int] = {} # Holds liveness for the current line
+
+            # Okay, we now have to grab all the variables in the line, destination first
+            variables: list[int] = [dest]
+            if src1 >= 0:
+                variables.append(src1)
+            if src2 >= 0:
+                variables.append(src2)
 
-            # Okay, we now have to grab all the variables in the line
-            variables: list[Token] = instruction.get_variables()
-            
             # Now we can mark liveness
             self._mark_liveness(variables, line_liveness, carry_vars)
             # Appending left to reverse the order as we go
@@ -100,12 +116,92 @@ class Liveness:
 
     def get_liveness(self) -> list[dict[str, int]]:
         """
-        Retrieves the liveness information.
+        Retrieves the liveness information, keyed on variable names.
 
         :return: A list of dictionaries representing the liveness information.
         :rtype: list[dict[str, int]]
         """
-        return list(self.liveness)
+        names: list[str] = self.symbols.names
+
+        return [{names[var]: state for var, state in line_liveness.items()} for line_liveness in self.iter_liveness_ids()]
+
+    def get_liveness_ids(self) -> list[dict[int, int]]:
+        """
+        Retrieves the liveness information, keyed on variable IDs (see the symbol table).
+
+        :return: A list of dictionaries representing the liveness information.
+        :rtype: list[dict[int, int]]
+        """
+        return list(self.iter_liveness_ids())
+
+    def iter_liveness_ids(self) -> Iterator[dict[int, int]]:
+        """
+        Iterates over the liveness information line by line, keyed on variable IDs.
+        Everything reading the liveness goes through here.
+
+        :return: Iterator over the dictionaries, first line first.
+        :rtype: Iterator[dict[int, int]]
+        """
+        return iter(self.liveness)
+
+    def intervals_ids(self) -> dict[int, list[tuple[int, int]]]:
+        """
+        Computes the live ranges of every variable in one backward pass, keyed on variable IDs.
+
+        A range is (start, end), both line indices and inclusive: start is the line defining
+        the variable (0 if it's live coming into the block) and end is the last line reading it
+        (len(instructions), the end of the block, if it's a live object). A definition that is
+        never read gets a range of its own line only. Ranges of a variable don't overlap and
+        cover exactly the lines it shows up on in get_liveness().
+
+        :return: The sorted ranges of each variable, variables in ID order.
+        :rtype: dict[int, list[tuple[int, int]]]
+        """
+        count: int = len(self.instruction_buffer.get_instructions())
+        ranges: dict[int, list[tuple[int, int]]] = {}
+        open_ends: dict[int, int] = {} # End of the range each live variable is in, while going up
+
+        for live in self.live_objects:
+            open_ends[self.symbols.add(live)] = count
+
+        for i, (_, dest, src1, src2) in zip(range(count - 1, -1, -1), self.instruction_buffer.iter_variable_ids(reverse=True)):
+            # A destination that's also read here just carries its range on up
+            if src1 != dest and src2 != dest:
+                ranges.setdefault(dest, []).append((i, open_ends.pop(dest, i)))
+
+            for src in (src1, src2):
+                if src >= 0 and src not in open_ends:
+                    open_ends[src] = i
+
+        # Whatever is still open is live coming into the block
+        for var, end in open_ends.items():
+            ranges.setdefault(var, []).append((0, end))
+
+        # Ranges were found last first
+        return {var: ranges[var][::-1] for var in sorted(ranges)}
+
+    def intervals(self) -> dict[str, list[tuple[int, int]]]:
+        """
+        Computes the live ranges of every variable, keyed on variable names (see intervals_ids()).
+
+        :return: The sorted ranges of each variable.
+        :rtype: dict[str, list[tuple[int, int]]]
+        """
+        names: list[str] = self.symbols.names
+
+        return {names[var]: var_ranges for var, var_ranges in self.intervals_ids().items()}
+
+    def max_live(self) -> int:
+        """
+        Gets the register pressure of the busiest line: the variables live after an
+        instruction plus its destination (at the end of the block, the live objects).
+
+        :return: The highest number of variables occupying a register at once.
+        :rtype: int
+        """
+        unlive: int = self.states["unlive"]
+
+        return max((sum(1 for state in line.values() if state != unlive) for line in self.iter_liveness_ids()), default=0)
 
     def liveness_info(self) -> list[str]:
         """
@@ -115,8 +211,9 @@ class Liveness:
         :rtype: list[str]
         """
         liveness_strings: list[str] = []
+        names: list[str] = self.symbols.names
 
-        for line_liveness in self.liveness:
+        for line_liveness in self.iter_liveness_ids():
             line_string = "["
             for var, state in line_liveness.items():
                 match state:
@@ -126,7 +223,7 @@ class Liveness:
                         state_str = "live"
                     case 2:
                         state_str = "unlive"
-                line_string += f"{var}: {state_str}, "
+                line_string += f"{names[var]}: {state_str}, "
             liveness_strings.append(f"{line_string[:-2]}]")
 
         return liveness_strings
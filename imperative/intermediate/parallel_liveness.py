@@ -0,0 +1,140 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from input.instruction_buffer import InstructionBuffer
+from input.instruction_columns import InstructionColumns
+from intermediate.liveness import Liveness
+
+def _summarize_segment(dest: array, src1: array, src2: array) -> tuple[list[int], set[int]]:
+    """
+        Summarizes a segment as a transfer function, by walking it backwards with nothing live below it.
+        Runs inside a worker process.
+
+        :param dest: The segment's dest column.
+        :type dest: array
+        :param src1: The segment's src1 column.
+        :type src1: array
+        :param src2: The segment's src2 column.
+        :type src2: array
+        :return: The variables live above the segment when nothing is live below it, in order,
+                and the variables it kills (defines without reading on the same line).
+        :rtype: tuple[list[int], set[int]]
+    """
+    carry: dict[int, None] = {}
+    kill: set[int] = set()
+
+    for i in range(len(dest) - 1, -1, -1):
+        if src1[i] == dest[i] or src2[i] == dest[i]:
+            carry.setdefault(dest[i])
+        else:
+            carry.pop(dest[i], None)
+            kill.add(dest[i])
+
+        for src in (src1[i], src2[i]):
+            if src >= 0 and src not in carry:
+                carry[src] = None
+
+    return list(carry), kill
+
+def _segment_liveness(dest: array, src1: array, src2: array, live_out: list[int]) -> list[dict[int, int]]:
+    """
+        Computes the line-by-line liveness of a segment, given what is live below it.
+        Runs inside a worker process.
+
+        :return: The liveness of each line of the segment, first line first.
+        :rtype: list[dict[int, int]]
+    """
+    marker: Liveness = Liveness.__new__(Liveness) # Only _mark_liveness() is used, there's nothing to analyze
+    carry_vars: list[int] = list(live_out)
+    lines: list[dict[int, int]] = []
+
+    for i in range(len(dest) - 1, -1, -1):
+        variables: list[int] = [dest[i]] + [src for src in (src1[i], src2[i]) if src >= 0]
+        line_liveness: dict[int, int] = {}
+
+        marker._mark_liveness(variables, line_liveness, carry_vars)
+        lines.append(line_liveness)
+
+    lines.reverse()
+
+    return lines
+
+class ParallelLiveness(Liveness):
+    """
+        Liveness analysis that splits a long block into segments and works on them in a process pool.
+
+        Each segment is first summarized as an ordered gen/kill transfer function. Composing
+        the summaries from the end of the block gives what is live below every segment,
+        after which all segments fill in their lines at once.
+
+        The order a live set is shown in matters too, so a summary keeps the order its
+        variables became live. Coming out of a segment, whatever was live below it and isn't
+        killed keeps its place, and the rest follow in the summary's order. The result is
+        exactly the same as the sequential Liveness's.
+    """
+
+    def __init__(self, instruction_buffer: InstructionBuffer, workers: int | None = None, segment_size: int = 1 << 16, live_out: list[str] | None = None) -> None:
+        """
+        :param instruction_buffer: The instructions to analyze.
+        :type instruction_buffer: InstructionBuffer
+        :param workers: Number of worker processes, the CPU count if None.
+        :type workers: int | None
+        :param segment_size: Instructions per segment.
+        :type segment_size: int
+        :param live_out: The objects live after the last instruction, the buffer's live objects if None.
+        :type live_out: list[str] | None
+        """
+        self.workers: int = workers or os.cpu_count() or 1
+        self.segment_size: int = segment_size
+
+        super().__init__(instruction_buffer, live_out)
+
+    @staticmethod
+    def _compose(live_out: list[int], summary: tuple[list[int], set[int]]) -> list[int]:
+        """
+        Applies a segment's transfer function to what is live below it.
+
+        :param live_out: The variables live below the segment, in order.
+        :type live_out: list[int]
+        :param summary: The segment's summary, see _summarize_segment().
+        :type summary: tuple[list[int], set[int]]
+        :return: The variables live above the segment, in order.
+        :rtype: list[int]
+        """
+        gen, kill = summary
+        below: set[int] = set(live_out)
+
+        # A variable that stays live through the segment keeps the place it had below it
+        return [var for var in live_out if var not in kill] + [var for var in gen if var in kill or var not in below]
+
+    def _determine_liveness(self) -> None:
+        """
+        Determines the liveness state of variables in the instruction buffer, one segment per task.
+        """
+        columns: InstructionColumns = self.instruction_buffer.get_columns()
+
+        if len(columns) <= self.segment_size or self.workers == 1:
+            super()._determine_liveness()
+            return
+
+        carry_vars: list[int] = self._determine_initial_liveness()
+        starts: list[int] = list(range(0, len(columns), self.segment_size))
+
+        dests: list[array] = [columns.dest[start:start + self.segment_size] for start in starts]
+        src1s: list[array] = [columns.src1[start:start + self.segment_size] for start in starts]
+        src2s: list[array] = [columns.src2[start:start + self.segment_size] for start in starts]
+
+        with ProcessPoolExecutor(self.workers) as pool:
+            summaries: list[tuple[list[int], set[int]]] = list(pool.map(_summarize_segment, dests, src1s, src2s))
+
+            # Composing is sequential, but only goes through one live set per segment
+            live_outs: list[list[int]] = [carry_vars]
+            for summary in reversed(summaries[1:]):
+                live_outs.append(self._compose(live_outs[-1], summary))
+            live_outs.reverse()
+
+            segments: list[list[dict[int, int]]] = list(pool.map(_segment_liveness, dests, src1s, src2s, live_outs))
+
+        # The end of the block is already in, everything goes in front of it
+        for lines in reversed(segments):
+            self.liveness.extendleft(lines[::-1])
@@ -0,0 +1,229 @@
+import math
+from input.instruction_buffer import InstructionBuffer, Instruction
+from input.instruction_columns import InstructionColumns
+from input.symbol_table import SymbolTable
+from input.token import Token
+from intermediate.allocation_session import AllocationSession
+
+class Spiller:
+    """
+    Makes a block fit in a number of registers by spilling variables to memory.
+
+    Each round colors the graph with Chaitin-Briggs, guided by spill costs, and sends
+    the variables left without a color to memory. A spilled variable's name then stands
+    for its memory slot. Every instruction using it gets a temporary: the value is loaded
+    into it before the instruction (t = x) and stored from it after (x = t). A copy from
+    or to a spilled variable is a load or store already, so it stays as it is.
+
+    Everything goes through an AllocationSession, so liveness and edges are only redone
+    around the lines that changed. Temporaries can't be spilled, and every round sends
+    at least one more variable to memory, so the rounds always end.
+    """
+
+    # Token types needed to write instructions
+    types = {
+        'destination': 0,
+        'variable': 1,
+        'literal': 2
+    }
+
+    def __init__(self, instruction_buffer: InstructionBuffer, registers: int) -> None:
+        """
+        :param instruction_buffer: The block, rewritten in place.
+        :type instruction_buffer: InstructionBuffer
+        :param registers: The number of registers.
+        :type registers: int
+        """
+        self.instruction_buffer: InstructionBuffer = instruction_buffer
+        self.registers: int = registers
+        self.session: AllocationSession = AllocationSession(instruction_buffer, registers)
+        self.symbols: SymbolTable = self.session.symbols
+        self.spilled: list[int] = [] # Variables sent to memory, in order
+        self.temporaries: set[int] = set() # Variables made for loads and stores
+        self.rounds: int = 0 # Number of times spill code was inserted
+
+        self.session.interference_graph.spill_costs = self.spill_costs_ids()
+
+    def spill_costs_ids(self) -> dict[int, float]:
+        """
+        Estimates what spilling each variable would cost: a load or store for every instruction
+        reading or writing it, weighted by the instruction's frequency ('freq:' in the input).
+        Temporaries can't be spilled again, their cost is infinite.
+
+        :return: The cost of each variable, by ID.
+        :rtype: dict[int, float]
+        """
+        columns: InstructionColumns = self.instruction_buffer.get_columns()
+        costs: dict[int, float] = {}
+
+        for i in range(len(columns)):
+            for var in set(columns.variables(i)):
+                costs[var] = costs.get(var, 0) + columns.frequency[i]
+
+        for var in self.temporaries:
+            costs[var] = math.inf
+
+        return costs
+
+    def spill_costs(self) -> dict[str, float]:
+        """
+        Estimates what spilling each variable would cost, see spill_costs_ids().
+
+        :return: The cost of each variable, by name.
+        :rtype: dict[str, float]
+        """
+        return {self.symbols.names[var]: cost for var, cost in self.spill_costs_ids().items()}
+
+    def _temporary(self, name: str) -> str:
+        """
+        Makes up a fresh variable name for a load or store of a spilled variable.
+        """
+        count: int = 1
+        while f"{name}s{count}" in self.symbols:
+            count += 1
+
+        temporary: str = f"{name}s{count}"
+        id: int = self.symbols.add(temporary)
+
+        self.temporaries.add(id)
+        self.session.interference_graph.spill_costs[id] = math.inf
+
+        return temporary
+
+    def _rewrite(self, index: int) -> None:
+        """
+        Adds the loads and stores the instruction at the given index needs, for the operands
+        and destination in memory.
+
+        Edits are ordered so that liveness only ever changes next to the instruction: the
+        store's slot is taken by a placeholder first, so the variable doesn't go live above
+        the instruction while nothing defines it.
+        """
+        instruction: Instruction = self.session.instructions[index]
+        memory: set[int] = self.session.memory
+        frequency: int = instruction.frequency
+        assignment: int = Instruction.instruction_types["assignment"]
+
+        def in_memory(token: Token | None) -> bool:
+            return token is not None and token.type != self.types["literal"] and self.symbols.get_id(token.value) in memory
+
+        dest_in_memory: bool = in_memory(instruction.dest)
+
+        if instruction.type == assignment:
+            # Already a load or a store, only memory to memory goes through a register
+            if not (dest_in_memory and in_memory(instruction.operand1)):
+                return
+
+            dest_in_memory = False
+
+        temporaries: dict[str, str] = {}
+
+        def operand(token: Token | None) -> Token | None:
+            if not in_memory(token):
+                return token
+
+            if token.value not in temporaries:
+                temporaries[token.value] = self._temporary(token.value)
+
+            return Token(temporaries[token.value], self.types["variable"])
+
+        operand1: Token | None = operand(instruction.operand1)
+        operand2: Token | None = operand(instruction.operand2)
+        loads: list[tuple[str, str]] = list(temporaries.items())
+
+        if dest_in_memory:
+            self.session.insert(index + 1, Instruction(assignment, instruction.dest, Token("0", self.types["literal"]), frequency=frequency))
+
+        for name, temporary in loads:
+            self.session.insert(index, Instruction(assignment, Token(temporary, self.types["destination"]), Token(name, self.types["variable"]), frequency=frequency))
+            index += 1
+
+        dest: Token = instruction.dest
+        if dest_in_memory:
+            if dest.value not in temporaries:
+                temporaries[dest.value] = self._temporary(dest.value)
+
+            dest = Token(temporaries[dest.value], self.types["destination"])
+
+        self.session.replace(index, Instruction(instruction.type, dest, operand1, instruction.operator, operand2, frequency))
+
+        if dest_in_memory:
+            self.session.replace(index + 1, Instruction(assignment, instruction.dest, Token(dest.value, self.types["variable"]), frequency=frequency))
+
+    def spill_ids(self, variables: set[int]) -> None:
+        """
+        Sends variables to memory and inserts their loads and stores.
+
+        :param variables: The IDs of the variables to spill.
+        :type variables: set[int]
+        """
+        self.session.defer_coloring = True
+
+        for var in variables:
+            self.session.keep_in_memory(self.symbols.names[var])
+            self.spilled.append(var)
+
+        columns: InstructionColumns = self.instruction_buffer.get_columns()
+
+        # Last first, so the instructions still to rewrite keep their index
+        for i in range(len(columns) - 1, -1, -1):
+            if not variables.isdisjoint(columns.variables(i)):
+                self._rewrite(i)
+
+        self.session.defer_coloring = False
+        self.rounds += 1
+
+    def allocate_ids(self) -> set[int]:
+        """
+        Spills until the block fits in the registers, see allocate().
+
+        :return: The IDs of the spilled variables.
+        :rtype: set[int]
+        :raises ValueError: If the block doesn't fit even with every variable spilled.
+        """
+        graph = self.session.interference_graph
+
+        while True:
+            uncolored: set[int] = {self.symbols.get_id(name) for name in self.session.recolor()}
+
+            if not uncolored:
+                return set(self.spilled)
+
+            victims: set[int] = uncolored - self.temporaries
+
+            if not victims:
+                # Only temporaries were left over, make room next to them instead
+                neighbors: set[int] = {neighbor for var in uncolored for neighbor in graph.interference_graph.neighbors(var)} - self.temporaries
+
+                if not neighbors:
+                    raise ValueError(f"The block doesn't fit in {self.registers} registers, even with every variable spilled.")
+
+                victims = {min(neighbors, key=lambda var: graph.spill_costs.get(var, 1))}
+
+            self.spill_ids(victims)
+
+    def allocate(self) -> set[str]:
+        """
+        Spills variables, cheapest first, and rewrites the block until it fits in the registers.
+        Afterwards every variable in a register has a color, see get_colors().
+
+        :return: The names of the spilled variables.
+        :rtype: set[str]
+        :raises ValueError: If the block doesn't fit even with every variable spilled.
+        """
+        return {self.symbols.names[var] for var in self.allocate_ids()}
+
+    def get_colors(self) -> dict[str, int | None]:
+        """
+        Gets the register of every variable, keyed on variable names.
+
+        :return: The register of each variable, None for spilled ones.
+        :rtype: dict[str, int | None]
+        """
+        colors: dict[str, int | None] = self.session.get_colors()
+
+        for var in self.spilled:
+            if var in self.session.memory:
+                colors[self.symbols.names[var]] = None
+
+        return colors
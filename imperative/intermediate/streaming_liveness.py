@@ -0,0 +1,310 @@
+import io
+import mmap
+import re
+from typing import Iterator
+from input.fast_parser import FastParser
+from input.parser import Parser
+from input.symbol_table import SymbolTable
+from input.table_scanner import TableScanner
+from intermediate.interference_graph import InterferenceGraph
+
+class StreamingLiveness:
+    """
+    Liveness and interference edges of a single block, computed straight from its file
+    without building an InstructionBuffer first.
+
+    The file is memory-mapped and its lines are walked from the end, so the backward
+    pass sees each instruction exactly when it needs it. Only the current live set and
+    the edges found so far are kept, so memory grows with the number of variables and
+    edges, not with the number of instructions.
+
+    Edges are the same as InterferenceGraph.build_graph() finds from Liveness: each
+    destination against the live set below it (leaving out the variable a copy reads),
+    then every pair of the variables live coming into the block.
+
+    Variable IDs are given in the order the names are first seen going backwards.
+
+    An invalid input raises the same error as Parser: the lines above a bad one are still
+    checked, so the first invalid line is the one reported. The file stays mapped until
+    close() is called, or the analysis is left when used as a context manager.
+    """
+
+    # Same boundaries MappedScanner uses to tell 'live:' apart from a longer symbol
+    live_pattern = re.compile(rb"(?<![^\n=, +\-*/\t])live:(?![^\n=, +\-*/])")
+
+    # A blank line ends the input, like it does for Scanner
+    blank_pattern = re.compile(rb"(?m)^[ \t\r\x0b\x0c\x1c-\x1f]*(?:\n|\Z)")
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: The file holding the block.
+        :type path: str
+        :raises ValueError: If an instruction or live object is invalid.
+        """
+        with open(path, "rb") as file:
+            try:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # Empty files cannot be mapped
+                self.map = b""
+
+        self.symbols: SymbolTable = SymbolTable()
+        self.neighbors: dict[int, set[int]] = {} # Edges, each only kept from the variable that found it
+        self.live: dict[int, None] = {} # Variables live at the current point of the walk, in order
+        self.instructions: int = 0 # Number of instructions walked over
+        self.occurred: set[int] = set() # Variables seen in the instructions (or before 'live:')
+
+        # Only used for the lines the fast pattern can't read
+        self.parser: Parser = Parser(TableScanner(None))
+
+        try:
+            self._determine_liveness()
+        except ValueError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """
+        Unmaps the file. The results of the walk stay available.
+        """
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+
+        self.map = b""
+
+    def __enter__(self) -> "StreamingLiveness":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _live_start(self, end: int) -> int:
+        """
+        Finds where the 'live:' section starts, which is where the instructions end.
+
+        :param end: Where the input ends.
+        :type end: int
+        :return: The start of the line holding the last 'live:', end if there is none.
+        :rtype: int
+        """
+        last = None
+        for last in self.live_pattern.finditer(self.map, 0, end):
+            pass
+
+        if last is None:
+            return end
+
+        # The whole line holding 'live:' belongs to the live section
+        return self.map.rfind(b"\n", 0, last.start()) + 1
+
+    def _live_section(self, start: int, end: int) -> list[str]:
+        """
+        Reads the live objects of the 'live:' section.
+
+        :param start: Where the section starts.
+        :type start: int
+        :param end: Where the input ends.
+        :type end: int
+        :return: The live objects.
+        :rtype: list[str]
+        :raises ValueError: If something other than a live symbol follows 'live:'.
+        """
+        scanner = TableScanner(io.StringIO(self.map[start:end].decode()))
+        live_objects: list[str] = []
+
+        for token in scanner.tokens():
+            if token.type == Parser.types["live_symbol"]:
+                if token.value not in live_objects:
+                    live_objects.append(token.value)
+            elif scanner.reading == "live" and token.type not in (Parser.types["live"], Parser.types["newline"]):
+                raise ValueError(f"Invalid live object format. Expected live symbol, got {token.type_string()}.")
+            elif token.type in (Parser.types["destination"], Parser.types["variable"]):
+                # Anything before 'live:' is still tracked, but not validated
+                self.occurred.add(self.symbols.add(token.value))
+
+        return live_objects
+
+    def _parse_line(self, text: str) -> tuple[str, str | None, str | None, bool] | None:
+        """
+        Reads the variables of an instruction line.
+
+        :param text: The line, with its newline.
+        :type text: str
+        :return: The destination and the variable operands (None where there is none, or a literal),
+            and whether the line is an assignment. None for a 'freq:' line, which doesn't change liveness.
+        :rtype: tuple[str, str | None, str | None, bool] | None
+        :raises ValueError: If the line is not a valid instruction.
+        """
+        match = FastParser.instruction_pattern.match(text)
+
+        if match is not None:
+            dest, operand1, _, operand2, _, unary_operand, source = match.groups()
+            operands = (operand1, operand2) if operand1 is not None else (unary_operand or source, None)
+            assignment: bool = source is not None
+        else:
+            scanner = self.parser.scanner
+            scanner.buffer = []
+            scanner.index = 0
+            scanner._tokenize_line(text.lstrip())
+            line = scanner.buffer
+
+            if line and line[0].type == Parser.types["frequency"]:
+                self.parser._parse_frequency(line)
+                return None
+
+            type: int = self.parser._validate_instruction(line)
+            assignment: bool = type == Parser.instruction_types["assignment"]
+
+            match type:
+                case 0:
+                    dest, operands = line[0].value, (line[2].value, line[4].value)
+                case 1:
+                    dest, operands = line[0].value, (line[3].value, None)
+                case 2:
+                    dest, operands = line[0].value, (line[2].value, None)
+                case _:
+                    raise ValueError(f'Invalid instruction format. {" ".join([token.value for token in line])}')
+
+        return (dest, *(None if operand is None or operand[0].isdigit() else operand for operand in operands), assignment)
+
+    def _lines_backwards(self, end: int) -> Iterator[str]:
+        """
+        Yields the instruction lines before end, last first.
+        """
+        source = self.map
+
+        while end > 0:
+            start: int = source.rfind(b"\n", 0, end - 1) + 1
+            text: str = source[start:end].decode().replace("\r\n", "\n")
+            end = start
+
+            # A last line without a newline never forms an instruction, it's dropped
+            if text.endswith("\n"):
+                yield text
+
+    def _add_edges(self, var: int, others) -> None:
+        neighbors: set[int] | None = self.neighbors.get(var)
+
+        if neighbors is None:
+            neighbors = self.neighbors[var] = set()
+
+        # One set update per line, the other direction is only filled in by edges()
+        neighbors.update(others)
+        neighbors.discard(var)
+
+    def _determine_liveness(self) -> None:
+        """
+        Walks the block backwards, keeping the live set and collecting edges.
+        """
+        blank = self.blank_pattern.search(self.map)
+        limit: int = blank.start() if blank else len(self.map)
+        end: int = self._live_start(limit)
+        error: ValueError | None = None # Error of the invalid line highest up so far
+
+        # Parser reads the instructions first, so any invalid instruction is reported before the live section
+        try:
+            live_objects: list[str] = self._live_section(end, limit) if end < limit else []
+        except ValueError as invalid:
+            error = invalid
+            live_objects = []
+
+        live: dict[int, None] = self.live
+        for name in live_objects:
+            live[self.symbols.add(name)] = None
+
+        for text in self._lines_backwards(end):
+            try:
+                parsed = self._parse_line(text)
+            except ValueError as invalid:
+                error = invalid
+                continue
+
+            # Past an invalid line, the lines above are only checked
+            if parsed is None or error is not None:
+                continue
+
+            dest_name, src1_name, src2_name, assignment = parsed
+            dest: int = self.symbols.add(dest_name)
+            src1: int = -1 if src1_name is None else self.symbols.add(src1_name)
+            src2: int = -1 if src2_name is None else self.symbols.add(src2_name)
+            self.instructions += 1
+            self.occurred.add(dest)
+
+            if src1 >= 0:
+                self.occurred.add(src1)
+            if src2 >= 0:
+                self.occurred.add(src2)
+
+            # The destination interferes with everything live past it, except the variable it copies
+            self._add_edges(dest, [var for var in live if var != src1] if assignment and src1 >= 0 else live)
+
+            # Step above the line, the same way Liveness does
+            if src1 == dest or src2 == dest:
+                live.setdefault(dest)
+            else:
+                live.pop(dest, None)
+
+            for src in (src1, src2):
+                if src >= 0 and src not in live:
+                    live[src] = None
+
+        if error is not None:
+            raise error
+
+        # Whatever is live coming into the block is defined together, before it
+        for var in live:
+            self._add_edges(var, live)
+
+        for name in live_objects:
+            if self.symbols.get_id(name) not in self.occurred:
+                raise ValueError(f"Live object '{name}' has not been declared in previous instructions.")
+
+    def get_live_in(self) -> list[str]:
+        """
+        Gets the names of the variables live coming into the block.
+
+        :return: The variable names, in the order Liveness would show them on the first line.
+        :rtype: list[str]
+        """
+        return [self.symbols.names[var] for var in self.live]
+
+    def edges(self) -> set[tuple[int, int]]:
+        """
+        Gets the interference edges, as pairs of variable IDs.
+
+        :return: The edges, smallest ID first in each pair.
+        :rtype: set[tuple[int, int]]
+        """
+        return {
+            (var, other) if var < other else (other, var)
+            for var, neighbors in self.neighbors.items() for other in neighbors
+        }
+
+    def get_edges(self) -> list[tuple[str, str]]:
+        """
+        Gets the interference edges, as pairs of variable names.
+
+        :return: The edges.
+        :rtype: list[tuple[str, str]]
+        """
+        names: list[str] = self.symbols.names
+
+        return [(names[var1], names[var2]) for var1, var2 in self.edges()]
+
+    def interference_graph(self) -> InterferenceGraph:
+        """
+        Builds the interference graph of the block from the edges found.
+
+        :return: The graph, with every variable as a node and nothing colored yet.
+        :rtype: InterferenceGraph
+        """
+        graph = InterferenceGraph()
+        graph.symbols = self.symbols
+        graph.interference_graph = graph._new_graph(len(self.symbols))
+
+        for id in range(len(self.symbols)):
+            graph.interference_graph.add_node(id)
+            graph.colors[id] = None
+
+        graph.interference_graph.add_edges_from(self.edges())
+
+        return graph
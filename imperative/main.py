@@ -59,8 +59,11 @@ def ig_test(liveness: Liveness, instruction_buffer: InstructionBuffer):
 
     print(interference_graph)
 
-    interference_graph.color_graph(3)
+    spilled = interference_graph.color_graph(3)
     print(interference_graph)
+
+    if spilled:
+        print(f"Spilled: {sorted(spilled)}")
     
 
 liveness_test2()
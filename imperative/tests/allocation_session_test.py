@@ -0,0 +1,101 @@
+import io
+import random
+import unittest
+from input.scanner import Scanner
+from input.parser import Parser
+from input.instruction import Instruction
+from input.token import Token
+from intermediate.liveness import Liveness
+from intermediate.interference_graph import InterferenceGraph
+from intermediate.allocation_session import AllocationSession
+
+class TestAllocationSession(unittest.TestCase):
+
+    def _parse(self, input: str):
+        return Parser(Scanner(io.StringIO(input))).parse()
+
+    def _check(self, session: AllocationSession) -> None:
+        """
+            Compares the session against liveness and a graph built from scratch,
+            and checks that the coloring is still proper.
+        """
+        buffer = session.instruction_buffer
+        liveness = Liveness(buffer)
+        graph = InterferenceGraph()
+        graph.build_graph(liveness, buffer.get_occured_variables())
+
+        self.assertEqual([list(line.items()) for line in session.get_liveness()],
+                         [list(line.items()) for line in liveness.get_liveness()])
+
+        edges = {frozenset(edge) for edge in graph.edges()}
+        self.assertEqual({frozenset(edge) for edge in session.interference_graph.edges()}, edges)
+        self.assertEqual(set(session.get_colors()), set(graph.nodes()))
+
+        colors = session.get_colors()
+        for var1, var2 in edges:
+            if colors[var1] is not None:
+                self.assertNotEqual(colors[var1], colors[var2])
+
+    def test_edits(self):
+        buffer = self._parse("a = a + 1\nt1 = a * 2\nb = t1 / 3\nlive: a, b\n")
+        session = AllocationSession(buffer, 3)
+
+        session.insert(1, Instruction(2, Token("c", 0), Token("b", 1)))
+        self._check(session)
+
+        session.replace(2, Instruction(0, Token("t1", 0), Token("a", 1), Token("+", 3), Token("c", 1)))
+        self._check(session)
+
+        session.delete(0)
+        self._check(session)
+
+        session.set_live_objects(["b", "t1"])
+        self._check(session)
+
+        self.assertEqual([str(instruction) for instruction in buffer.list_instructions()], ["c = b", "t1 = a + c", "b = t1 / 3"])
+
+    def test_undeclared_live_object(self):
+        buffer = self._parse("a = 1\nlive: a\n")
+        session = AllocationSession(buffer, 2)
+
+        with self.assertRaises(ValueError):
+            session.set_live_objects(["b"])
+
+    def test_random_edits(self):
+        """
+            Applies a series of random edits, checking against a full rebuild after each one.
+        """
+        rng = random.Random(3649)
+        names = ["a", "b", "c", "d", "e", "f"]
+
+        def operand() -> Token:
+            return Token(rng.choice(names), 1) if rng.random() < 0.7 else Token(str(rng.randint(0, 9)), 2)
+
+        def instruction() -> Instruction:
+            # Some copies too, their edges are built differently
+            if rng.random() < 0.3:
+                return Instruction(2, Token(rng.choice(names), 0), operand())
+
+            return Instruction(0, Token(rng.choice(names), 0), operand(), Token("+", 3), operand())
+
+        buffer = self._parse("a = 1\nb = 2\nc = a + b\nd = c * a\nlive: d\n")
+        session = AllocationSession(buffer, 6)
+
+        for _ in range(60):
+            size = len(session.instructions)
+            edit = rng.random()
+
+            if edit < 0.4 or size < 2:
+                session.insert(rng.randint(0, size), instruction())
+            elif edit < 0.6:
+                session.delete(rng.randrange(size))
+            elif edit < 0.9:
+                session.replace(rng.randrange(size), instruction())
+            else:
+                declared = sorted({token.value for line in session.instructions for token in line.get_variables()})
+                session.set_live_objects(rng.sample(declared, min(2, len(declared))))
+
+            self._check(session)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
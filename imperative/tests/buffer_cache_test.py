@@ -0,0 +1,95 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from input.scanner import Scanner
+from input.parser import Parser
+from input.buffer_cache import BufferCache
+
+class TestBufferCache(unittest.TestCase):
+
+    input = "a = a + 1\nt1 = a * 2\nb = -t1\nc = 7\nlive: a, b\n"
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def _entries(self) -> list[str]:
+        return sorted(os.listdir(self.directory))
+
+    def _assert_same(self, received, expected) -> None:
+        self.assertEqual([str(i) for i in received.list_instructions()], [str(i) for i in expected.list_instructions()])
+        self.assertEqual(received.list_live_objects(), expected.list_live_objects())
+        self.assertEqual(received.get_occured_variables(), expected.get_occured_variables())
+
+        for expected_instruction, received_instruction in zip(expected.list_instructions(), received.list_instructions()):
+            for token in ("dest", "operand1", "operator", "operand2"):
+                expected_token = getattr(expected_instruction, token)
+                received_token = getattr(received_instruction, token)
+                self.assertEqual(None if expected_token is None else expected_token.type, None if received_token is None else received_token.type)
+
+    def test_round_trip(self):
+        cache = BufferCache(self.directory)
+        expected = Parser(Scanner(io.StringIO(self.input))).parse()
+
+        self.assertIsNone(cache.get(self.input))
+        self._assert_same(cache.parse(self.input), expected)
+        self.assertEqual(self._entries(), [cache.key(self.input) + ".ibuf"])
+
+        self._assert_same(cache.get(self.input), expected)
+        self.assertEqual(cache.get(self.input).get_symbol_table().names, expected.get_symbol_table().names)
+
+    def test_corrupt_entry(self):
+        """
+            Damaged or foreign entries are parsed again and rewritten.
+        """
+        cache = BufferCache(self.directory)
+        cache.parse(self.input)
+        path = os.path.join(self.directory, self._entries()[0])
+
+        with open(path, "rb") as file:
+            data = file.read()
+
+        for damaged in [data[:-3], data[:10], data[:-1] + bytes([data[-1] ^ 1]), b"IBUF" + bytes([BufferCache.version + 1]) + data[5:]]:
+            with open(path, "wb") as file:
+                file.write(damaged)
+
+            self.assertIsNone(cache.get(self.input))
+            self.assertFalse(os.path.exists(path))
+
+            self._assert_same(cache.parse(self.input), Parser(Scanner(io.StringIO(self.input))).parse())
+            self.assertIsNotNone(cache.get(self.input))
+
+    def test_eviction(self):
+        """
+            The least recently used entries go first once the cache is too big.
+        """
+        inputs = [f"a = {i}\nb = a + {i}\nlive: b\n" for i in range(3)]
+        cache = BufferCache(self.directory)
+
+        for time, input in enumerate(inputs):
+            cache.parse(input)
+            os.utime(os.path.join(self.directory, cache.key(input) + ".ibuf"), (time, time))
+
+        size = os.path.getsize(os.path.join(self.directory, self._entries()[0]))
+
+        # Using the first one makes the second the least recently used
+        cache.get(inputs[0])
+        cache.max_bytes = 3 * size
+        cache.parse("d = 1\nlive: d\n")
+
+        self.assertIsNotNone(cache.get(inputs[0]))
+        self.assertIsNone(cache.get(inputs[1]))
+        self.assertIsNotNone(cache.get(inputs[2]))
+
+    def test_invalid_input(self):
+        cache = BufferCache(self.directory)
+
+        with self.assertRaises(ValueError):
+            cache.parse("a = b c\n")
+
+        self.assertEqual(self._entries(), [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
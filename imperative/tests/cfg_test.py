@@ -0,0 +1,117 @@
+import io
+import unittest
+from input.scanner import Scanner
+from input.table_scanner import TableScanner
+from input.parser import Parser
+from input.fast_parser import FastParser
+from intermediate.liveness import Liveness
+from intermediate.global_liveness import GlobalLiveness
+
+LOOP = (
+    "block: entry\n"
+    "i = 0\n"
+    "s = 0\n"
+    "next: loop\n"
+    "block: loop\n"
+    "t = s + i\n"
+    "s = t\n"
+    "i = i + 1\n"
+    "next: loop, exit\n"
+    "block: exit\n"
+    "r = s * 2\n"
+    "live: r\n"
+)
+
+class TestControlFlowGraph(unittest.TestCase):
+
+    def _parse(self, input: str, parser_class=Parser, scanner_class=Scanner):
+        return parser_class(scanner_class(io.StringIO(input))).parse_cfg()
+
+    def test_parse_cfg(self):
+        for parser_class, scanner_class in [(Parser, Scanner), (Parser, TableScanner), (FastParser, TableScanner)]:
+            cfg = self._parse(LOOP, parser_class, scanner_class)
+
+            self.assertEqual(cfg.list_labels(), ["entry", "loop", "exit"])
+            self.assertEqual(cfg.get_entry(), "entry")
+            self.assertEqual(cfg.get_block("loop").list_successors(), ["loop", "exit"])
+            self.assertEqual(cfg.get_block("exit").list_live_objects(), ["r"])
+            self.assertEqual([str(instruction) for instruction in cfg.get_block("loop").list_instructions()], ["t = s + i", "s = t", "i = i + 1"])
+            self.assertEqual(cfg.get_block("loop").get_occured_variables(), {"t", "s", "i"})
+            self.assertEqual(str(cfg), LOOP)
+
+            # Every block shares the same IDs
+            self.assertIs(cfg.get_block("entry").get_symbol_table(), cfg.get_block("exit").get_symbol_table())
+
+    def test_reverse_postorder(self):
+        cfg = self._parse("block: a\nnext: c, b\nblock: b\nnext: d\nblock: c\nnext: d\nblock: d\nnext: a\nblock: dead\nnext: d\n")
+
+        order = cfg.reverse_postorder()
+        self.assertEqual(order[0], "a")
+        self.assertLess(order.index("b"), order.index("d"))
+        self.assertLess(order.index("c"), order.index("d"))
+        self.assertEqual(order[-1], "dead")
+
+    def test_invalid(self):
+        invalid = [
+            "a = 1\nblock: entry\n", # Instruction before any block
+            "block: entry\nnext: entry\na = 1\n", # Instruction after 'next:'
+            "block: entry\nnext: nowhere\n", # Undefined successor
+            "block: entry\nblock: entry\n", # Defined twice
+            "block: a, b\n", # Two labels
+            "block: entry\na = 1\nlive: b\n" # Undeclared live object
+        ]
+
+        for input in invalid:
+            with self.assertRaises(ValueError, msg=input):
+                self._parse(input)
+
+        # Labels only mean something in a control flow graph
+        with self.assertRaises(ValueError):
+            Parser(Scanner(io.StringIO("block: entry\na = 1\nlive: a\n"))).parse()
+
+    def test_global_liveness(self):
+        cfg = self._parse(LOOP)
+        liveness = GlobalLiveness(cfg)
+
+        self.assertEqual(liveness.get_live_in("entry"), [])
+        self.assertEqual(set(liveness.get_live_out("entry")), {"i", "s"})
+        self.assertEqual(set(liveness.get_live_in("loop")), {"i", "s"})
+        self.assertEqual(set(liveness.get_live_out("loop")), {"i", "s"})
+        self.assertEqual(liveness.get_live_in("exit"), ["s"])
+        self.assertEqual(liveness.get_live_out("exit"), ["r"])
+
+        # Line-by-line liveness of a block starts from its solved live-out set
+        self.assertEqual(liveness.block_liveness("loop").get_liveness()[-1], {"i": 1, "s": 1})
+
+    def test_single_block(self):
+        """
+        Tests that a single block gives the same liveness as parsing it on its own.
+        """
+        block = "a = a + 1\nt1 = a * 2\nb = t1 / 3\nlive: a, b\n"
+        cfg = self._parse("block: entry\n" + block)
+        liveness = GlobalLiveness(cfg)
+
+        expected = Liveness(Parser(Scanner(io.StringIO(block))).parse())
+        self.assertEqual(liveness.block_liveness("entry").get_liveness(), expected.get_liveness())
+        self.assertEqual(liveness.get_live_in("entry"), ["a"])
+
+    def test_convergence(self):
+        """
+        Tests that a long chain of nested loops converges in a few passes over the blocks.
+        """
+        blocks = 2000
+        input = ""
+        for i in range(blocks):
+            successors = f"b{i + 1}" if i + 1 < blocks else "end"
+            if i % 10 == 9:
+                successors += f", b{i - 9}" # Back edge
+            input += f"block: b{i}\nv{i} = v{i} + x\nnext: {successors}\n"
+        input += "block: end\ny = x\nlive: y\n"
+
+        liveness = GlobalLiveness(self._parse(input))
+
+        self.assertLessEqual(liveness.evaluations, 3 * (blocks + 1))
+        self.assertEqual(set(liveness.get_live_in("b0")), {"x"} | {f"v{i}" for i in range(blocks)})
+
+if __name__ == '__main__':
+    unittest.main()
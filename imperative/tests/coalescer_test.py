@@ -0,0 +1,91 @@
+import random
+import unittest
+from intermediate.liveness import Liveness
+from intermediate.interference_graph import InterferenceGraph
+from intermediate.coalescer import Coalescer
+from tests.random_blocks import assert_proper_coloring, names, parse, random_block
+
+class TestCoalescer(unittest.TestCase):
+
+    def _coalescer(self, input: str) -> tuple[Coalescer, InterferenceGraph]:
+        """
+            Builds the graph of the block twice, one for the coalescer and one to check against.
+        """
+        buffer = parse(input)
+        graphs = []
+
+        for _ in range(2):
+            graph = InterferenceGraph()
+            graph.build_graph(Liveness(buffer), buffer.get_occured_variables())
+            graphs.append(graph)
+
+        return Coalescer(graphs[0], buffer), graphs[1]
+
+    def _assert_proper(self, coalescer: Coalescer, graph: InterferenceGraph, n: int) -> set[str]:
+        spilled = coalescer.color_graph(n)
+        colors = coalescer.get_colors()
+
+        self.assertEqual(set(colors), set(graph.nodes()))
+        assert_proper_coloring(self, graph, colors, spilled, n)
+
+        return spilled
+
+    def test_chain(self):
+        """
+            Tests that a chain of copies ends up in one register.
+        """
+        coalescer, graph = self._coalescer("a = 1\nb = a\nc = b\nd = c + 1\nlive: d\n")
+
+        self.assertEqual(coalescer.coalesce(1), 2)
+        self.assertEqual(len(set(coalescer.get_aliases().values())), 1)
+        self.assertEqual(len(coalescer.get_aliases()), 2)
+        self.assertEqual(self._assert_proper(coalescer, graph, 1), set())
+        self.assertEqual(coalescer.eliminated_moves(), 2)
+
+    def test_interfering(self):
+        """
+            Tests that a copy whose variables interfere is left alone.
+        """
+        coalescer, graph = self._coalescer("a = 1\nb = a\na = 2\nc = a + b\nlive: c\n")
+
+        self.assertTrue(graph.has_edge("a", "b"))
+        self.assertEqual(coalescer.coalesce(3), 0)
+        self.assertEqual(self._assert_proper(coalescer, graph, 3), set())
+        self.assertEqual(coalescer.eliminated_moves(), 0)
+
+    def test_conservative(self):
+        """
+            Tests that a merge that could make the graph harder to color is refused, and that coloring is still biased towards it.
+        """
+        coalescer, graph = self._coalescer("p = 1\nc = 2\nq = p + c\nd = c\ns = 3\nr = d + q\nt = r + s\nlive: t\n")
+
+        self.assertEqual(coalescer.coalesce(1), 0)
+        self.assertEqual(coalescer.get_aliases(), {})
+        self.assertEqual(self._assert_proper(coalescer, graph, 3), set())
+        self.assertEqual(coalescer.get_colors()["c"], coalescer.get_colors()["d"])
+        self.assertEqual(coalescer.eliminated_moves(), 1)
+
+    def test_random_blocks(self):
+        rng = random.Random(25)
+
+        for _ in range(40):
+            block = random_block(rng, rng.randint(1, 40), frequencies=True)
+
+            for n in range(1, 5):
+                coalescer, graph = self._coalescer(block)
+                coalesced = coalescer.coalesce(n)
+                self._assert_proper(coalescer, graph, n)
+
+                self.assertGreaterEqual(coalescer.eliminated_moves(), coalesced)
+
+            # With enough colors every non-interfering copy is merged
+            coalescer, graph = self._coalescer(block)
+            coalescer.coalesce(len(names))
+
+            self.assertEqual(self._assert_proper(coalescer, graph, len(names)), set())
+            for dest, source in coalescer.moves:
+                node1, node2 = coalescer._find(dest), coalescer._find(source)
+                self.assertTrue(node1 == node2 or coalescer.interference_graph.interference_graph.has_edge(node1, node2))
+
+if __name__ == '__main__':
+    unittest.main()
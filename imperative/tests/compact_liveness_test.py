@@ -0,0 +1,42 @@
+import random
+import unittest
+from intermediate.compact_liveness import CompactLiveness
+from tests.random_blocks import assert_same_liveness, parse, random_block, sample_block
+
+class TestCompactLiveness(unittest.TestCase):
+
+    def test_same_as_liveness(self):
+        buffer = parse(sample_block)
+        assert_same_liveness(self, buffer, CompactLiveness(buffer))
+
+    def test_random_blocks(self):
+        rng = random.Random(12)
+
+        for lines in [1, 5, 63, 64, 65, 300]:
+            buffer = parse(random_block(rng, lines))
+            assert_same_liveness(self, buffer, CompactLiveness(buffer))
+
+    def test_memory_budget(self):
+        """
+        Checks that the checkpoints thin out to stay within a tiny budget, without changing any answers.
+        """
+        buffer = parse(random_block(random.Random(3), 2000))
+        compact = CompactLiveness(buffer, memory_budget=2048)
+
+        self.assertGreater(compact.interval, 64)
+        self.assertLessEqual(compact.checkpoint_bytes, 2048)
+        self.assertEqual(compact.checkpoint_lines, sorted(compact.checkpoints))
+        assert_same_liveness(self, buffer, compact)
+
+    def test_bitmasks(self):
+        buffer = parse(sample_block)
+        compact = CompactLiveness(buffer)
+        a, t1, b = (compact.symbols.get_id(name) for name in ["a", "t1", "b"])
+
+        self.assertEqual(compact.live_in(0), 1 << a)
+        self.assertEqual(compact.live_out(0), 1 << a)
+        self.assertEqual(compact.live_out(1), (1 << a) | (1 << t1))
+        self.assertEqual(compact.live_in(3), (1 << a) | (1 << b))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,13 @@
 import io
+import random
 import unittest
+from importlib.util import find_spec
+from itertools import combinations
 from input.scanner import Scanner
 from input.parser import Parser
 from intermediate.liveness import Liveness
 from intermediate.interference_graph import InterferenceGraph
+from intermediate.graph import Graph, BitMatrixStorage, AdjacencySetStorage
 
 class TestGraph(unittest.TestCase):
 
@@ -26,6 +30,30 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(exit_block.get('a'), 1)
         self.assertEqual(exit_block.get('b'), 1)
 
+        # Neither the analysis nor the graph needs the columnar copy of the instructions
+        InterferenceGraph().build_graph(liveness, buffer.get_occured_variables())
+        self.assertIsNone(buffer.columns)
+
+    def test_intervals(self):
+        """
+        Tests that live ranges run from the defining line to the last line reading the variable.
+        """
+        input = "b = a + 1\nd = b * 2\ne = 4 - d\nb = e\nc = 5\nf = b - 1\nlive: c, e\n"
+        buffer = Parser(Scanner(io.StringIO(input))).parse()
+
+        liveness = Liveness(buffer)
+        intervals = liveness.intervals()
+
+        self.assertEqual(intervals['a'], [(0, 0)])
+        self.assertEqual(intervals['b'], [(0, 1), (3, 5)])
+        self.assertEqual(intervals['e'], [(2, 6)])
+        self.assertEqual(intervals['f'], [(5, 5)]) # Defined, never used
+
+        # Every variable covers exactly the lines it shows up on
+        for var, ranges in intervals.items():
+            covered = [i for i, line in enumerate(liveness.get_liveness()) if var in line]
+            self.assertEqual([i for start, end in ranges for i in range(start, end + 1)], covered)
+
     def test_build_graph(self):
         """
         Tests if the interference graph correctly extracts and adds all unique 
@@ -42,7 +70,7 @@ class TestGraph(unittest.TestCase):
         interferencegraph = InterferenceGraph()
         interferencegraph.build_graph(liveness, buffer.get_occured_variables())
 
-        nodes = list(interferencegraph.interference_graph.nodes())
+        nodes = interferencegraph.nodes()
         
         self.assertIn('a', nodes)
         self.assertIn('b', nodes)
@@ -70,6 +98,129 @@ class TestGraph(unittest.TestCase):
         for node in interferencegraph.interference_graph.nodes():
             self.assertIsNotNone(interferencegraph.colors[node], f"Node {node} was not colored.")
 
+    def _graph(self, edges: list[tuple[str, str]]) -> InterferenceGraph:
+        graph = InterferenceGraph()
+        for var1, var2 in edges:
+            graph.interference_graph.add_edge(graph.symbols.add(var1), graph.symbols.add(var2))
+
+        for node in graph.interference_graph.nodes():
+            graph.colors[node] = None
+
+        return graph
+
+    def _assert_proper(self, graph: InterferenceGraph, n: int, spilled: set[str]) -> None:
+        colors = graph.get_colors()
+
+        for var, color in colors.items():
+            self.assertEqual(color is None, var in spilled)
+            self.assertTrue(color is None or 0 <= color < n)
+
+        for var1, var2 in graph.edges():
+            self.assertFalse(colors[var1] is not None and colors[var1] == colors[var2])
+
+    def test_briggs_spills(self):
+        """
+        Tests that Chaitin-Briggs coloring returns what didn't fit instead of failing.
+        """
+        clique = self._graph([(var1, var2) for var1, var2 in combinations("abcd", 2)])
+        spilled = clique.color_graph(3)
+
+        self.assertEqual(len(spilled), 1)
+        self._assert_proper(clique, 3, spilled)
+
+        # Every node of a 4-cycle has 2 neighbors, the optimistic candidate still gets a color
+        cycle = self._graph([("a", "b"), ("b", "c"), ("c", "d"), ("d", "a")])
+        self.assertEqual(cycle.color_graph(2), set())
+        self._assert_proper(cycle, 2, set())
+
+        self.assertEqual(cycle.color_graph(2, "backtracking"), set())
+        self.assertEqual(cycle.color_graph(1, "backtracking"), {"a", "b", "c", "d"})
+        self.assertRaises(ValueError, cycle.color_graph, 2, "greedy")
+
+    def test_briggs_large(self):
+        """
+        Tests that a graph far too big for backtracking is colored without recursion.
+        """
+        rng = random.Random(20)
+        graph = self._graph([(f"v{rng.randrange(3000)}", f"v{rng.randrange(3000)}") for _ in range(20000)])
+
+        for n in [4, 8, 16]:
+            self._assert_proper(graph, n, graph.color_graph(n))
+
+    def test_dsatur(self):
+        """
+        Tests that the search finds the chromatic number, and says so, on small graphs.
+        """
+        rng = random.Random(21)
+
+        for _ in range(30):
+            names = [f"v{i}" for i in range(rng.randint(1, 9))]
+            graph = self._graph([(var1, var2) for var1, var2 in combinations(names, 2) if rng.random() < 0.5])
+            if len(graph.interference_graph) == 0:
+                continue
+
+            self._assert_proper(graph, len(names), graph.color_graph(len(names), "dsatur"))
+
+            chromatic = next(n for n in range(1, len(names) + 1) if not graph.color_graph(n, "backtracking"))
+            count, optimal = graph.color_graph_minimum()
+
+            self.assertEqual(count, chromatic)
+            self.assertTrue(optimal)
+            self._assert_proper(graph, count, set())
+
+    def test_dsatur_budget(self):
+        """
+        Tests that a search cut short still leaves a full coloring, just not a proven one.
+        """
+        rng = random.Random(21)
+        graph = self._graph([(f"v{rng.randrange(200)}", f"v{rng.randrange(200)}") for _ in range(4000)])
+
+        count, optimal = graph.color_graph_minimum(node_budget=1000)
+
+        self.assertFalse(optimal)
+        self._assert_proper(graph, count, set())
+
+        # The largest clique of an odd cycle is an edge, so the search itself has to rule out 2 colors
+        cycle = self._graph([("a", "b"), ("b", "c"), ("c", "d"), ("d", "e"), ("e", "a")])
+        self.assertEqual(cycle.color_graph_minimum(time_budget=10), (3, True))
+
+    def test_register_sweep(self):
+        """
+        Tests that the sweep finds the minimum and that what's left after each spill set fits.
+        """
+        input = "b = a + 1\nd = b * 2\ne = 4 - d\nb = e\nc = 5\nf = b - 1\nlive: c, e\n"
+        buffer = Parser(Scanner(io.StringIO(input))).parse()
+        liveness = Liveness(buffer)
+
+        self.assertEqual(liveness.max_live(), 3)
+
+        interferencegraph = InterferenceGraph()
+        interferencegraph.build_graph(liveness, buffer.get_occured_variables())
+        registers, optimal, spills = interferencegraph.register_sweep(liveness)
+
+        # b = e is a copy, so max-live doesn't count and the clique has to prove it
+        self.assertEqual((registers, optimal), (3, True))
+        self.assertEqual(list(spills), [1, 2, 3])
+        self.assertEqual(spills[3], set())
+        self._assert_proper(interferencegraph, 3, set())
+
+        rng = random.Random(22)
+        for _ in range(20):
+            names = [f"v{i}" for i in range(rng.randint(2, 9))]
+            graph = self._graph([(var1, var2) for var1, var2 in combinations(names, 2) if rng.random() < 0.6])
+            if len(graph.interference_graph) == 0:
+                continue
+
+            registers, optimal, spills = graph.register_sweep()
+            self.assertTrue(optimal)
+            self.assertEqual(registers, next(n for n in range(1, len(names) + 1) if not graph.color_graph(n, "backtracking")))
+
+            for k in range(1, registers):
+                self.assertLessEqual(spills[k + 1], spills[k])
+
+                rest = self._graph([edge for edge in graph.edges() if not set(edge) & spills[k]])
+                self.assertEqual(rest.color_graph(k, "backtracking"), set())
+
     def test_edges(self):
         """
         Tests if the graph correctly draws edges between conflicting variables.
@@ -85,10 +236,10 @@ class TestGraph(unittest.TestCase):
         interferencegraph.build_graph(liveness, buffer.get_occured_variables())
 
         # 'a' and 'b' are both live at the end, so they must interfere (have an edge)
-        self.assertTrue(interferencegraph.interference_graph.has_edge('a', 'b'))
+        self.assertTrue(interferencegraph.has_edge('a', 'b'))
 
         # 'a' and 't1' are live at the same time, so they must interfere
-        self.assertTrue(interferencegraph.interference_graph.has_edge('a', 't1'))
+        self.assertTrue(interferencegraph.has_edge('a', 't1'))
 
     def test_independent_variables(self):
         """
@@ -106,7 +257,83 @@ class TestGraph(unittest.TestCase):
         interferencegraph.build_graph(liveness, buffer.get_occured_variables())
         
         # There should be NO edge between x and y
-        self.assertFalse(interferencegraph.interference_graph.has_edge('x', 'y'))
+        self.assertFalse(interferencegraph.has_edge('x', 'y'))
+
+    def test_copies(self):
+        """
+        Tests that a copy doesn't interfere with the variable it copies, so the two can share a register.
+        """
+        input = "a = 1\nb = a\nc = a + b\nd = c * 2\ne = d\nf = d + 1\nlive: e, f\n"
+        buffer = Parser(Scanner(io.StringIO(input))).parse()
+
+        interferencegraph = InterferenceGraph()
+        interferencegraph.build_graph(Liveness(buffer), buffer.get_occured_variables())
+
+        # a is still live after 'b = a', but b only holds a copy of it
+        self.assertFalse(interferencegraph.has_edge('a', 'b'))
+        self.assertFalse(interferencegraph.has_edge('d', 'e'))
+
+        # f is defined while e is still live
+        self.assertTrue(interferencegraph.has_edge('e', 'f'))
+
+    def test_live_on_entry(self):
+        """
+        Tests that variables live coming into the block interfere with each other, even though nothing defines them.
+        """
+        input = "c = a + b\nlive: c\n"
+        buffer = Parser(Scanner(io.StringIO(input))).parse()
+
+        interferencegraph = InterferenceGraph()
+        interferencegraph.build_graph(Liveness(buffer), buffer.get_occured_variables())
+
+        self.assertTrue(interferencegraph.has_edge('a', 'b'))
+        self.assertFalse(interferencegraph.has_edge('a', 'c'))
+
+class TestNativeGraph(unittest.TestCase):
+
+    def test_storages(self):
+        """
+        Tests that both storages answer every query the same way.
+        """
+        for storage in [BitMatrixStorage(), AdjacencySetStorage()]:
+            graph = Graph(storage)
+            graph.add_nodes_from([3, 0, 70])
+            graph.add_edges_from([(0, 3), (3, 70), (70, 5), (5, 5)])
+
+            self.assertEqual(graph.nodes(), [3, 0, 70, 5])
+            self.assertTrue(graph.interferes(3, 0) and graph.interferes(0, 3))
+            self.assertFalse(graph.has_edge(0, 70))
+            self.assertFalse(graph.has_edge(5, 5)) # Self loops are ignored
+            self.assertFalse(graph.has_edge(9, 0))
+            self.assertEqual(graph.degree(3), 2)
+            self.assertEqual(sorted(graph.neighbors(70)), [3, 5])
+            self.assertEqual({frozenset(edge) for edge in graph.edges()}, {frozenset((0, 3)), frozenset((3, 70)), frozenset((70, 5))})
+            self.assertEqual(graph.number_of_edges(), 3)
+
+            graph.remove_edge(3, 0)
+            self.assertFalse(graph.has_edge(0, 3))
+
+            # Missing edges and nodes are ignored
+            graph.remove_edge(3, 0)
+            graph.remove_edge(3, 9)
+            graph.remove_edge(9, 3)
+            self.assertEqual(graph.number_of_edges(), 2)
+
+            graph.remove_node(70)
+            self.assertEqual(graph.nodes(), [3, 0, 5])
+            self.assertEqual(graph.degree(3), 0)
+            self.assertEqual(graph.degree(5), 0)
+
+    @unittest.skipUnless(find_spec("networkx"), "networkx is only needed for to_networkx()")
+    def test_to_networkx(self):
+        graph = Graph(BitMatrixStorage())
+        graph.add_edges_from([(0, 1), (1, 2)])
+
+        exported = graph.to_networkx()
+
+        self.assertEqual(sorted(exported.nodes()), [0, 1, 2])
+        self.assertTrue(exported.has_edge(1, 2))
+        self.assertEqual(exported.number_of_edges(), 2)
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
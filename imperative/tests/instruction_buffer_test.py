@@ -115,5 +115,69 @@ class TestInstructionBuffer(unittest.TestCase):
         self.assertEqual(li_list[1], "b")
         self.assertEqual(li_list[2], "c")
 
+    def _buffer(self) -> InstructionBuffer:
+        ib: InstructionBuffer = InstructionBuffer()
+        ib.add_instruction(Instruction(0, Token("a", 0), Token("a", 1), Token("+", 3), Token("1", 2)))
+        ib.add_instruction(Instruction(1, Token("b", 0), None, Token("-", 3), Token("a", 1)))
+        ib.add_instruction(Instruction(2, Token("c", 0), Token("b", 1)))
+
+        return ib
+
+    def test_get_columns(self):
+        ib: InstructionBuffer = self._buffer()
+        columns = ib.get_columns()
+
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(list(columns.opcode), [0, 1, 2])
+        self.assertEqual([columns.symbols.get_name(code) for code in columns.dest], ["a", "b", "c"])
+        self.assertEqual([columns.operand(code) for code in columns.src1 if code != -1], ["a", "b"])
+        self.assertEqual([columns.operand(code) for code in columns.src2 if code != -1], ["1", "a"])
+        self.assertEqual([columns.variables(i) for i in range(3)], [[0, 0], [1, 0], [2, 1]])
+
+        for i, instruction in enumerate(ib.list_instructions()):
+            self.assertEqual(str(columns.instruction(i)), str(instruction))
+
+    def test_columns_follow_edits(self):
+        ib: InstructionBuffer = self._buffer()
+        columns = ib.get_columns()
+
+        ib.add_instruction(Instruction(0, Token("d", 0), Token("c", 1), Token("*", 3), Token("2", 2)))
+        ib.insert_instruction(0, Instruction(2, Token("e", 0), Token("7", 2)))
+        ib.remove_instruction(2)
+        ib.replace_instruction(1, Instruction(0, Token("a", 0), Token("e", 1), Token("/", 3), Token("a", 1)))
+
+        self.assertIs(ib.get_columns(), columns)
+        self.assertEqual([str(columns.instruction(i)) for i in range(len(columns))],
+                         [str(instruction) for instruction in ib.list_instructions()])
+
+    def test_column_view_is_read_only(self):
+        view = self._buffer().get_columns().view("dest")
+
+        self.assertEqual(view.tolist(), [0, 1, 2])
+        with self.assertRaises(TypeError):
+            view[0] = 1
+
+    def test_iter_instructions(self):
+        ib: InstructionBuffer = self._buffer()
+
+        self.assertEqual(list(ib.iter_instructions()), ib.list_instructions())
+        self.assertEqual(list(ib.iter_instructions(reverse=True)), ib.list_instructions()[::-1])
+
+    def test_iter_variable_ids(self):
+        """
+            Tests that the IDs are the same whether or not the columns were made, and that they aren't made for this.
+        """
+        ib: InstructionBuffer = self._buffer()
+        expected = [(0, 0, 0, -1), (1, 1, -1, 0), (2, 2, 1, -1)]
+
+        self.assertEqual(list(ib.iter_variable_ids()), expected)
+        self.assertEqual(list(ib.iter_variable_ids(reverse=True)), expected[::-1])
+        self.assertIsNone(ib.columns)
+
+        ib.get_columns()
+
+        self.assertEqual(list(ib.iter_variable_ids()), expected)
+        self.assertEqual(list(ib.iter_variable_ids(reverse=True)), expected[::-1])
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import random
+import unittest
+from intermediate.liveness import Liveness
+from intermediate.interference_graph import InterferenceGraph
+from intermediate.interference_matrix import InterferenceMatrix
+from tests.random_blocks import parse, random_block
+
+class TestInterferenceMatrix(unittest.TestCase):
+
+    def _assert_same(self, buffer) -> None:
+        """
+            Compares the matrix path against build_graph() on the same liveness.
+        """
+        liveness = Liveness(buffer)
+        expected = InterferenceGraph()
+        expected.matrix_limit = 0 # One instruction at a time
+        expected.build_graph(liveness, buffer.get_occured_variables())
+        received = InterferenceGraph()
+        received.build_graph_matrix(liveness, buffer.get_occured_variables())
+
+        self.assertEqual({frozenset(edge) for edge in received.edges()}, {frozenset(edge) for edge in expected.edges()})
+        self.assertEqual(set(received.nodes()), set(expected.nodes()))
+
+        # Small enough that build_graph() takes the matrix path itself
+        default = InterferenceGraph()
+        default.build_graph(liveness, buffer.get_occured_variables())
+        self.assertEqual({frozenset(edge) for edge in default.edges()}, {frozenset(edge) for edge in expected.edges()})
+
+        matrix = InterferenceMatrix(liveness)
+        for node in expected.interference_graph.nodes():
+            self.assertEqual(matrix.degrees()[node], expected.interference_graph.degree(node))
+
+        # The states are derived from the instructions, they must match the ones Liveness found
+        for i, line in enumerate(liveness.iter_liveness_ids()):
+            self.assertEqual({var: int(state) for var, state in enumerate(matrix.states[i]) if state != matrix.absent}, line)
+
+        # Reading the columns gives the same result as reading the instructions
+        buffer.get_columns()
+        self.assertTrue((InterferenceMatrix(liveness).matrix == matrix.matrix).all())
+
+    def test_same_as_build_graph(self):
+        self._assert_same(parse("a = a + 1\nt1 = a * 2\nb = t1 / 3\nlive: a, b\n"))
+        self._assert_same(parse("a = 1\nb = a\nc = a + b\nd = c * 2\ne = d\nf = d + 1\nlive: e, f\n"))
+        self._assert_same(parse("c = a + b\nlive: c\n"))
+        self._assert_same(parse("b = -b\nb = a\nlive: b\n"))
+
+    def test_random_blocks(self):
+        rng = random.Random(19)
+
+        for _ in range(30):
+            self._assert_same(parse(random_block(rng, rng.randint(1, 40))))
+
+    def test_pressure(self):
+        matrix = InterferenceMatrix(Liveness(parse("a = 1\nb = a + 1\nc = a + b\nlive: c\n")))
+        a, b, c = (matrix.symbols.get_id(name) for name in ["a", "b", "c"])
+
+        # a alone, then a and b, then c, then c at the end
+        self.assertEqual(matrix.pressure().tolist(), [1, 2, 1, 1])
+        self.assertEqual(matrix.peak_pressure()[[a, b, c]].tolist(), [2, 2, 1])
+        self.assertTrue(matrix.interferes(a, b))
+        self.assertFalse(matrix.interferes(a, c))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+from intermediate.liveness import Liveness
+from intermediate.interference_graph import InterferenceGraph
+from intermediate.linear_scan import LinearScan
+from tests.random_blocks import assert_proper_coloring, names, parse, random_block
+
+class TestLinearScan(unittest.TestCase):
+
+    def _assert_proper(self, buffer, n: int) -> set[str]:
+        """
+            Allocates with linear scan and checks the result against the interference graph.
+        """
+        liveness = Liveness(buffer)
+        graph = InterferenceGraph()
+        graph.build_graph(liveness, buffer.get_occured_variables())
+
+        scan = LinearScan(liveness)
+        spilled = scan.color_graph(n)
+        colors = scan.get_colors()
+
+        self.assertEqual(set(colors), set(graph.nodes()))
+        assert_proper_coloring(self, graph, colors, spilled, n)
+
+        return spilled
+
+    def test_reuse(self):
+        """
+        Tests that a register is handed over on the line its variable is last read.
+        """
+        buffer = parse("a = 1\nb = a + 1\nc = b * 2\nlive: c\n")
+
+        self.assertEqual(self._assert_proper(buffer, 1), set())
+
+    def test_spill_furthest(self):
+        """
+        Tests that the interval ending furthest away is the one spilled.
+        """
+        buffer = parse("a = 1\nb = 2\nc = b + 1\nd = a + c\nlive: d\n")
+
+        # a is live until the last instruction, b and c are gone by then
+        self.assertEqual(self._assert_proper(buffer, 1), {"a"})
+        self.assertEqual(self._assert_proper(buffer, 2), set())
+
+    def test_live_on_entry(self):
+        """
+        Tests that variables live coming into the block never share a register.
+        """
+        buffer = parse("c = a + b\nlive: c\n")
+
+        self.assertEqual(len(self._assert_proper(buffer, 1)), 1)
+        self.assertEqual(self._assert_proper(buffer, 2), set())
+
+    def test_strategy(self):
+        """
+        Tests that InterferenceGraph.color_graph() gives the same allocation as the "linear" strategy.
+        """
+        buffer = parse("a = 1\nb = 2\nc = b + 1\nd = a + c\nlive: d\n")
+        liveness = Liveness(buffer)
+        graph = InterferenceGraph()
+        graph.build_graph(liveness, buffer.get_occured_variables())
+        scan = LinearScan(liveness)
+
+        for n in range(3):
+            self.assertEqual(graph.color_graph(n, "linear"), scan.color_graph(n))
+            self.assertEqual(graph.get_colors(), scan.get_colors())
+
+        with self.assertRaises(ValueError):
+            InterferenceGraph().color_graph(2, "linear")
+
+    def test_random_blocks(self):
+        rng = random.Random(23)
+
+        for _ in range(40):
+            buffer = parse(random_block(rng, rng.randint(1, 40)))
+
+            for n in range(0, 5):
+                self._assert_proper(buffer, n)
+
+            self.assertEqual(self._assert_proper(buffer, len(names)), set())
+
+if __name__ == '__main__':
+    unittest.main()
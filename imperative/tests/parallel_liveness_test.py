@@ -0,0 +1,24 @@
+import random
+import unittest
+from intermediate.parallel_liveness import ParallelLiveness
+from tests.random_blocks import assert_same_liveness, parse, random_block, sample_block
+
+class TestParallelLiveness(unittest.TestCase):
+
+    def _assert_same(self, buffer, segment_size: int) -> None:
+        assert_same_liveness(self, buffer, ParallelLiveness(buffer, workers=2, segment_size=segment_size))
+
+    def test_same_as_liveness(self):
+        self._assert_same(parse(sample_block), 1)
+
+    def test_random_blocks(self):
+        rng = random.Random(5)
+
+        for lines in [40, 200]:
+            buffer = parse(random_block(rng, lines, ["a", "b", "c", "d", "t1", "t2"]))
+
+            for segment_size in [1, 3, 17]:
+                self._assert_same(buffer, segment_size)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,16 @@
 import io
+import os
+import tempfile
 import unittest
 from input.scanner import Scanner
 from input.parser import Parser
 from input.instruction_buffer import InstructionBuffer
+from input.parallel_parser import ParallelParser
+from input.fast_parser import FastParser
 
 class TestParser(unittest.TestCase):
+    # Parser implementation under test, overridden by subclasses
+    parser_class = Parser
 
     def test_basic_assignment(self):
         """
@@ -13,7 +19,7 @@ class TestParser(unittest.TestCase):
         input = "a = 1\n"
         file = io.StringIO(input)
         scanner = Scanner(file)
-        parser = Parser(scanner)
+        parser = self.parser_class(scanner)
 
         buffer = parser.parse()
         instructions = buffer.list_instructions()
@@ -28,7 +34,7 @@ class TestParser(unittest.TestCase):
         input = "a = b + c\n"
         file = io.StringIO(input)
         scanner = Scanner(file)
-        parser = Parser(scanner)
+        parser = self.parser_class(scanner)
 
 
         buffer = parser.parse()
@@ -44,7 +50,7 @@ class TestParser(unittest.TestCase):
         input = "a = -b\n"
         file = io.StringIO(input)
         scanner = Scanner(file)
-        parser = Parser(scanner)
+        parser = self.parser_class(scanner)
 
         buffer = parser.parse()
         instructions = buffer.list_instructions()
@@ -59,7 +65,7 @@ class TestParser(unittest.TestCase):
         input = "a = +\n"
         file = io.StringIO(input)
         scanner = Scanner(file)
-        parser = Parser(scanner)
+        parser = self.parser_class(scanner)
 
         with self.assertRaises(ValueError):
             parser.parse()
@@ -72,7 +78,7 @@ class TestParser(unittest.TestCase):
         input = "a = 1\nb = a + 2\n"
         file = io.StringIO(input)
         scanner = Scanner(file)
-        parser = Parser(scanner)
+        parser = self.parser_class(scanner)
 
         buffer = parser.parse()
         instructions = buffer.list_instructions()
@@ -88,7 +94,7 @@ class TestParser(unittest.TestCase):
         input = "a = 1\nlive: a"
         file = io.StringIO(input)
         scanner = Scanner(file)
-        parser = Parser(scanner)
+        parser = self.parser_class(scanner)
 
         buffer = parser.parse()
         live_objects = buffer.list_live_objects()
@@ -96,5 +102,227 @@ class TestParser(unittest.TestCase):
         self.assertEqual(len(live_objects), 1)
         self.assertEqual(str(live_objects[0]), "a")
 
+    def test_streaming_input(self):
+        """
+            Tests that the parser only reads the input line by line, so
+            it works on streams that can't be read all at once (i.e. pipes).
+        """
+        class LineStream(io.StringIO):
+            def read(self, *args):
+                raise AssertionError("The input should only be read line by line")
+
+        file = LineStream("a = 1\nb = a * 2\nlive: b\n")
+        scanner = Scanner(file)
+        parser = self.parser_class(scanner)
+
+        buffer = parser.parse()
+
+        self.assertEqual([str(instruction) for instruction in buffer.list_instructions()], ["a = 1", "b = a * 2"])
+        self.assertEqual(buffer.list_live_objects(), ["b"])
+
+    def test_invalid_live_object(self):
+        """
+            Tests that live objects must be declared in the instructions.
+        """
+        input = "a = 1\nlive: a, b\n"
+        file = io.StringIO(input)
+        scanner = Scanner(file)
+        parser = self.parser_class(scanner)
+
+        with self.assertRaises(ValueError) as cm:
+            parser.parse()
+
+        self.assertEqual(str(cm.exception), "Live object 'b' has not been declared in previous instructions.")
+
+    def test_iter_blocks(self):
+        """
+            Tests that a stream of blocks is split on each block's 'live:' line.
+        """
+        input = "a = 1\nb = a + 1\nlive: b\nc = b\nlive:\nd = 3\nc = d * 2\nlive: c, d\ne = 4\n"
+        file = io.StringIO(input)
+        scanner = Scanner(file)
+        parser = self.parser_class(scanner)
+
+        blocks = list(parser.iter_blocks())
+
+        self.assertEqual(len(blocks), 4)
+        self.assertEqual([[str(i) for i in block.list_instructions()] for block in blocks],
+                         [["a = 1", "b = a + 1"], ["c = b"], ["d = 3", "c = d * 2"], ["e = 4"]])
+        self.assertEqual([block.list_live_objects() for block in blocks], [["b"], [], ["c", "d"], []])
+        self.assertEqual([block.get_occured_variables() for block in blocks], [{"a", "b"}, {"b", "c"}, {"c", "d"}, {"e"}])
+
+    def test_iter_blocks_blank_lines(self):
+        """
+            Tests that blank lines between blocks are skipped, not taken as the end of the stream.
+        """
+        input = "a = 1\nlive: a\n\nb = 2\nlive: b\n \t\n\nc = 3\n\nd = c\nlive: d\n\n"
+        parser = self.parser_class(Scanner(io.StringIO(input)))
+
+        blocks = list(parser.iter_blocks())
+
+        self.assertEqual([[str(i) for i in block.list_instructions()] for block in blocks], [["a = 1"], ["b = 2"], ["c = 3", "d = c"]])
+        self.assertEqual([block.list_live_objects() for block in blocks], [["a"], ["b"], ["d"]])
+
+    def test_iter_blocks_restores_scanner(self):
+        """
+            Tests that a scanner read on after iter_blocks() takes a blank line as the end of the input again.
+        """
+        input = "a = 1\nlive: a\nb = 2\nc = b\nlive: c\n\nd = 3\n"
+        scanner = Scanner(io.StringIO(input))
+        blocks = self.parser_class(scanner).iter_blocks()
+
+        self.assertEqual(next(blocks).list_live_objects(), ["a"])
+        blocks.close()
+
+        self.assertFalse(scanner.skip_blank_lines)
+
+        buffer = self.parser_class(scanner).parse()
+
+        self.assertEqual([str(i) for i in buffer.list_instructions()], ["b = 2", "c = b"])
+        self.assertEqual(buffer.list_live_objects(), ["c"])
+
+    def test_iter_blocks_undeclared_live(self):
+        """
+            Tests that a block's live objects must be declared in that same block.
+        """
+        input = "a = 1\nlive: a\nb = 2\nlive: a\n"
+        file = io.StringIO(input)
+        scanner = Scanner(file)
+        parser = self.parser_class(scanner)
+
+        blocks = parser.iter_blocks()
+        next(blocks)
+
+        with self.assertRaises(ValueError):
+            next(blocks)
+
+    def test_symbol_table(self):
+        """
+            Variables get dense IDs in the order they first occur, separately for each block.
+        """
+        input = "t1 = a + 1\nb = t1\na = b * 2\nlive: a\nc = 1\nlive: c\n"
+        scanner = Scanner(io.StringIO(input))
+        parser = self.parser_class(scanner)
+
+        blocks = list(parser.iter_blocks())
+
+        self.assertEqual(blocks[0].get_symbol_table().names, ["t1", "a", "b"])
+        self.assertEqual(blocks[0].get_symbol_table().get_id("b"), 2)
+        self.assertEqual(blocks[1].get_symbol_table().names, ["c"])
+
+    def test_frequency(self):
+        """
+            A 'freq:' line sets how often the instructions after it run, until the next one or the end of the block.
+        """
+        input = "a = 1\nfreq: 10\nb = a + 1\nc = -b\nfreq: 3\nd = c\nlive: d\ne = 1\nlive: e\n"
+        parser = self.parser_class(Scanner(io.StringIO(input)))
+
+        blocks = list(parser.iter_blocks())
+
+        self.assertEqual([i.frequency for i in blocks[0].list_instructions()], [1, 10, 10, 3])
+        self.assertEqual([i.frequency for i in blocks[1].list_instructions()], [1])
+        self.assertEqual(str(blocks[0]), "a = 1\nfreq: 10\nb = a + 1\nc = -b\nfreq: 3\nd = c\nlive: d, ")
+
+    def test_invalid_frequency(self):
+        for input in ["freq: a\nb = 1\n", "freq: 1, 2\nb = 1\n", "freq:\nb = 1\n", "freq: 4294967296\nb = 1\n"]:
+            with self.assertRaises(ValueError):
+                self.parser_class(Scanner(io.StringIO(input))).parse()
+
+class TestFastParser(TestParser):
+    """
+        Runs the parser tests against the fast-path parser.
+    """
+    parser_class = FastParser
+
+    def test_same_result(self):
+        """
+            Lines that don't match the fast path must give the same result as Parser.
+        """
+        input = "a = a + 1\n  t1=a*4\nt2 = t1, + 1\nt3 = -a\nb\t= t2\nc = 07\nlive: a, t2,\n c\n"
+        expected = Parser(Scanner(io.StringIO(input))).parse()
+        received = FastParser(Scanner(io.StringIO(input))).parse()
+
+        self.assertEqual([str(i) for i in received.list_instructions()], [str(i) for i in expected.list_instructions()])
+        self.assertEqual(received.list_live_objects(), expected.list_live_objects())
+        self.assertEqual(received.get_occured_variables(), expected.get_occured_variables())
+
+        for expected_instruction, received_instruction in zip(expected.list_instructions(), received.list_instructions()):
+            for token in ("dest", "operand1", "operator", "operand2"):
+                expected_token = getattr(expected_instruction, token)
+                received_token = getattr(received_instruction, token)
+                self.assertEqual(None if expected_token is None else expected_token.type, None if received_token is None else received_token.type)
+
+    def test_same_errors(self):
+        for input in ["a = b c\n", "a = 1b\n", "a = b $ c\n", "a = 1\nlive: b\n"]:
+            with self.assertRaises(ValueError) as expected:
+                Parser(Scanner(io.StringIO(input))).parse()
+
+            with self.assertRaises(ValueError) as received:
+                FastParser(Scanner(io.StringIO(input))).parse()
+
+            self.assertEqual(str(received.exception), str(expected.exception))
+
+class TestParallelParser(unittest.TestCase):
+
+    def _write(self, input: str) -> str:
+        """
+            Writes the input to a temporary file, returning its path.
+        """
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, "w") as file:
+            file.write(input)
+
+        self.addCleanup(os.remove, path)
+
+        return path
+
+    def _compare(self, input: str) -> None:
+        """
+            Parses the input with tiny chunks and compares against the sequential parser.
+        """
+        expected = Parser(Scanner(io.StringIO(input))).parse()
+        received = ParallelParser(self._write(input), workers=2, chunk_size=16).parse()
+
+        self.assertEqual([str(i) for i in received.list_instructions()], [str(i) for i in expected.list_instructions()])
+        self.assertEqual(received.list_live_objects(), expected.list_live_objects())
+        self.assertEqual(received.get_occured_variables(), expected.get_occured_variables())
+        self.assertEqual(received.get_symbol_table().names, expected.get_symbol_table().names)
+
+    def test_same_result(self):
+        self._compare("".join(f"t{i} = a + {i}\nb = -t{i}\na = b\n" for i in range(50)) + "live: a,\n b\n")
+
+    def test_live_in_middle(self):
+        """
+            The live section can be followed by more lines, which are live symbols too.
+        """
+        self._compare("a = 1\nb = a * 2\nlive: a\nb\n" + "a, b\n" * 10)
+
+    def test_blank_line(self):
+        """
+            A blank line ends the input, even if more lines follow.
+        """
+        self._compare("a = 1\nb = a * 2\n\n" + "c = a $ b\n" * 10)
+
+    def test_frequency(self):
+        """
+            A frequency set in one chunk carries over to the lines of the next ones.
+        """
+        input = "freq: 5\n" + "".join(f"t{i} = a + {i}\n" for i in range(20)) + "freq: 2\n" + "b = 1\n" * 20 + "live: b\n"
+        expected = Parser(Scanner(io.StringIO(input))).parse()
+        received = ParallelParser(self._write(input), workers=2, chunk_size=16).parse()
+
+        self.assertEqual([i.frequency for i in received.list_instructions()], [i.frequency for i in expected.list_instructions()])
+
+    def test_first_error(self):
+        """
+            Tests that the first invalid line in the file is the one reported.
+        """
+        input = "a = 1\n" * 20 + "b = +\n" + "c = 1\n" * 20 + "d = $\n"
+
+        with self.assertRaises(ValueError) as cm:
+            ParallelParser(self._write(input), workers=2, chunk_size=16).parse()
+
+        self.assertEqual(str(cm.exception), "Invalid instruction format. b = + \n")
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
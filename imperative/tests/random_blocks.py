@@ -0,0 +1,100 @@
+import io
+import random
+import unittest
+from input.instruction_buffer import InstructionBuffer
+from input.parser import Parser
+from input.scanner import Scanner
+from intermediate.liveness import Liveness
+
+# Small block every liveness engine is first checked on
+sample_block = "a = a + 1\nt1 = a * 2\nb = t1 / 3\nlive: a, b\n"
+
+# Few enough names that variables keep getting redefined and read again
+names = ["a", "b", "c", "d", "t1", "t2", "t3"]
+
+def random_block(rng: random.Random, lines: int, names: list[str] = names, frequencies: bool = False) -> str:
+    """
+        Makes up a block of random binary, unary and assignment instructions, ending with
+        the first destination live. Shared by the tests comparing an engine against another.
+
+        :param rng: The random number generator, seeded by the test.
+        :type rng: random.Random
+        :param lines: The number of instructions.
+        :type lines: int
+        :param names: The variable names to pick from.
+        :type names: list[str]
+        :param frequencies: Whether to also put 'freq:' lines in between.
+        :type frequencies: bool
+        :return: The block, as input text.
+        :rtype: str
+    """
+    block = ""
+    first = None
+
+    for _ in range(lines):
+        if frequencies and rng.randrange(4) == 0:
+            block += f"freq: {rng.randint(1, 9)}\n"
+
+        dest = rng.choice(names)
+        first = first or dest
+
+        match rng.randrange(3):
+            case 0:
+                block += f"{dest} = {rng.choice(names)} {rng.choice('+-*/')} {rng.choice(names + ['1'])}\n"
+            case 1:
+                block += f"{dest} = -{rng.choice(names)}\n"
+            case 2:
+                block += f"{dest} = {rng.choice(names + ['2'])}\n"
+
+    return block + f"live: {first}\n"
+
+def parse(input: str) -> InstructionBuffer:
+    """
+        Parses a block with the plain Scanner and Parser, the reference the other engines are checked against.
+
+        :param input: The block, as input text.
+        :type input: str
+        :return: The parsed block.
+        :rtype: InstructionBuffer
+    """
+    return Parser(Scanner(io.StringIO(input))).parse()
+
+def assert_proper_coloring(test: unittest.TestCase, graph, colors: dict[str, int | None], spilled: set[str], n: int) -> None:
+    """
+        Checks that only the spilled variables are left without a color, that every color
+        is one of the n registers, and that no two interfering variables share one.
+
+        :param test: The test case the assertions are made on.
+        :type test: unittest.TestCase
+        :param graph: The interference graph to check against, anything with edges().
+        :param colors: The color of each variable, None if it isn't colored.
+        :type colors: dict[str, int | None]
+        :param spilled: The names of the spilled variables.
+        :type spilled: set[str]
+        :param n: The number of registers.
+        :type n: int
+    """
+    for var, color in colors.items():
+        test.assertEqual(color is None, var in spilled)
+        test.assertTrue(color is None or 0 <= color < n)
+
+    for var1, var2 in graph.edges():
+        test.assertFalse(colors[var1] is not None and colors[var1] == colors[var2], f"{var1} and {var2} share {colors[var1]}")
+
+def assert_same_liveness(test: unittest.TestCase, buffer: InstructionBuffer, received: Liveness) -> None:
+    """
+        Checks that a liveness engine finds the same lines as Liveness on the same block.
+        The order of the variables in each line is compared as well, liveness_info() shows it.
+
+        :param test: The test case the assertions are made on.
+        :type test: unittest.TestCase
+        :param buffer: The block the engine analyzed.
+        :type buffer: InstructionBuffer
+        :param received: The engine's analysis.
+        :type received: Liveness
+    """
+    expected = Liveness(buffer)
+
+    test.assertEqual([list(line.items()) for line in received.get_liveness()],
+                     [list(line.items()) for line in expected.get_liveness()])
+    test.assertEqual(received.liveness_info(), expected.liveness_info())
@@ -1,9 +1,16 @@
 import io
+import os
+import tempfile
 import unittest
 from input.scanner import Scanner
 from input.scanner import Token
+from input.table_scanner import TableScanner
+from input.mapped_scanner import MappedScanner
+from input.parser import Parser
 
 class TestScanner(unittest.TestCase):
+    # Scanner implementation under test, overridden by subclasses
+    scanner_class = Scanner
 
     def test_reset(self):
         """
@@ -12,7 +19,7 @@ class TestScanner(unittest.TestCase):
         """
         input = "a = a + 1\nt1 = a * 4\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         try: 
             scanner._readline()
@@ -28,7 +35,7 @@ class TestScanner(unittest.TestCase):
     def test_next_token(self):
         input = "a = a + 1\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         try:
             scanner._readline()
@@ -50,7 +57,7 @@ class TestScanner(unittest.TestCase):
 
         input = "a = a + 1\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         try:
             scanner._readline()
@@ -75,7 +82,7 @@ class TestScanner(unittest.TestCase):
         
         input = "t1 = a* 4\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         try:
             scanner._readline()
@@ -96,7 +103,7 @@ class TestScanner(unittest.TestCase):
 
         input = "a \ a $ 1\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
         
         # This test should pass if the scanner.identify() method properly raises an error
         with self.assertRaises(ValueError) as cm:
@@ -106,7 +113,7 @@ class TestScanner(unittest.TestCase):
 
         input = "a a = 1 + 2\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
         
         # This test should pass if the scanner.identify() method properly raises an error
         with self.assertRaises(ValueError) as cm:
@@ -117,7 +124,7 @@ class TestScanner(unittest.TestCase):
 
         input = "a = b - c = d\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
         
         # This test should pass if the scanner.identify() method properly raises an error
         with self.assertRaises(ValueError) as cm:
@@ -128,7 +135,7 @@ class TestScanner(unittest.TestCase):
     def test_readline_invalid_input1(self):
         input = "a \ a + 1\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         with self.assertRaises(ValueError) as ve:
             scanner._readline()
@@ -138,7 +145,7 @@ class TestScanner(unittest.TestCase):
     def test_tokenize_line1(self):
         input = "a = a + 1\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         scanner._tokenize_line(input)
         
@@ -156,7 +163,7 @@ class TestScanner(unittest.TestCase):
     def test_tokenize_line2(self):
         input = "t1 = a * 4\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         scanner._tokenize_line(input)
         
@@ -174,7 +181,7 @@ class TestScanner(unittest.TestCase):
     def test_tokenize_line3(self):
         input = "t1 / a + 3\n"
         file = io.StringIO(input)
-        scanner = Scanner(file)
+        scanner = self.scanner_class(file)
 
         scanner._tokenize_line(input)
 
@@ -189,5 +196,180 @@ class TestScanner(unittest.TestCase):
         self.assertEqual(token_list[4], "3")
         self.assertEqual(token_list[5], "\n")
 
+    def test_live_symbols(self):
+        input = "live: a, b\n"
+        file = io.StringIO(input)
+        scanner = self.scanner_class(file)
+
+        scanner._readline()
+
+        # live, live_symbol, live_symbol, newline
+        self.assertEqual([token.type for token in scanner.buffer], [5, 6, 6, 7])
+        self.assertEqual([token.value for token in scanner.buffer], ["live:", "a", "b", "\n"])
+
+    def test_invalid_number_start(self):
+        input = "1a = 2\n"
+        file = io.StringIO(input)
+        scanner = self.scanner_class(file)
+
+        with self.assertRaises(ValueError) as cm:
+            scanner._readline()
+
+        self.assertEqual(str(cm.exception), "Invalid symbol starting with number: 1a")
+
+    def test_lines(self):
+        input = "a = 1\nb = a + 2\nlive: b"
+        file = io.StringIO(input)
+        scanner = self.scanner_class(file)
+
+        lines = [[token.value for token in line] for line in scanner.lines()]
+
+        self.assertEqual(lines, [["a", "=", "1", "\n"], ["b", "=", "a", "+", "2", "\n"], ["live:", "b"]])
+
+    def test_tokens(self):
+        input = "a = 1\nb = -a\n"
+        file = io.StringIO(input)
+        scanner = self.scanner_class(file)
+
+        # destination, equals, literal, newline, destination, equals, operator, variable, newline
+        self.assertEqual([token.type for token in scanner.tokens()], [0, 4, 2, 7, 0, 4, 3, 1, 7])
+
+class TestTableScanner(TestScanner):
+    """
+        Runs the scanner tests against the table-driven lexer.
+    """
+    scanner_class = TableScanner
+
+    def test_same_tokens(self):
+        """
+            Both lexers should produce the exact same token stream.
+        """
+        input = "a = a + 1\nt1=a*4\n  t2 = -t1\nb,= t2\t/ 3\nlive: a, b,\n c\n"
+        expected = Scanner(io.StringIO(input))
+        received = TableScanner(io.StringIO(input))
+
+        token = expected.next_token()
+        while token.type != -1:
+            other = received.next_token()
+            self.assertEqual((other.value, other.type), (token.value, token.type))
+            token = expected.next_token()
+
+        self.assertEqual(received.next_token().type, -1)
+
+class TestMappedScanner(unittest.TestCase):
+
+    def _mapped(self, input: str) -> MappedScanner:
+        """
+            Writes the input to a temporary file and maps it.
+        """
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, "w", newline="") as file:
+            file.write(input)
+
+        self.addCleanup(os.remove, path)
+
+        scanner = MappedScanner(path)
+        self.addCleanup(scanner.close)
+
+        return scanner
+
+    def test_same_tokens(self):
+        """
+            The mapped scanner should produce the same token stream as Scanner.
+        """
+        input = "a = a + 1\nt1=a*4\n  t2 = -t1\r\nb,= t2\t/ 3\nlive: a, b,\n c"
+        expected = Scanner(io.StringIO(input.replace("\r\n", "\n")))
+        received = self._mapped(input)
+
+        token = expected.next_token()
+        while token.type != -1:
+            other = received.next_token()
+            self.assertEqual((other.value, other.type), (token.value, token.type))
+            token = expected.next_token()
+
+        self.assertEqual(received.next_token().type, -1)
+
+    def test_spans(self):
+        received = self._mapped("t1 = a * 4\n")
+
+        spans = [received.next_span() for _ in range(6)]
+
+        self.assertEqual(spans, [(0, 2, 0), (3, 1, 4), (5, 1, 1), (7, 1, 3), (9, 1, 2), (10, 1, 7)])
+        self.assertEqual(received.next_span()[2], -1)
+
+    def test_lines(self):
+        received = self._mapped("a = 1\nlive: a\n")
+
+        lines = [[(token.value, token.type) for token in line] for line in received.lines()]
+
+        self.assertEqual(lines, [[("a", 0), ("=", 4), ("1", 2), ("\n", 7)], [("live:", 5), ("a", 6), ("\n", 7)]])
+
+    def test_close(self):
+        """
+            Leaving the scanner's context unmaps the file, reading on gives EOF.
+        """
+        with self._mapped("a = 1\nlive: a\n") as scanner:
+            token = scanner.next_token()
+            self.assertEqual(token.value, "a")
+
+        self.assertTrue(scanner.map == b"")
+        self.assertEqual(token.value, "a")
+        self.assertEqual(scanner.next_token().type, -1)
+
+        # Closing twice does nothing
+        scanner.close()
+
+    def test_parse_in_context(self):
+        """
+            A block parsed inside the scanner's context is still usable after leaving it.
+        """
+        input = "a = 1\nb = a + 2\nc = -b\nd = 34\nlive: c, d\n"
+
+        with self._mapped(input) as scanner:
+            buffer = Parser(scanner).parse()
+
+        expected = Parser(Scanner(io.StringIO(input))).parse()
+
+        self.assertEqual(str(buffer), str(expected))
+        self.assertEqual([str(instruction) for instruction in buffer.list_instructions()], ["a = 1", "b = a + 2", "c = -b", "d = 34"])
+
+    def test_skip_blank_lines(self):
+        """
+            A blank line ends the input, unless blank lines are skipped.
+        """
+        input = "a = 1\n\n \r\nlive: a\n\n"
+
+        self.assertEqual(len(list(self._mapped(input).lines())), 1)
+
+        received = self._mapped(input)
+        received.skip_blank_lines = True
+        expected = Scanner(io.StringIO(input.replace("\r\n", "\n")))
+        expected.skip_blank_lines = True
+
+        self.assertEqual([[token.value for token in line] for line in received.lines()], [[token.value for token in line] for line in expected.lines()])
+
+    def test_invalid_input(self):
+        received = self._mapped("a = b $ c\n")
+
+        with self.assertRaises(ValueError) as cm:
+            received.next_token()
+
+        self.assertEqual(str(cm.exception), "Invalid character in symbol: $")
+
+    def test_empty_file(self):
+        received = self._mapped("")
+
+        self.assertEqual(received.next_token().type, -1)
+
+    def test_parse(self):
+        """
+            The parser should work unchanged on top of the mapped scanner.
+        """
+        buffer = Parser(self._mapped("a = 1\nb = a + 2\nlive: b\n")).parse()
+
+        self.assertEqual([str(instruction) for instruction in buffer.list_instructions()], ["a = 1", "b = a + 2"])
+        self.assertEqual(buffer.list_live_objects(), ["b"])
+        self.assertEqual(buffer.get_occured_variables(), {"a", "b"})
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,91 @@
+import unittest
+from intermediate.liveness import Liveness
+from intermediate.interference_graph import InterferenceGraph
+from intermediate.spiller import Spiller
+from tests.random_blocks import assert_proper_coloring, parse
+
+class TestSpiller(unittest.TestCase):
+
+    def _assert_proper(self, buffer, n: int) -> set[str]:
+        """
+            Spills until the block fits, then checks the rewritten block against a fresh interference graph.
+        """
+        spiller = Spiller(buffer, n)
+        spilled = spiller.allocate()
+        colors = spiller.get_colors()
+
+        # The rewritten block must still be valid input
+        rewritten = parse(str(buffer))
+        liveness = Liveness(rewritten)
+        graph = InterferenceGraph()
+        graph.build_graph(liveness, rewritten.get_occured_variables())
+
+        assert_proper_coloring(self, graph, colors, spilled, n)
+
+        return spilled
+
+    def test_no_spill(self):
+        buffer = parse("a = 1\nb = a + 1\nc = b * 2\nlive: c\n")
+
+        self.assertEqual(self._assert_proper(buffer, 1), set())
+        self.assertEqual(len(buffer.list_instructions()), 3)
+
+    def test_spill_code(self):
+        """
+            Tests that the cheapest variable is spilled, with a load before its use, and that the frequency carries over.
+        """
+        buffer = parse("a = 1\nb = 2\nc = 3\nfreq: 10\nd = b + c\nfreq: 1\ne = d + a\nlive: e\n")
+
+        self.assertEqual(self._assert_proper(buffer, 2), {"a"})
+        self.assertEqual(str(buffer), "a = 1\nb = 2\nc = 3\nfreq: 10\nd = b + c\nfreq: 1\nas1 = a\ne = d + as1\nlive: e, ")
+
+    def test_store(self):
+        """
+            Tests that a spilled variable defined by an operation is stored right after it.
+        """
+        buffer = parse("a = 1\nb = 2\nc = 3\nd = b + c\ne = d + a\nf = e + b\nlive: f\n")
+        spiller = Spiller(buffer, 2)
+        spiller.spill_ids({spiller.symbols.get_id("d")})
+
+        self.assertEqual([str(i) for i in buffer.list_instructions()][3:6], ["ds2 = b + c", "d = ds2", "ds1 = d"])
+
+    def test_costs(self):
+        """
+            Tests that spill costs count uses and definitions, weighted by frequency.
+        """
+        spiller = Spiller(parse("a = 1\nb = 2\nfreq: 10\nc = a + b\nd = c * b\nfreq: 1\ne = d + a\nlive: e\n"), 2)
+
+        self.assertEqual(spiller.spill_costs(), {"a": 12, "b": 21, "c": 20, "d": 11, "e": 1})
+
+    def test_memory_copy(self):
+        """
+            Tests that a copy between two spilled variables goes through a register.
+        """
+        block = "a = 1\nb = 2\nc = 3\nd = a\ne = a + b\nf = e + c\ng = f + d\nlive: g\n"
+        buffer = parse(block)
+        spiller = Spiller(buffer, 2)
+        spiller.spill_ids({spiller.symbols.get_id("a"), spiller.symbols.get_id("d")})
+
+        # The copy loads a into a register and stores it into d, it never reads memory into memory
+        self.assertEqual([str(i) for i in buffer.list_instructions()][3:5], ["as2 = a", "d = as2"])
+        self.assertEqual([str(i) for i in buffer.list_instructions()][5:], ["as1 = a", "e = as1 + b", "f = e + c", "ds1 = d", "g = f + ds1"])
+
+        self._assert_proper(parse(block), 2)
+
+    def test_impossible(self):
+        """
+            Tests that a block needing more registers than there are, whatever is spilled, is an error.
+        """
+        with self.assertRaises(ValueError):
+            Spiller(parse("a = b + c\nlive: a\n"), 1).allocate()
+
+    def test_many_rounds(self):
+        block = "".join(f"v{i} = {i}\n" for i in range(12))
+        block += "".join(f"v{i} = v{i} + v{(i + 5) % 12}\n" for i in range(12))
+        block += "s = v0 + v1\n" + "".join(f"s = s + v{i}\n" for i in range(2, 12))
+
+        for n in range(3, 14):
+            self._assert_proper(parse(block + "live: s\n"), n)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import random
+import tempfile
+import unittest
+from intermediate.liveness import Liveness
+from intermediate.interference_graph import InterferenceGraph
+from intermediate.streaming_liveness import StreamingLiveness
+from tests.random_blocks import parse, random_block, sample_block
+
+class TestStreamingLiveness(unittest.TestCase):
+
+    def _path(self, input: str) -> str:
+        """
+            Writes the input to a temporary file.
+        """
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, "w", newline="") as file:
+            file.write(input)
+
+        self.addCleanup(os.remove, path)
+
+        return path
+
+    def _streaming(self, input: str) -> StreamingLiveness:
+        """
+            Writes the input to a temporary file and walks it.
+        """
+        streaming = StreamingLiveness(self._path(input))
+        self.addCleanup(streaming.close)
+
+        return streaming
+
+    def _assert_same(self, input: str) -> None:
+        """
+            Compares the walk against Liveness and a graph built from the parsed block.
+        """
+        buffer = parse(input.replace("\r\n", "\n"))
+        liveness = Liveness(buffer)
+        graph = InterferenceGraph()
+        graph.build_graph(liveness, buffer.get_occured_variables())
+
+        streaming = self._streaming(input)
+
+        self.assertEqual({frozenset(edge) for edge in streaming.get_edges()}, {frozenset(edge) for edge in graph.edges()})
+        self.assertEqual(set(streaming.interference_graph().nodes()), set(graph.nodes()))
+        self.assertEqual(streaming.instructions, len(buffer.get_instructions()))
+
+        # Live coming into the block is everything not defined on the first line
+        first = liveness.get_liveness()[0] if len(buffer.get_instructions()) > 0 else {}
+        self.assertEqual(streaming.get_live_in(), [var for var, state in first.items() if state != Liveness.states["defined"]])
+
+    def test_same_as_liveness(self):
+        self._assert_same(sample_block)
+        self._assert_same("b=a+1\nd=b*2\ne=4-d\nb=e\nc=5\nf=b-1\nlive: c, e")
+        self._assert_same("  a  =  1\r\nb = -a\r\nc = b\nlive: c,\n b\n")
+        self._assert_same("b = -b\nb = a\nlive: b\n")
+        self._assert_same("a = 1\nb = a\n")
+
+    def test_random_blocks(self):
+        rng = random.Random(7)
+
+        for _ in range(50):
+            self._assert_same(random_block(rng, rng.randint(1, 30), ["a", "b", "c", "t1", "t2"]))
+
+    def test_blank_line_ends_input(self):
+        streaming = self._streaming("a = 1\nb = a\nlive: b\n\nthis is ignored\n")
+
+        self.assertEqual(streaming.instructions, 2)
+        self.assertEqual(streaming.get_edges(), [])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            self._streaming("a = 1\nb = = a\nlive: b\n")
+
+        with self.assertRaises(ValueError):
+            self._streaming("a = 1\nlive: b\n")
+
+        with self.assertRaises(ValueError):
+            self._streaming("a = 1\nlive: a = 2\n")
+
+    def test_first_error(self):
+        """
+            The walk goes backwards, but the first invalid line is still the one reported, like Parser does.
+        """
+        for input in ["a = 1 +\nb = = 2\nlive: a\n", "a = 1 +\nb = 2\nlive: b = 2\n", "a = 1\nb = $\nc = = 1\nlive: q\n"]:
+            with self.assertRaises(ValueError) as expected:
+                parse(input)
+
+            with self.assertRaises(ValueError) as received:
+                self._streaming(input)
+
+            self.assertEqual(str(received.exception), str(expected.exception))
+
+    def test_occurred(self):
+        streaming = self._streaming("a = 1\nb = -a\nc = b + 2\nlive: c\n")
+
+        self.assertEqual({streaming.symbols.names[var] for var in streaming.occurred}, {"a", "b", "c"})
+        self.assertNotIn(-1, streaming.occurred)
+
+    def test_close(self):
+        with StreamingLiveness(self._path("a = 1\nb = a\nlive: b\n")) as streaming:
+            self.assertEqual(streaming.get_live_in(), [])
+
+        self.assertEqual(streaming.map, b"")
+        self.assertEqual(streaming.get_edges(), [])
+
+        # Closing twice does nothing
+        streaming.close()
+
+if __name__ == '__main__':
+    unittest.main()